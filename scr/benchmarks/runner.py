@@ -0,0 +1,125 @@
+import inspect
+import json
+import platform
+import statistics
+import sys
+import time
+import timeit
+from pathlib import Path
+from types import ModuleType
+from typing import Dict, List, Optional, Tuple
+
+import numpy
+import sympy
+
+from scr.main import RESOURCES
+
+BENCHMARKS = RESOURCES.joinpath('benchmarks')
+BASELINE = 'baseline'
+PREFIX = 'time_'
+REPEATS = 5
+NUMBER = 1
+TOLERANCE = 0.2
+
+Results = Dict[str, Dict[str, float]]
+
+
+def discover(module: ModuleType) -> List[Tuple[str, type, str]]:
+    # Benchmarks are the time_ methods of the classes of the module, the way asv finds them
+    benchmarks = []
+    for class_name, benchmark_class in inspect.getmembers(module, inspect.isclass):
+        if benchmark_class.__module__ != module.__name__:
+            continue
+        for method_name, _ in inspect.getmembers(benchmark_class, inspect.isfunction):
+            if method_name.startswith(PREFIX):
+                benchmarks.append((f"{class_name}.{method_name}", benchmark_class, method_name))
+    return benchmarks
+
+
+def run(module: ModuleType, selection: Optional[str] = None) -> Results:
+    """
+    Times every benchmark of the module. A class may set repeat and number, the times of the repeats are per call.
+    The setup of a class runs once before its benchmarks and its teardown after them.
+    """
+    results: Results = {}
+    instances: Dict[type, object] = {}
+    for name, benchmark_class, method_name in discover(module):
+        if selection is not None and selection not in name:
+            continue
+        if benchmark_class not in instances:
+            instances[benchmark_class] = benchmark_class()
+            if hasattr(instances[benchmark_class], 'setup'):
+                instances[benchmark_class].setup()
+
+        method = getattr(instances[benchmark_class], method_name)
+        repeat, number = getattr(benchmark_class, 'repeat', REPEATS), getattr(benchmark_class, 'number', NUMBER)
+        times = [total / number for total in timeit.repeat(method, number=number, repeat=repeat)]
+        results[name] = {'min': min(times), 'median': statistics.median(times), 'repeat': repeat, 'number': number}
+        print(f"{name:<45}{results[name]['min']:>12.6f} s", flush=True)
+
+    for instance in instances.values():
+        if hasattr(instance, 'teardown'):
+            instance.teardown()
+    return results
+
+
+def describe_machine() -> Dict[str, str]:
+    return {
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'python': platform.python_version(),
+        'numpy': numpy.__version__,
+        'sympy': sympy.__version__
+    }
+
+
+def save(results: Results, name: str = BASELINE, directory: Path = BENCHMARKS) -> Path:
+    path = directory.joinpath(f"{name}.json")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('w') as file:
+        json.dump({'created': time.strftime('%Y-%m-%dT%H:%M:%S'), 'environment': describe_machine(),
+                   'results': results}, file, indent=2)
+    return path
+
+
+def load(name: str = BASELINE, directory: Path = BENCHMARKS) -> Results:
+    with directory.joinpath(f"{name}.json").open('r') as file:
+        return json.load(file)['results']
+
+
+def compare(results: Results, baseline: Results, tolerance: float = TOLERANCE) -> Dict[str, float]:
+    # The ratios of the best times to the baseline ones for the benchmarks that got slower than the tolerance allows
+    regressions = {}
+    for name, result in results.items():
+        if name in baseline and result['min'] > (1 + tolerance) * baseline[name]['min']:
+            regressions[name] = result['min'] / baseline[name]['min']
+    return regressions
+
+
+def main(arguments: List[str]) -> int:
+    """
+    Usage: runner.py [save|compare] [baseline name] [benchmark name part]
+    save writes the results as the baseline, compare reports the benchmarks slower than the baseline.
+    """
+    from scr.benchmarks import suite
+
+    command = arguments[0] if len(arguments) > 0 else 'compare'
+    name = arguments[1] if len(arguments) > 1 else BASELINE
+    selection = arguments[2] if len(arguments) > 2 else None
+    if command not in ('save', 'compare'):
+        print(main.__doc__)
+        return 2
+
+    results = run(suite, selection)
+    if command == 'save' or not BENCHMARKS.joinpath(f"{name}.json").exists():
+        print(f"The results are saved to {save(results, name)}")
+        return 0
+
+    regressions = compare(results, load(name))
+    for regression, ratio in regressions.items():
+        print(f"{regression} is {ratio:.2f} times slower than the baseline {name}")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
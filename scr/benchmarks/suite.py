@@ -0,0 +1,204 @@
+import tempfile
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from typing import Dict
+
+import sympy
+from sympy import Symbol, evaluate, srepr
+from sympy.core.cache import clear_cache
+
+from scr.calculation_equipment.FormulaCache import FormulaCache
+from scr.calculation_equipment.Formulas import Formulas
+from scr.calculation_equipment.compilation import load_source
+from scr.calculation_equipment.generatoers import fading_generator
+from scr.calculation_equipment.warming import warm_formulas, FORMULA_NAMES
+from scr.consumer.EuclidConsumer import EuclidConsumer
+from scr.main import CACHE_DIRECTORY, FORMULAS, LOG_FOLDER, LOG_FILE, shared
+from scr.parameter.IonizationParameter import IonizationParameter
+from scr.solution.TwoValueSolution import TwoValueSolution
+from scr.solver.EquationSolver import EquationSolver
+from scr.stage.IonStage import IonStage
+from scr.stage.PropelStage import PropelStage
+from scr.util import TEXT, BINARY, dump_function, load_function, strip_checksum
+from test_equpment.solution.combiner.MultiplyCombiner import MultiplyCombiner
+
+shared[LOG_FILE] = LOG_FOLDER.joinpath('benchmarks')
+
+GENERATOR = fading_generator
+SOLUTION = TwoValueSolution(1.3, 0.4)
+
+NAMESPACE: Dict[str, object] = vars(sympy)
+
+
+def create_parameter() -> IonizationParameter:
+    # The parameter of the delay and angle printers
+    parameter = IonizationParameter()
+    parameter.T_d = 1
+    parameter.F = 1
+    parameter.omega_1 = 1
+    parameter.omega_2 = 2
+    parameter.etta_1 = -1
+    parameter.etta_2 = 1
+    parameter.N_1 = 1
+    parameter.N_2 = 2
+    parameter.f_0 = 2
+    parameter.I_p = 1
+    parameter.p = 1
+    parameter.p_theta = 1.5
+    return parameter
+
+
+def read_formula(name: str) -> bytes:
+    text = strip_checksum(FORMULAS.joinpath(name).read_bytes())
+    if text is None:
+        raise ValueError(f"The stored formula {name} is damaged: its checksum doesn't match")
+    return text
+
+
+def load_srepr(data: bytes) -> Symbol:
+    with evaluate(False):
+        return eval(data.decode('utf-8'), NAMESPACE)
+
+
+class TextFormulas:
+    # Parsing the text of the shipped formulas may take minutes, so it's timed once
+    repeat = 1
+
+    def setup(self):
+        self.texts = [read_formula(name) for name in FORMULA_NAMES]
+
+    def time_text(self):
+        for text in self.texts:
+            load_function(text, TEXT)
+
+
+class FormulaFormats:
+    # The shipped formulas loaded from the other formats, the binary one is the one the formula cache stores
+    def setup(self):
+        expressions = [load_function(read_formula(name), TEXT) for name in FORMULA_NAMES]
+        self.representations = [srepr(expression).encode('utf-8') for expression in expressions]
+        self.binaries = [dump_function(expression, BINARY) for expression in expressions]
+        for name, expression, binary in zip(FORMULA_NAMES, expressions, self.binaries):
+            if load_function(binary, BINARY) != expression:
+                raise ValueError(f"The binary form of {name} doesn't restore the same expression")
+
+    def time_srepr(self):
+        for representation in self.representations:
+            load_srepr(representation)
+
+    def time_binary(self):
+        for binary in self.binaries:
+            load_function(binary, BINARY)
+
+
+class FormulaLoading:
+    repeat = 3
+
+    def setup(self):
+        self.directory = TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        self.warm = self.path.joinpath('warm')
+        warm_formulas(GENERATOR, directory=self.warm, formulas_directory=self.path)
+
+    def teardown(self):
+        self.directory.cleanup()
+
+    def time_cold_load(self):
+        # Every formula, its derivatives and sources are derived into an empty cache from scratch
+        Formulas.instances.clear()
+        clear_cache()
+        warm_formulas(GENERATOR, directory=Path(tempfile.mkdtemp(dir=self.path)), formulas_directory=self.path)
+
+    def time_warm_load(self):
+        for owner, names in ((EquationSolver, ('equation_1', 'equation_2', 'jacobian')),
+                             (IonStage, ('ion_stage',)),
+                             (PropelStage, ('propel_stage',))):
+            cache = FormulaCache(GENERATOR, owner, self.warm, PropelStage.cache_variant(True)
+                                 if owner is PropelStage else '')
+            for name in names:
+                if name != 'jacobian':
+                    cache.restore_expression(name)
+                load_source(cache.restore_source(name))
+
+
+class Construction:
+    # The solver and the stages are constructed from a temporary formula cache, warmed beforehand
+    repeat = 3
+
+    def setup(self):
+        self.directory = TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        self.cache_directory = shared[CACHE_DIRECTORY]
+        shared[CACHE_DIRECTORY] = self.path.joinpath('warm')
+        warm_formulas(GENERATOR, formulas_directory=self.path)
+
+    def teardown(self):
+        shared[CACHE_DIRECTORY] = self.cache_directory
+        self.directory.cleanup()
+
+    def time_solver(self):
+        EquationSolver(GENERATOR, 2, -10, 10, 4)
+
+    def time_stages(self):
+        IonStage(GENERATOR)
+        PropelStage(GENERATOR)
+
+
+class Residuals:
+    number = 100
+
+    def setup(self):
+        self.solver = EquationSolver(GENERATOR, 2, -10, 10, 4)
+        self.solver.set_parameter(create_parameter())
+
+    def time_equation_1(self):
+        self.solver.parametrized_first_equation(SOLUTION.first_number, SOLUTION.second_number)
+
+    def time_equation_2(self):
+        self.solver.parametrized_second_equation(SOLUTION.first_number, SOLUTION.second_number)
+
+    def time_jacobian(self):
+        self.solver.parametrized_jacobian(SOLUTION.first_number, SOLUTION.second_number)
+
+
+class Solving:
+    def setup(self):
+        self.solver = EquationSolver(GENERATOR, 2, -10, 10, 4)
+        self.solver.set_parameter(create_parameter())
+        self.solver.set_precision(0.001)
+
+    def time_solve(self):
+        self.solver.solve()
+
+
+class Stages:
+    number = 100
+
+    def setup(self):
+        self.parameter = create_parameter()
+        self.ion_stage = IonStage(GENERATOR)
+        self.ion_stage.set_parameter(self.parameter)
+        self.propel_stage = PropelStage(GENERATOR)
+        self.propel_stage.set_parameter(self.parameter)
+
+    def time_ion_stage(self):
+        self.ion_stage.get_result(SOLUTION)
+
+    def time_propel_stage(self):
+        self.propel_stage.get_result(SOLUTION)
+
+
+class SweepPoint:
+    # A point of the delay sweep, with the consumer and the solver built the way delay_argument_printer builds them
+    def setup(self):
+        self.parameter = create_parameter()
+        self.consumer = EuclidConsumer([IonStage(GENERATOR), PropelStage(GENERATOR)], MultiplyCombiner())
+        self.consumer.fuse_stages()
+        self.solver = EquationSolver(GENERATOR, 2, -10, 10, 4)
+        self.solver.set_precision(0.001)
+
+    def time_calculator(self):
+        self.parameter.T_d = 1.
+        self.consumer.set_parameter(self.parameter)
+        self.consumer.create_record(self.consumer.consume_by_solver(self.solver))
+        self.consumer.clean()
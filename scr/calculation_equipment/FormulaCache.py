@@ -0,0 +1,205 @@
+import importlib
+import inspect
+import logging
+import re
+from hashlib import sha256
+from pathlib import Path
+from typing import Callable, Optional, Tuple, Sequence, ContextManager, List, Set
+
+import sympy
+from sympy import Symbol
+
+from scr.calculation_equipment import compilation
+from scr.calculation_equipment.compilation import NUMERIC, compile_function, generate_source, load_source, \
+    generate_shared_source
+from scr.instrumentation import measure
+from scr.calculation_equipment.generatoers import fading_generator
+from scr.main import CACHE_DIRECTORY, FORMULAS, FORMULAS_DIRECTORY, shared
+from scr.util import Number, add_checksum, strip_checksum, write_atomically, lock_file, store_function, \
+    dump_function, load_function, BINARY
+
+logger = logging.getLogger(__name__)
+
+# The modules the expressions are built with besides the generator and the compute_ functions of the owner
+EXPRESSION_MODULES = (
+    'scr.calculation_equipment.Formulas',
+    'scr.calculation_equipment.gaussian',
+    'scr.util',
+    'scr.parameter.IonizationSymbols'
+)
+ENTRY = re.compile(r'(?P<name>.+)-(?P<key>[0-9a-f]{16})\.(pickle|py|results)')
+
+
+def describe(definition: object) -> str:
+    try:
+        return inspect.getsource(definition)
+    except (OSError, TypeError):
+        return f"{getattr(definition, '__module__', '')}.{getattr(definition, '__qualname__', repr(definition))}"
+
+
+def describe_builders(owner: type) -> str:
+    # Only the compute_ functions of the owner build its expressions, the rest of its module doesn't change them
+    return '\n'.join(describe(getattr(owner, name)) for name in sorted(dir(owner)) if name.startswith('compute_'))
+
+
+def calculate_key(*parts: str) -> str:
+    digest = sha256()
+    for part in parts:
+        digest.update(part.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:16]
+
+
+class FormulaCache:
+    # Entries are keyed by everything the formulas are derived from, so a changed definition is never reused
+    VERSION = 2
+    EXPRESSION_MODULES = EXPRESSION_MODULES
+
+    def __init__(self, generator: Callable, owner: type, directory: Optional[Path] = None, variant: str = '') -> None:
+        # The directory defaults to the shared one
+        self.directory = shared[CACHE_DIRECTORY] if directory is None else directory
+        self.shipped = generator is fading_generator  # The shipped formulas are derived for it
+        self.expression_key = calculate_key(
+            str(self.VERSION),
+            variant,
+            sympy.__version__,
+            describe(generator),
+            *[describe(importlib.import_module(module)) for module in self.EXPRESSION_MODULES],
+            describe_builders(owner)
+        )
+        self.source_key = calculate_key(self.expression_key, describe(compilation))
+
+    @classmethod
+    def combine(cls, *caches: 'FormulaCache') -> 'FormulaCache':
+        cache = cls.__new__(cls)
+        cache.directory = caches[0].directory
+        cache.shipped = False
+        cache.expression_key = calculate_key(*[cache.expression_key for cache in caches])
+        cache.source_key = calculate_key(*[cache.source_key for cache in caches])
+        return cache
+
+    @staticmethod
+    def remove_stale(caches: Sequence['FormulaCache']) -> List[Path]:
+        """
+        Removes the entries of the directory of the caches keyed by none of them along with their lock files.
+        Returns the removed entries.
+        """
+        keys: Set[str] = set()
+        for cache in caches:
+            keys.update((cache.expression_key, cache.source_key))
+
+        removed: List[Path] = []
+        directory = caches[0].directory
+        if not directory.exists():
+            return removed
+        for path in sorted(directory.iterdir()):
+            match = ENTRY.fullmatch(path.name)
+            if match is None or match.group('key') in keys:
+                continue
+            path.unlink(missing_ok=True)
+            # No cache derives a stale entry any more, so nothing waits on its lock
+            path.with_name(f".{path.name}.lock").unlink(missing_ok=True)
+            removed.append(path)
+        logger.info(f"{len(removed)} stale entries are removed from {str(directory)}")
+        return removed
+
+    def export_path(self, name: str, directory: Optional[Path] = None) -> Optional[Path]:
+        # The formulas directory ships the formulas of the default generator, so the ones of the other generators are
+        # exported only to another directory. The directory defaults to the shared one
+        directory = shared[FORMULAS_DIRECTORY] if directory is None else directory
+        if directory == FORMULAS and not self.shipped:
+            return None
+        return directory.joinpath(name)
+
+    def expression_path(self, name: str) -> Path:
+        return self.directory.joinpath(f"{name}-{self.expression_key}.pickle")
+
+    def source_path(self, name: str) -> Path:
+        return self.directory.joinpath(f"{name}-{self.source_key}.py")
+
+    def results_path(self, name: str) -> Path:
+        # The results depend on the compiled source as well, so they are keyed like it
+        return self.directory.joinpath(f"{name}-{self.source_key}.results")
+
+    def lock(self, path: Path) -> ContextManager[None]:
+        return lock_file(path.with_name(f".{path.name}.lock"))
+
+    @staticmethod
+    def read_verified(path: Path, kind: str, name: str) -> Optional[bytes]:
+        if not path.exists():
+            logger.debug(f"There's no cached {kind} {name} in {str(path)}")
+            return None
+
+        with path.open('rb') as file:
+            data = strip_checksum(file.read())
+        if data is None:
+            logger.warning(f"The cached {kind} {name} in {str(path)} is damaged, it will be derived again")
+        return data
+
+    def restore_expression(self, name: str) -> Optional[Symbol]:
+        with measure('formula_restore'):
+            data = self.read_verified(self.expression_path(name), 'expression', name)
+            return None if data is None else load_function(data, BINARY)
+
+    def store_expression(self, name: str, expression: Symbol) -> None:
+        write_atomically(self.expression_path(name), add_checksum(dump_function(expression, BINARY)))
+
+    def derive_expression(self, name: str, derive: Callable[[], Symbol], export: Optional[Path] = None) -> Symbol:
+        """
+        Restores the expression or derives and stores it. Only one process derives a missing expression, the others
+        wait for it and restore the stored one. The derived expression is also exported as text when a path is given.
+        """
+        expression = self.restore_expression(name)
+        if expression is not None:
+            return expression
+
+        with self.lock(self.expression_path(name)):
+            expression = self.restore_expression(name)
+            if expression is None:
+                expression = derive()
+                if export is not None:
+                    store_function(export, expression)
+                self.store_expression(name, expression)
+        return expression
+
+    def restore_source(self, name: str) -> Optional[str]:
+        data = self.read_verified(self.source_path(name), 'source', name)
+        return None if data is None else data.decode('utf-8')
+
+    def store_source(self, name: str, source: str) -> None:
+        write_atomically(self.source_path(name), add_checksum(source.encode('utf-8')))
+
+    def derive_source(self, name: str, generate: Callable[[], str]) -> str:
+        source = self.restore_source(name)
+        if source is not None:
+            return source
+
+        with self.lock(self.source_path(name)):
+            source = self.restore_source(name)
+            if source is None:
+                source = generate()
+                self.store_source(name, source)
+        return source
+
+    def compile(self,
+                name: str,
+                expression: Symbol,
+                arguments: Tuple[Symbol, ...],
+                mode: str = NUMERIC,
+                integrator: Callable = None) -> Callable[..., Number]:
+        if mode != NUMERIC:
+            return compile_function(expression, arguments, mode, integrator)
+
+        return load_source(self.derive_source(name, lambda: generate_source(expression, arguments)))
+
+    def compile_shared(self,
+                       name: str,
+                       expressions: Sequence[Symbol],
+                       arguments: Tuple[Symbol, ...],
+                       mode: str = NUMERIC,
+                       integrator: Callable = None) -> Callable[..., Tuple[Number, ...]]:
+        if mode != NUMERIC:
+            functions = [compile_function(expression, arguments, mode, integrator) for expression in expressions]
+            return lambda *args: tuple(function(*args) for function in functions)
+
+        return load_source(self.derive_source(name, lambda: generate_shared_source(expressions, arguments)))
@@ -1,12 +1,13 @@
 import logging
-from typing import Callable, List, Tuple
+from typing import Callable, Dict, List, Tuple
 
-from quadpy import quad as quadpy_quad
-from scipy.integrate import quad as scipy_quad
-from sympy import sqrt, cos, sin, Symbol, lambdify, Integral, integrate, re, im
+import numpy
+from sympy import sqrt, cos, sin, Symbol, Integral
 
+from scr.calculation_equipment.compilation import integrate_numerically
+from scr.calculation_equipment.gaussian import integrate_gaussian
 from scr.calculation_equipment.generatoers import fading_generator
-from scr.main import LOG_FILE, shared
+from scr.logs import get_logger
 from scr.parameter.IonizationGeneratorSymbols import IonizationGeneratorSymbols
 from scr.parameter.IonizationParameter import IonizationParameter
 from scr.parameter.IonizationSymbols import IonizationSymbols
@@ -15,39 +16,23 @@ from scr.util import Number, sum_as_vectors, increase, square, multiply
 logger = logging.getLogger(__name__)
 
 
-def real_quad(expr, lims):
-    var, a, b = lims
+def real_quad(integrand: Callable[..., Number], a: Number, b: Number, *arguments: Number) -> Number:
+    # The integrand is compiled once with the arguments after the integration variable, see separate_integrals
     a, b = polish_limits((a, b))
-    return scipy_quad(lambdify(var, expr), a, b)[0]
+    value = integrate_numerically(lambda t: integrand(t, *arguments), a, b)
+    if isinstance(a, complex) or isinstance(b, complex):
+        return complex(value)
+    return float(numpy.real(value))
 
 
-def complex_quad(expr, lims):
-    var, a, b = lims
+def complex_quad(integrand: Callable[..., Number], a: Number, b: Number, *arguments: Number) -> complex:
     a, b = polish_limits((a, b))
-    real = scipy_quad(lambdify(var, re(expr)), a, b)
-    imagine = scipy_quad(lambdify(var, im(expr)), a, b)
-    return complex(real[0], imagine[0])
-
-
-def polish_limits(limits: Tuple[Number, Number]) -> Tuple[float, float]:
-    a, b = limits
-    if not (type(a) == complex or type(b) == complex):
-        return limits
-    if not type(a) == complex and type(b) == complex:
-        if b.imag == 0:
-            return a, b.real
-        else:
-            raise ValueError(f"Cannot integrate with essentially complex limits {limits}")
-    if type(a) == complex and not type(b) == complex:
-        if a.imag == 0:
-            return a.real, b
-        else:
-            raise ValueError(f"Cannot integrate with essentially complex limits {limits}")
-    if type(a) == complex and type(b) == complex:
-        if a.imag == 0 and b.imag == 0:
-            return a.real, b.real
-        else:
-            raise ValueError(f"Cannot integrate with essentially complex limits {limits}")
+    return complex(integrate_numerically(lambda t: integrand(t, *arguments), a, b))
+
+
+def polish_limits(limits: Tuple[Number, Number]) -> Tuple[Number, Number]:
+    # Limits with zero imaginary parts become real, essentially complex ones give an integral along the segment
+    return tuple(limit.real if type(limit) == complex and limit.imag == 0 else limit for limit in limits)
 
 
 def diff_list(to_diff: List[Symbol], *args: Symbol) -> List[Symbol]:
@@ -59,11 +44,11 @@ def integrate_list(to_int: List[Symbol], tmp: Symbol, begin: Symbol, end: Symbol
 
 
 def replace_one(items: List[Symbol], old: Symbol, new: Symbol) -> List[Symbol]:
-    return [item.replace(old, new) for item in items]
+    return [item.xreplace({old: new}) for item in items]
 
 
 def replace(items: List[Symbol], old: Tuple[Symbol, Symbol], new: Tuple[Symbol, Symbol]) -> List[Symbol]:
-    return [item.replace(old[0], new[0]).replace(old[1], new[1]) for item in items]
+    return [item.xreplace(dict(zip(old, new))) for item in items]
 
 
 class Formulas:
@@ -73,9 +58,10 @@ class Formulas:
     R_2__value = None
     R__value = None
     A__value = None
+    A_integral__value = None
+    A_square_integral__value = None
     F__value = None
     K_1__value = None
-    K_2__value = None
     F_tmp__value = None
     F_tmp_square__value = None
     W__value = None
@@ -84,33 +70,39 @@ class Formulas:
     S__value = None
     L__value = None
 
+    instances: Dict[Tuple[Callable, bool], 'Formulas'] = {}
+
+    @classmethod
+    def instance(cls, generator: Callable[[Symbol, IonizationGeneratorSymbols], Symbol],
+                 closed_form: bool = True) -> 'Formulas':
+        # The formulas depend on the parameters only through their symbols, so one instance per generator and form of
+        # the integrals is shared by all the solvers and stages of the process
+        key = (generator, closed_form)
+        if key not in cls.instances:
+            formulas = cls()
+            formulas.set_generator(generator)
+            formulas.set_closed_form(closed_form)
+            cls.instances[key] = formulas
+        return cls.instances[key]
+
     def __init__(self):
         self.logger = None
         self.set_up_logger()
+        self.generator = Formulas.generator
         self.t = Symbol('t')
         self.t1 = Symbol('t1')
         self.t2 = Symbol('t2')
+        self.closed_form = True  # Integrals of the gaussian pulses are taken analytically instead of numerically
 
     def set_up_logger(self):
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.DEBUG)
-
-        # ch = logging.StreamHandler()
-        # ch.setLevel(logging.DEBUG)
+        self.logger = get_logger(__name__)
 
-        fh = logging.FileHandler(shared[LOG_FILE])
-        fh.setLevel(logging.DEBUG)
-
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-        # ch.setFormatter(formatter)
-        fh.setFormatter(formatter)
-
-        # self.logger.addHandler(ch)
-        self.logger.addHandler(fh)
+    def set_closed_form(self, closed_form: bool):
+        self.closed_form = closed_form
 
     def set_generator(self, generator: Callable[[Symbol, IonizationGeneratorSymbols], Symbol]):
         Formulas.generator = generator
+        self.generator = generator
 
     def set_parameter(self, parameter: IonizationParameter):
         Formulas.parameter = parameter
@@ -133,7 +125,7 @@ class Formulas:
             IonizationGeneratorSymbols.omega = IonizationSymbols.omega_1
             IonizationGeneratorSymbols.N = IonizationSymbols.N_1
 
-            factor = (Formulas.generator(self.t, IonizationGeneratorSymbols) * IonizationSymbols.F) / (
+            factor = (self.generator(self.t, IonizationGeneratorSymbols) * IonizationSymbols.F) / (
                     IonizationSymbols.omega_1 ** 2)
 
             self.R_1__value = [
@@ -148,7 +140,7 @@ class Formulas:
             IonizationGeneratorSymbols.omega = IonizationSymbols.omega_1
             IonizationGeneratorSymbols.N = IonizationSymbols.N_2
 
-            factor = (Formulas.generator(self.t, IonizationGeneratorSymbols) * IonizationSymbols.F) / (
+            factor = (self.generator(self.t, IonizationGeneratorSymbols) * IonizationSymbols.F) / (
                     IonizationSymbols.omega_2 ** 2)
 
             self.R_2__value = [
@@ -176,6 +168,28 @@ class Formulas:
 
         return replace_one(self.A__value, self.t, t)
 
+    def A_integral(self, t1: Symbol, t2: Symbol) -> List[Symbol]:
+        # Integral of A over [t2, t1]. A is the derivative of R, so it's just the increment of R in the closed form
+        if self.A_integral__value is None:
+            if self.closed_form:
+                self.A_integral__value = sum_as_vectors(self.R(self.t1), increase(-1, self.R(self.t2)))
+            else:
+                self.A_integral__value = integrate_list(self.A(self.t), self.t, self.t2, self.t1)
+            logger.info(f"The value for A_integral is set")
+
+        return replace(self.A_integral__value, (self.t1, self.t2), (t1, t2))
+
+    def A_square_integral(self, t1: Symbol, t2: Symbol) -> Symbol:
+        # Integral of A^2 over [t2, t1]
+        if self.A_square_integral__value is None:
+            if self.closed_form:
+                self.A_square_integral__value = integrate_gaussian(square(self.A(self.t)), self.t, self.t2, self.t1)
+            else:
+                self.A_square_integral__value = Integral(square(self.A(self.t)), (self.t, self.t2, self.t1))
+            logger.info(f"The value for A_square_integral is set")
+
+        return self.A_square_integral__value.xreplace({self.t1: t1, self.t2: t2})
+
     def F(self, t: Symbol) -> List[Symbol]:
         if self.F__value is None:
             self.F__value = increase(-1., diff_list(self.A(self.t), self.t))
@@ -185,7 +199,7 @@ class Formulas:
 
     def K_1(self, t1: Symbol, t2: Symbol) -> List[Symbol]:
         if self.K_1__value is None:
-            integral = integrate_list(self.A(self.t), self.t, self.t2, self.t1)
+            integral = self.A_integral(self.t1, self.t2)
             self.K_1__value = sum_as_vectors(
                 self.A(self.t1),
                 increase(-1 / (self.t1 - self.t2), integral)
@@ -195,15 +209,8 @@ class Formulas:
         return replace(self.K_1__value, (self.t1, self.t2), (t1, t2))
 
     def K_2(self, t1: Symbol, t2: Symbol) -> List[Symbol]:
-        if self.K_2__value is None:
-            integral = integrate_list(self.A(self.t), self.t, self.t2, self.t1)
-            self.K_2__value = sum_as_vectors(
-                self.A(self.t1),
-                increase(-1. / (self.t1 - self.t2), integral)
-            )
-            logger.info(f"The value for K_2 is set")
-
-        return replace(self.K_2__value, (self.t1, self.t2), (t1, t2))
+        # K_2 coincides with K_1
+        return self.K_1(t1, t2)
 
     def F_tmp_square(self, t1: Symbol, t2: Symbol) -> Symbol:
         if self.F_tmp_square__value is None:
@@ -212,14 +219,14 @@ class Formulas:
                                                                             second_derivative)
             logger.info(f"The value for F_tmp_square is set")
 
-        return self.F_tmp_square__value.replace(self.t1, t1).replace(self.t2, t2)
+        return self.F_tmp_square__value.xreplace({self.t1: t1, self.t2: t2})
 
     def F_tmp(self, t1: Symbol, t2: Symbol) -> Symbol:
         if self.F_tmp__value is None:
             self.F_tmp__value = sqrt(self.F_tmp_square(t1, t2))
             logger.info(f"The value for F_tmp is set")
 
-        return self.F_tmp__value.replace(self.t1, t1).replace(self.t2, t2)
+        return self.F_tmp__value.xreplace({self.t1: t1, self.t2: t2})
 
     def W(self, t1: Symbol, t2: Symbol) -> Symbol:
         if self.W__value is None:
@@ -234,7 +241,7 @@ class Formulas:
             self.W__value = (first + second) / ((self.t1 - self.t2) * self.F_tmp_square(self.t1, self.t2))
             logger.info(f"The value for W is set")
 
-        return self.W__value.replace(self.t1, t1).replace(self.t2, t2)
+        return self.W__value.xreplace({self.t1: t1, self.t2: t2})
 
     def P(self, t: Symbol) -> List[Symbol]:
         if self.P__value is None:
@@ -251,25 +258,30 @@ class Formulas:
             self.Kappa__value = sqrt(2. * IonizationSymbols.I_p + square(self.K_2(self.t1, self.t2)))
             logger.info(f"The value for Kappa is set")
 
-        return self.Kappa__value.replace(self.t1, t1).replace(self.t2, t2)
+        return self.Kappa__value.xreplace({self.t1: t1, self.t2: t2})
 
     def S(self, t1: Symbol, t2: Symbol) -> Symbol:
         if self.S__value is None:
             # tmp1, tmp2 = symbols('tmp1, tmp2')
 
-            inner_int = integrate_list(self.A(self.t), self.t, self.t2, self.t1)
-            to_outer_integrating = square(sum_as_vectors(
-                self.A(self.t),
-                increase(-1. / (self.t1 - self.t2), inner_int)
-            )
-            )
+            inner_int = self.A_integral(self.t1, self.t2)
+            if self.closed_form:
+                # The mean of A over [t2, t1] is inner_int / (t1 - t2), so the square of the deviation from it
+                # integrates to the integral of A^2 minus inner_int^2 / (t1 - t2)
+                integral = self.A_square_integral(self.t1, self.t2) - square(inner_int) / (self.t1 - self.t2)
+            else:
+                to_outer_integrating = square(sum_as_vectors(
+                    self.A(self.t),
+                    increase(-1. / (self.t1 - self.t2), inner_int)
+                )
+                )
 
-            integral = Integral(to_outer_integrating, (self.t, self.t2, self.t1))  # TODO Stopgap measure
+                integral = Integral(to_outer_integrating, (self.t, self.t2, self.t1))  # TODO Stopgap measure
 
             self.S__value = -0.5 * integral + IonizationSymbols.I_p * self.t2 ** 2
             logger.info(f"The value for S is set")
 
-        return self.S__value.replace(self.t1, t1).replace(self.t2, t2)
+        return self.S__value.xreplace({self.t1: t1, self.t2: t2})
 
     def L(self, t1: Symbol, t2: Symbol) -> Symbol:
         if self.L__value is None:
@@ -279,4 +291,4 @@ class Formulas:
             )
             logger.info(f"The value for L is set")
 
-        return self.L__value.replace(self.t1, t1).replace(self.t2, t2)
+        return self.L__value.xreplace({self.t1: t1, self.t2: t2})
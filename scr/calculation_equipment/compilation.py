@@ -0,0 +1,484 @@
+import logging
+from collections import defaultdict, OrderedDict
+from functools import partial
+from typing import Callable, Tuple, List, Sequence, Dict
+
+import numpy
+from numpy import ndarray
+import scipy.constants
+import scipy.special
+from scipy.integrate import quad as scipy_quad
+from sympy import Symbol, lambdify, Integral, numbered_symbols, default_sort_key, evaluate, sympify, Add, Mul, \
+    Function
+from sympy.printing.numpy import SciPyPrinter
+
+from scr.instrumentation import measure
+from scr.parameter.IonizationParameter import IonizationParameter
+from scr.parameter.IonizationSymbols import IonizationSymbols
+from scr.util import Number
+
+logger = logging.getLogger(__name__)
+
+NUMERIC = 'numeric'
+SYMBOLIC = 'symbolic'
+MODES = (NUMERIC, SYMBOLIC)
+
+PARAMETER_SYMBOLS: Tuple[Symbol, ...] = (
+    IonizationSymbols.T_d,
+    IonizationSymbols.F,
+    IonizationSymbols.omega_1,
+    IonizationSymbols.omega_2,
+    IonizationSymbols.etta_1,
+    IonizationSymbols.etta_2,
+    IonizationSymbols.N_1,
+    IonizationSymbols.N_2,
+    IonizationSymbols.f_0,
+    IonizationSymbols.I_p,
+    IonizationSymbols.p,
+    IonizationSymbols.p_theta
+)
+
+FUNCTION_NAME = '_compiled'
+
+# Nodes of the 15-point Kronrod rule, the odd ones are the nodes of the embedded 7-point Gauss rule
+KRONROD_NODES = numpy.array([
+    -0.991455371120812639206854697526329,
+    -0.949107912342758524526189684047851,
+    -0.864864423359769072789712788640926,
+    -0.741531185599394439863864773280788,
+    -0.586087235467691130294144845693013,
+    -0.405845151377397166906606412076961,
+    -0.207784955007898467600689403773245,
+    0.000000000000000000000000000000000,
+    0.207784955007898467600689403773245,
+    0.405845151377397166906606412076961,
+    0.586087235467691130294144845693013,
+    0.741531185599394439863864773280788,
+    0.864864423359769072789712788640926,
+    0.949107912342758524526189684047851,
+    0.991455371120812639206854697526329
+])
+KRONROD_WEIGHTS = numpy.array([
+    0.022935322010529224963732008058970,
+    0.063092092629978553290700663189204,
+    0.104790010322250183839876322541518,
+    0.140653259715525918745189590510238,
+    0.169004726639267902826583426598550,
+    0.190350578064785409913256402421014,
+    0.204432940075298892414161999234649,
+    0.209482141084727828012999174891714,
+    0.204432940075298892414161999234649,
+    0.190350578064785409913256402421014,
+    0.169004726639267902826583426598550,
+    0.140653259715525918745189590510238,
+    0.104790010322250183839876322541518,
+    0.063092092629978553290700663189204,
+    0.022935322010529224963732008058970
+])
+GAUSS_WEIGHTS = numpy.array([
+    0.129484966168869693270611432679082,
+    0.279705391489276667901467771423780,
+    0.381830050505118944950369775488975,
+    0.417959183673469387755102040816327,
+    0.381830050505118944950369775488975,
+    0.279705391489276667901467771423780,
+    0.129484966168869693270611432679082
+])
+
+ABSOLUTE_TOLERANCE = 1e-12
+RELATIVE_TOLERANCE = 1e-10
+MAX_BISECTIONS = 12
+BATCH_PANELS = 8
+MAX_BATCH_PANELS = 128
+SPECIALIZATIONS = 8
+
+
+def parameter_values(parameter: IonizationParameter) -> Tuple[Number, ...]:
+    return tuple(getattr(parameter, symbol.name) for symbol in PARAMETER_SYMBOLS)
+
+
+def polish_limit(limit: Number) -> Number:
+    if numpy.iscomplexobj(limit):
+        if numpy.imag(limit) != 0:
+            return complex(limit)
+        return float(numpy.real(limit))
+    return float(limit)
+
+
+def evaluate_integrand(integrand: Callable[[ndarray], ndarray], points: ndarray) -> ndarray:
+    try:
+        values = integrand(points)
+    except TypeError:
+        values = numpy.vectorize(integrand, otypes=[complex])(points)
+    return numpy.broadcast_to(values, numpy.broadcast_shapes(numpy.shape(values), points.shape))
+
+
+def kronrod_rule(integrand: Callable[[ndarray], ndarray], begin: ndarray, end: ndarray) -> Tuple[ndarray, ndarray]:
+    # One evaluation of the integrand at all the nodes of all the intervals gives both the value and its error
+    center = (begin + end) / 2
+    half_width = (end - begin) / 2
+    points = center + half_width * KRONROD_NODES.reshape((-1,) + (1,) * numpy.ndim(begin))
+    values = evaluate_integrand(integrand, points)
+
+    kronrod = half_width * numpy.tensordot(KRONROD_WEIGHTS, values, axes=1)
+    gauss = half_width * numpy.tensordot(GAUSS_WEIGHTS, values[1::2], axes=1)
+    return kronrod, numpy.abs(kronrod - gauss)
+
+
+def tolerance(value: Number) -> Number:
+    return numpy.maximum(ABSOLUTE_TOLERANCE, RELATIVE_TOLERANCE * numpy.abs(value))
+
+
+def integrate_on_batch(integrand: Callable[[ndarray], ndarray], begin: ndarray, end: ndarray) -> ndarray:
+    # Every pair of limits gets the same panels, so the whole batch is one evaluation. The panels are refined together
+    # since the integrand may depend on other arrays of the batch
+    begin, end = numpy.broadcast_arrays(numpy.asarray(begin), numpy.asarray(end))
+
+    panels = BATCH_PANELS
+    while True:
+        edges = numpy.linspace(0, 1, panels + 1).reshape((-1,) + (1,) * begin.ndim)
+        borders = begin + (end - begin) * edges
+        values, errors = kronrod_rule(integrand, borders[:-1], borders[1:])
+        value, error = numpy.sum(values, axis=0), numpy.sum(errors, axis=0)
+
+        inaccurate = error > tolerance(value)
+        if not inaccurate.any() or panels >= MAX_BATCH_PANELS:
+            break
+        panels *= 2
+
+    if inaccurate.any():
+        logger.warning(f"The tolerance isn't reached for {numpy.count_nonzero(inaccurate)} integrals of the batch. "
+                       f"The largest error estimate is {numpy.max(error)}")
+    return value
+
+
+def integrate_adaptively(integrand: Callable[[ndarray], ndarray], begin: float, end: float) -> Number:
+    # Every interval whose error exceeds its share of the tolerance is bisected, all the halves in one evaluation
+    begins, ends = numpy.array([begin]), numpy.array([end])
+    values, errors = kronrod_rule(integrand, begins, ends)
+
+    for _ in range(MAX_BISECTIONS):
+        value = numpy.sum(values)
+        if numpy.sum(errors) <= tolerance(value):
+            return value
+
+        coarse = errors > tolerance(value) * (ends - begins) / (end - begin)
+        coarse[numpy.argmax(errors)] = True
+        middles = (begins[coarse] + ends[coarse]) / 2
+        halves_begins = numpy.concatenate([begins[coarse], middles])
+        halves_ends = numpy.concatenate([middles, ends[coarse]])
+        halves_values, halves_errors = kronrod_rule(integrand, halves_begins, halves_ends)
+
+        begins = numpy.concatenate([begins[~coarse], halves_begins])
+        ends = numpy.concatenate([ends[~coarse], halves_ends])
+        values = numpy.concatenate([values[~coarse], halves_values])
+        errors = numpy.concatenate([errors[~coarse], halves_errors])
+
+    logger.debug(f"The tolerance isn't reached after {MAX_BISECTIONS} bisections on [{begin}, {end}]. "
+                 f"Fall back to the adaptive quad")
+    real = scipy_quad(lambda t: numpy.real(integrand(t)), begin, end)[0]
+    imagine = scipy_quad(lambda t: numpy.imag(integrand(t)), begin, end)[0]
+    return complex(real, imagine)
+
+
+def integrate_numerically(integrand: Callable[[float], Number], begin: Number, end: Number) -> Number:
+    with measure('quadrature'):
+        return integrate_limits(integrand, begin, end)
+
+
+def integrate_limits(integrand: Callable[[float], Number], begin: Number, end: Number) -> Number:
+    if numpy.ndim(begin) > 0 or numpy.ndim(end) > 0:
+        return integrate_on_batch(integrand, begin, end)
+
+    begin, end = polish_limit(begin), polish_limit(end)
+    if begin == end:
+        return 0.
+
+    if isinstance(begin, complex) or isinstance(end, complex):
+        # The integrand is analytic, so the integral is taken along the segment from begin to end
+        value = complex(integrate_adaptively(lambda s: integrand(begin + (end - begin) * s) * (end - begin), 0., 1.))
+    else:
+        value = complex(integrate_adaptively(integrand, begin, end))
+    if value.imag == 0:
+        return value.real
+    return value
+
+
+class NumericPrinter(SciPyPrinter):
+    # Integral nodes become a call of `integrate_numerically` with the integrand compiled in place as a lambda
+    def _print_Integral(self, expr: Integral) -> str:
+        code = self._print(expr.function)
+        for limit in expr.limits:
+            if len(limit) != 3:
+                raise ValueError(f"Only definite integrals can be compiled. Got: {expr}")
+            variable, begin, end = limit
+            code = f"integrate_numerically(lambda {self._print(variable)}: {code}, " \
+                   f"{self._print(begin)}, {self._print(end)})"
+        return code
+
+
+def namespace() -> dict:
+    return {
+        'numpy': numpy,
+        'scipy': scipy,
+        'integrate_numerically': integrate_numerically
+    }
+
+
+def create_printer() -> NumericPrinter:
+    return NumericPrinter({'fully_qualified_modules': True, 'inline': True, 'allow_unknown_functions': True,
+                           'order': 'none'})
+
+
+def eliminate_subterms(expressions: Sequence[Symbol], prefix: str) -> Tuple[List[Tuple[Symbol, Symbol]], List[Symbol]]:
+    # Plain elimination of the repeated subtrees. Unlike sympy cse nothing is evaluated once more while the
+    # expressions are rebuilt, which takes minutes for the stored formulas
+    counts: Dict[Symbol, int] = defaultdict(int)
+
+    def count(node: Symbol) -> None:
+        if node.is_Atom:
+            return
+        counts[node] += 1
+        if counts[node] == 1:
+            for argument in node.args:
+                count(argument)
+
+    names = numbered_symbols(f"{prefix}subterm_")
+    substitutions: List[Tuple[Symbol, Symbol]] = []
+    rebuilt: Dict[Symbol, Symbol] = {}
+
+    def rebuild(node: Symbol) -> Symbol:
+        if node.is_Atom:
+            return node
+        if node not in rebuilt:
+            result = node.func(*[rebuild(argument) for argument in node.args])
+            if counts[node] > 1:
+                name = next(names)
+                substitutions.append((name, result))
+                result = name
+            rebuilt[node] = result
+        return rebuilt[node]
+
+    for expression in expressions:
+        count(expression)
+    with evaluate(False):
+        reduced = [rebuild(expression) for expression in expressions]
+    return substitutions, reduced
+
+
+def generate_statements(expressions: Sequence[Symbol], indent: str, prefix: str) -> Tuple[List[str], List[str]]:
+    # Integrals are evaluated first and then every subterm shared by the expressions is computed only once
+    printer = create_printer()
+    integrals = sorted(set().union(*[expression.atoms(Integral) for expression in expressions]), key=default_sort_key)
+    placeholders = {integral: Symbol(f"{prefix}integral_{number}") for number, integral in enumerate(integrals)}
+    with evaluate(False):
+        reduced = [expression.xreplace(placeholders) for expression in expressions]
+
+    lines: List[str] = []
+    for integral, placeholder in placeholders.items():
+        if any(expression.has(placeholder) for expression in reduced):
+            lines += generate_integral_statements(integral, placeholder.name, indent)
+
+    substitutions, reduced = eliminate_subterms(reduced, prefix)
+    lines += [f"{indent}{printer.doprint(name)} = {printer.doprint(value)}" for name, value in substitutions]
+    return lines, [printer.doprint(expression) for expression in reduced]
+
+
+def generate_integral_statements(integral: Integral, name: str, indent: str) -> List[str]:
+    printer = create_printer()
+    if len(integral.limits) != 1 or len(integral.limits[0]) != 3:
+        return [f"{indent}{name} = {printer.doprint(integral)}"]
+
+    variable, begin, end = integral.limits[0]
+    integrand = f"{name}_integrand"
+    lines, results = generate_statements([integral.function], indent + '    ', f"{integrand}_")
+
+    return [f"{indent}def {integrand}({printer.doprint(variable)}):"] + lines + [
+        f"{indent}    return {results[0]}",
+        f"{indent}{name} = integrate_numerically({integrand}, {printer.doprint(begin)}, {printer.doprint(end)})"
+    ]
+
+
+def generate_function(expressions: Sequence[Symbol], arguments: Tuple[Symbol, ...], shared: bool) -> str:
+    printer = create_printer()
+    signature = ', '.join(printer.doprint(argument) for argument in arguments)
+    lines, results = generate_statements(expressions, '    ', '_')
+    result = f"({', '.join(results)},)" if shared else results[0]
+
+    return '\n'.join([f"def {FUNCTION_NAME}({signature}):"] + lines + [f"    return {result}"]) + '\n'
+
+
+def generate_source(expression: Symbol, arguments: Tuple[Symbol, ...]) -> str:
+    return generate_function([expression], arguments, False)
+
+
+def generate_shared_source(expressions: Sequence[Symbol], arguments: Tuple[Symbol, ...]) -> str:
+    return generate_function(expressions, arguments, True)
+
+
+def load_source(source: str) -> Callable[..., Number]:
+    scope = namespace()
+    exec(compile(source, f"<{FUNCTION_NAME}>", 'exec'), scope)
+    return scope[FUNCTION_NAME]
+
+
+def evaluate_symbolically(function: Callable[..., Symbol], *arguments: Number) -> Number:
+    with measure('evalf'):
+        return function(*arguments).evalf()
+
+
+def compile_function(expression: Symbol,
+                     arguments: Tuple[Symbol, ...],
+                     mode: str = NUMERIC,
+                     integrator: Callable = None) -> Callable[..., Number]:
+    if mode == NUMERIC:
+        return load_source(generate_source(expression, arguments))
+
+    if mode == SYMBOLIC:
+        modules: List = [{"pi": numpy.pi}, 'sympy']
+        if integrator is not None:
+            expression, integrals = separate_integrals(expression, arguments, integrator)
+            modules.insert(1, integrals)
+        symbolic = lambdify(arguments, expression, modules=modules)
+        return lambda *args: evaluate_symbolically(symbolic, *args)
+
+    raise ValueError(f"Unknown compilation mode: {mode}. Supported: {MODES}")
+
+
+def separate_integrals(expression: Symbol,
+                       arguments: Tuple[Symbol, ...],
+                       integrator: Callable) -> Tuple[Symbol, Dict[str, Callable[..., Number]]]:
+    """
+    Every outermost definite integral of the expression is replaced by a call of a function named after it. The
+    function gives its integrand compiled once with the arguments of the expression after the integration variable to
+    the integrator as integrator(integrand, begin, end, *arguments).
+    """
+    integrals = sorted(expression.atoms(Integral), key=default_sort_key)
+    outermost = [integral for integral in integrals
+                 if not any(other != integral and other.has(integral) for other in integrals)]
+
+    functions: Dict[str, Callable[..., Number]] = {}
+    replacements: Dict[Integral, Symbol] = {}
+    for number, integral in enumerate(outermost):
+        if len(integral.limits) != 1 or len(integral.limits[0]) != 3:
+            raise ValueError(f"Only definite integrals of one variable can be compiled. Got: {integral}")
+        variable, begin, end = integral.limits[0]
+        name = f"_integral_{number}"
+        functions[name] = partial(integrator, load_source(generate_source(integral.function, (variable,) + arguments)))
+        replacements[integral] = Function(name)(begin, end, *arguments)
+
+    with evaluate(False):
+        return expression.xreplace(replacements), functions
+
+
+def compile_shared(expressions: Sequence[Symbol], arguments: Tuple[Symbol, ...]) -> Callable[..., Tuple[Number, ...]]:
+    return load_source(generate_shared_source(expressions, arguments))
+
+
+def specialize(expression: Symbol, values: Dict[Symbol, Number]) -> Symbol:
+    """
+    The expression with the given symbols replaced by their values and every subterm free of the other symbols folded
+    into a number. Nothing else is evaluated once more, since rebuilding the stored formulas with evaluation takes
+    minutes. Integrals are kept to be integrated numerically.
+    """
+    constants = {symbol: sympify(value) for symbol, value in values.items()}
+    folded: Dict[Symbol, Symbol] = {}
+
+    def is_constant(node: Symbol) -> bool:
+        return node.is_number and not node.has(Integral)
+
+    def fold(node: Symbol) -> Symbol:
+        if node in constants:
+            return constants[node]
+        if node.is_Atom:
+            return node
+        if node in folded:
+            return folded[node]
+
+        arguments = [fold(argument) for argument in node.args]
+        if not isinstance(node, Integral) and all(is_constant(argument) for argument in arguments):
+            result = node.func(*arguments).evalf()
+        elif node.func in (Add, Mul):
+            # The constant terms or factors are folded together, the others are kept as they are
+            constant = node.func(*[argument for argument in arguments if is_constant(argument)]).evalf()
+            others = [argument for argument in arguments if not is_constant(argument)]
+            if node.func is Mul and constant == 0:
+                result = constant
+            else:
+                if constant != node.func.identity:
+                    others.insert(0, constant)
+                with evaluate(False):
+                    result = node.func(*others) if len(others) > 1 else others[0]
+        else:
+            with evaluate(False):
+                result = node.func(*arguments)
+        folded[node] = result
+        return result
+
+    return fold(expression)
+
+
+class SpecializedFunction:
+    # Formulas compiled with the fixed parameters folded in. The free parameters stay arguments after the given ones,
+    # the functions compiled for the last used values of the fixed parameters are kept
+    def __init__(self,
+                 expressions: Sequence[Symbol],
+                 arguments: Tuple[Symbol, ...],
+                 free: Sequence[Symbol] = (),
+                 shared: bool = False,
+                 size: int = SPECIALIZATIONS) -> None:
+        if size < 1:
+            raise ValueError(f"At least one specialization should be kept. Got: {size}")
+
+        self.expressions = list(expressions)
+        self.arguments = arguments
+        self.free = tuple(free)
+        self.fixed = tuple(symbol for symbol in PARAMETER_SYMBOLS if symbol not in self.free)
+        self.shared = shared
+        self.size = size
+        self.functions: OrderedDict = OrderedDict()
+        self.compilations = 0
+
+    def fingerprint(self, parameter: IonizationParameter) -> Tuple[Number, ...]:
+        return tuple(getattr(parameter, symbol.name) for symbol in self.fixed)
+
+    def get(self, parameter: IonizationParameter) -> Callable[..., Number]:
+        fingerprint = self.fingerprint(parameter)
+        function = self.functions.get(fingerprint)
+        if function is not None:
+            self.functions.move_to_end(fingerprint)
+            return function
+
+        values = dict(zip(self.fixed, fingerprint))
+        expressions = [specialize(expression, values) for expression in self.expressions]
+        function = load_source(generate_function(expressions, self.arguments + self.free, self.shared))
+        self.compilations += 1
+        logger.debug(f"The formulas are specialized for {values}")
+
+        self.functions[fingerprint] = function
+        if len(self.functions) > self.size:
+            self.functions.popitem(last=False)
+        return function
+
+    def evaluate(self, parameter: IonizationParameter, *arguments: Number) -> Number:
+        return self.get(parameter)(*arguments, *[getattr(parameter, symbol.name) for symbol in self.free])
+
+
+class SharedEvaluation:
+    # Several formulas compiled together. The values for the last scalar arguments are kept to be reused by others
+    def __init__(self, function: Callable[..., Tuple[Number, ...]]) -> None:
+        self.function = function
+        self.arguments = None
+        self.values = None
+
+    def evaluate(self, *arguments: Number) -> Tuple[Number, ...]:
+        if not all(numpy.ndim(argument) == 0 for argument in arguments):
+            return self.function(*arguments)
+
+        if self.arguments != arguments:
+            self.values = self.function(*arguments)
+            self.arguments = arguments
+        return self.values
+
+    def get(self, index: int, *arguments: Number) -> Number:
+        return self.evaluate(*arguments)[index]
@@ -0,0 +1,100 @@
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sympy import Symbol, Add, Mul, Poly, Integral, exp, log, erf, sqrt, pi, expand, PolynomialError, sin, cos
+
+
+def split_term(term: Symbol, t: Symbol) -> Optional[Tuple[Symbol, int, Symbol]]:
+    # A term is split as coefficient * t ** power * exp(exponent). None if the term has another form
+    coefficient, power, exponent = [], 0, []
+    for factor in Mul.make_args(term):
+        if not factor.has(t):
+            coefficient.append(factor)
+        elif factor == t:
+            power += 1
+        elif factor.is_Pow and factor.base == t and factor.exp.is_Integer and factor.exp > 0:
+            power += int(factor.exp)
+        elif isinstance(factor, exp):
+            exponent.append(factor.args[0])
+        elif factor.is_Pow and isinstance(factor.base, exp) and not factor.exp.has(t):
+            exponent.append(factor.exp * factor.base.args[0])
+        elif factor.is_Pow and not factor.base.has(t):
+            exponent.append(factor.exp * log(factor.base))
+        else:
+            return None
+    return Mul(*coefficient), power, expand(Add(*exponent))
+
+
+def quadratic_coefficients(exponent: Symbol, t: Symbol) -> Optional[Tuple[Symbol, Symbol, Symbol]]:
+    try:
+        polynomial = Poly(exponent, t)
+    except PolynomialError:
+        return None
+    if polynomial.degree() > 2:
+        return None
+    return tuple(polynomial.coeff_monomial(t ** power) for power in (2, 1, 0))
+
+
+def gaussian_moments(quadratic: Symbol,
+                     linear: Symbol,
+                     constant: Symbol,
+                     t: Symbol,
+                     begin: Symbol,
+                     end: Symbol,
+                     max_power: int) -> List[Symbol]:
+    # I_k = integral of t ** k * exp(quadratic * t ** 2 + linear * t + constant) for k = 0, ..., max_power.
+    # I_0 is an erf difference and the next ones follow from integrating by parts:
+    # I_(k + 1) = (linear * I_k + k * I_(k - 1) - [t ** k * exp(...)]) / (-2 * quadratic)
+    alpha = -quadratic
+    center = linear / (2 * alpha)
+    shift = constant + linear ** 2 / (4 * alpha)
+
+    def boundary(power: int) -> Symbol:
+        exponent = quadratic * t ** 2 + linear * t + constant
+        return end ** power * exp(exponent.subs(t, end)) - begin ** power * exp(exponent.subs(t, begin))
+
+    moments = [
+        exp(shift) * sqrt(pi) / (2 * sqrt(alpha)) * (erf(sqrt(alpha) * (end - center)) -
+                                                     erf(sqrt(alpha) * (begin - center)))
+    ]
+    for power in range(max_power):
+        previous = power * moments[power - 1] if power > 0 else 0
+        moments.append((linear * moments[power] + previous - boundary(power)) / (2 * alpha))
+    return moments
+
+
+def integrate_gaussian(expression: Symbol, t: Symbol, begin: Symbol, end: Symbol) -> Symbol:
+    # Sums of polynomials times exponents of quadratics in t, trigonometric functions included, are integrated in
+    # closed form. Terms of any other form are integrated by sympy or left as an Integral if it fails
+    terms: Dict[Tuple[Symbol, int], List[Symbol]] = defaultdict(list)
+    rest: List[Symbol] = []
+    for term in Add.make_args(expand(expression.rewrite(sin, exp).rewrite(cos, exp))):
+        split = split_term(term, t)
+        if split is None or quadratic_coefficients(split[2], t) is None:
+            rest.append(term)
+        else:
+            coefficient, power, exponent = split
+            terms[(exponent, power)].append(coefficient)
+
+    powers: Dict[Symbol, int] = defaultdict(int)
+    for exponent, power in terms:
+        powers[exponent] = max(powers[exponent], power)
+
+    result = []
+    for exponent, max_power in powers.items():
+        quadratic, linear, constant = quadratic_coefficients(exponent, t)
+        if quadratic == 0:
+            for power in range(max_power + 1):
+                if (exponent, power) in terms:
+                    rest.append(Add(*terms[(exponent, power)]) * t ** power * exp(exponent))
+            continue
+
+        moments = gaussian_moments(quadratic, linear, constant, t, begin, end, max_power)
+        for power in range(max_power + 1):
+            if (exponent, power) in terms:
+                result.append(Add(*terms[(exponent, power)]) * moments[power])
+
+    if rest:
+        rest_integral = Add(*rest).integrate((t, begin, end))
+        result.append(rest_integral if not rest_integral.has(Integral) else Integral(Add(*rest), (t, begin, end)))
+    return Add(*result)
@@ -0,0 +1,121 @@
+from typing import Callable, Tuple, Optional
+
+import numpy
+from numpy import ndarray
+
+Residuals = Callable[[ndarray, ndarray], Tuple[ndarray, ndarray]]
+Jacobian = Callable[[ndarray, ndarray], Tuple[ndarray, ndarray, ndarray, ndarray]]
+
+TOLERANCE = 1e-8
+MAX_ITERATIONS = 50
+MAX_HALVINGS = 6
+DIFFERENTIATION_STEP = 1e-7
+
+
+def finite_difference_jacobian(residuals: Residuals) -> Jacobian:
+    def jacobian(x: ndarray, y: ndarray) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+        h_x = DIFFERENTIATION_STEP * numpy.maximum(1., numpy.abs(x))
+        h_y = DIFFERENTIATION_STEP * numpy.maximum(1., numpy.abs(y))
+
+        first, second = residuals(x, y)
+        first_x, second_x = residuals(x + h_x, y)
+        first_y, second_y = residuals(x, y + h_y)
+
+        return (first_x - first) / h_x, (first_y - first) / h_y, (second_x - second) / h_x, (second_y - second) / h_y
+
+    return jacobian
+
+
+def residual_norm(first: ndarray, second: ndarray) -> ndarray:
+    norm = numpy.hypot(numpy.abs(first), numpy.abs(second))
+    return numpy.where(numpy.isfinite(norm), norm, numpy.inf)
+
+
+def solve_batch(residuals: Residuals,
+                x: ndarray,
+                y: ndarray,
+                jacobian: Optional[Jacobian] = None,
+                tolerance: float = TOLERANCE,
+                max_iterations: int = MAX_ITERATIONS,
+                radius: float = 0.) -> Tuple[ndarray, ndarray, ndarray, ndarray]:
+    """
+    Damped Newton iterations for a 2x2 system run for all seeds at once.
+    Returns the final points, a mask of converged seeds and the number of iterations every seed took.
+    With a positive radius a seed stops as converged once it comes closer than the radius to an already converged one.
+    """
+    if jacobian is None:
+        jacobian = finite_difference_jacobian(residuals)
+
+    x = numpy.array(x, dtype=numpy.result_type(x, float), copy=True)
+    y = numpy.array(y, dtype=numpy.result_type(y, float), copy=True)
+    iterations = numpy.zeros(x.shape, dtype=int)
+    absorbed = numpy.zeros(x.shape, dtype=bool)
+
+    with numpy.errstate(all='ignore'):
+        norm = residual_norm(*residuals(x, y))
+        active = numpy.isfinite(norm) & (norm >= tolerance)
+
+        for _ in range(max_iterations):
+            if not active.any():
+                break
+            indices = numpy.flatnonzero(active)
+            x_active, y_active = x[indices], y[indices]
+
+            first, second = residuals(x_active, y_active)
+            a, b, c, d = jacobian(x_active, y_active)
+            determinant = a * d - b * c
+            step_x = (d * first - b * second) / determinant
+            step_y = (a * second - c * first) / determinant
+
+            factor = numpy.ones(indices.shape)
+            new_norm = numpy.full(indices.shape, numpy.inf)
+            pending = numpy.isfinite(step_x) & numpy.isfinite(step_y)
+            new_x, new_y = x_active.copy(), y_active.copy()
+
+            for _ in range(MAX_HALVINGS):
+                if not pending.any():
+                    break
+                trial_x = x_active[pending] - factor[pending] * step_x[pending]
+                trial_y = y_active[pending] - factor[pending] * step_y[pending]
+                trial_norm = residual_norm(*residuals(trial_x, trial_y))
+
+                accepted = trial_norm < norm[indices][pending]
+                positions = numpy.flatnonzero(pending)
+                new_x[positions[accepted]] = trial_x[accepted]
+                new_y[positions[accepted]] = trial_y[accepted]
+                new_norm[positions[accepted]] = trial_norm[accepted]
+
+                pending[positions[accepted]] = False
+                factor[pending] /= 2.
+
+            iterations[indices] += 1
+            improved = numpy.isfinite(new_norm)
+            x[indices[improved]] = new_x[improved]
+            y[indices[improved]] = new_y[improved]
+            norm[indices[improved]] = new_norm[improved]
+
+            active[indices[~improved]] = False
+            active[indices[improved]] = new_norm[improved] >= tolerance
+
+            if radius > 0:
+                absorbed |= absorb(x, y, active, norm < tolerance, radius)
+                active &= ~absorbed
+
+    return x, y, (norm < tolerance) | absorbed, iterations
+
+
+def absorb(x: ndarray, y: ndarray, active: ndarray, converged: ndarray, radius: float) -> ndarray:
+    # Active seeds closer than the radius to a converged seed are moved to it. Returns the mask of the moved seeds
+    result = numpy.zeros(x.shape, dtype=bool)
+    if not active.any() or not converged.any():
+        return result
+    active_indices, converged_indices = numpy.flatnonzero(active), numpy.flatnonzero(converged)
+    distances = numpy.hypot(numpy.abs(x[active_indices, numpy.newaxis] - x[numpy.newaxis, converged_indices]),
+                            numpy.abs(y[active_indices, numpy.newaxis] - y[numpy.newaxis, converged_indices]))
+    nearest = numpy.argmin(distances, axis=1)
+    close = distances[numpy.arange(len(active_indices)), nearest] < radius
+
+    moved, targets = active_indices[close], converged_indices[nearest[close]]
+    x[moved], y[moved] = x[targets], y[targets]
+    result[moved] = True
+    return result
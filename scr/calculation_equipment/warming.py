@@ -0,0 +1,134 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, List, Optional, Sequence
+
+from sympy import Symbol
+
+from scr.calculation_equipment.FormulaCache import FormulaCache
+from scr.calculation_equipment.Formulas import Formulas
+from scr.calculation_equipment.compilation import PARAMETER_SYMBOLS
+from scr.logs import get_worker_initializer
+from scr.main import CACHE_DIRECTORY, FORMULAS_DIRECTORY, shared
+from scr.solver.EquationSolver import EquationSolver
+from scr.stage.IonStage import IonStage
+from scr.stage.PropelStage import PropelStage
+
+logger = logging.getLogger(__name__)
+
+FORMULA_NAMES = (
+    EquationSolver.STORAGE_1.name,
+    EquationSolver.STORAGE_2.name,
+    IonStage.STORAGE.name,
+    PropelStage.STORAGE.name
+)
+
+
+def derive(generator: Callable,
+           name: str,
+           closed_form: bool = True,
+           directory: Optional[Path] = None,
+           formulas_directory: Optional[Path] = None) -> List[str]:
+    """
+    Derives the stored formula with the given name, the derivatives the solver needs of it and their sources into the
+    cache unless they are already there. Returns the names of the derived entries.
+    """
+    x, y = Symbol('x'), Symbol('y')
+    if name == EquationSolver.STORAGE_1.name:
+        derivatives = EquationSolver.JACOBIAN_NAMES[:2]
+        cache = FormulaCache(generator, EquationSolver, directory)
+        compute_formula = EquationSolver.compute_first_equation
+    elif name == EquationSolver.STORAGE_2.name:
+        derivatives = EquationSolver.JACOBIAN_NAMES[2:]
+        cache = FormulaCache(generator, EquationSolver, directory)
+        compute_formula = EquationSolver.compute_second_equation
+    elif name == IonStage.STORAGE.name:
+        derivatives = ()
+        cache = FormulaCache(generator, IonStage, directory)
+        compute_formula = IonStage.compute_stage
+    elif name == PropelStage.STORAGE.name:
+        derivatives = ()
+        cache = FormulaCache(generator, PropelStage, directory, PropelStage.cache_variant(closed_form))
+        compute_formula = PropelStage.compute_stage
+    else:
+        raise ValueError(f"Unknown formula: {name}. Expected one of: {list(FORMULA_NAMES)}")
+
+    export = cache.export_path(PropelStage.export_name(closed_form) if name == PropelStage.STORAGE.name else name,
+                               formulas_directory)
+    derived: List[str] = []
+
+    def compute() -> Symbol:
+        derived.append(name)
+        formulas = Formulas.instance(generator, closed_form if name == PropelStage.STORAGE.name else True)
+        return compute_formula(formulas, x, y)
+
+    expression = cache.derive_expression(name, compute, export)
+    if cache.restore_source(name) is None:
+        cache.compile(name, expression, (x, y) + PARAMETER_SYMBOLS)
+        derived.append(f"{name} source")
+
+    for derivative_name, variable in zip(derivatives, (x, y)):
+        if cache.restore_expression(derivative_name) is None:
+            cache.derive_expression(derivative_name, lambda: expression.diff(variable),
+                                    cache.export_path(derivative_name, formulas_directory))
+            derived.append(derivative_name)
+    return derived
+
+
+def warm_formulas(generator: Callable,
+                  workers: int = 1,
+                  names: Sequence[str] = FORMULA_NAMES,
+                  closed_form: bool = True,
+                  directory: Optional[Path] = None,
+                  formulas_directory: Optional[Path] = None) -> List[str]:
+    """
+    Derives the stored formulas by parallel worker processes, so the solver and the stages constructed afterwards only
+    read the cache. Returns the names of the derived entries. The cache and the formulas directories default to the
+    shared ones, the formulas of a generator other than the default one aren't exported to the shipped directory.
+    """
+    if workers < 1:
+        raise ValueError(f"At least one worker is required. Got: {workers}")
+    # The workers are given the directory, since a spawned one doesn't share it
+    directory = shared[CACHE_DIRECTORY] if directory is None else directory
+    formulas_directory = shared[FORMULAS_DIRECTORY] if formulas_directory is None else formulas_directory
+
+    logger.info(f"Start to derive {list(names)} by {min(workers, len(names))} worker processes")
+    if workers == 1 or len(names) < 2:
+        results = [derive(generator, name, closed_form, directory, formulas_directory) for name in names]
+    else:
+        count = len(names)
+        initializer, initargs = get_worker_initializer()
+        with ProcessPoolExecutor(max_workers=min(workers, count), initializer=initializer,
+                                 initargs=initargs) as executor:
+            results = list(executor.map(derive, [generator] * count, names, [closed_form] * count,
+                                        [directory] * count, [formulas_directory] * count))
+
+    derived = [entry for result in results for entry in result]
+    if EquationSolver.STORAGE_1.name in names and EquationSolver.STORAGE_2.name in names:
+        # The jacobian source is shared by both equations, so it's generated once both of them are derived
+        cache = FormulaCache(generator, EquationSolver, directory)
+        if cache.restore_source('jacobian') is None:
+            x, y = Symbol('x'), Symbol('y')
+            jacobian = [cache.restore_expression(name) for name in EquationSolver.JACOBIAN_NAMES]
+            cache.compile_shared('jacobian', jacobian, (x, y) + PARAMETER_SYMBOLS)
+            derived.append('jacobian source')
+
+    logger.info(f"The entries {derived} are derived")
+    return derived
+
+
+def remove_stale_entries(generators: Sequence[Callable], directory: Optional[Path] = None) -> List[Path]:
+    """
+    Removes the entries of the cache derived for definitions that have changed since. The generators are all the ones
+    the cache is kept for, the entries of any other generator are removed as well. Returns the removed entries.
+    The cache directory defaults to the shared one.
+    """
+    caches: List[FormulaCache] = []
+    for generator in generators:
+        ion_stage_cache = FormulaCache(generator, IonStage, directory)
+        caches += [FormulaCache(generator, EquationSolver, directory), ion_stage_cache]
+        for closed_form in (True, False):
+            propel_stage_cache = FormulaCache(generator, PropelStage, directory, PropelStage.cache_variant(closed_form))
+            # The shared evaluation of the stages is keyed by both of them
+            caches += [propel_stage_cache, FormulaCache.combine(ion_stage_cache, propel_stage_cache)]
+    return FormulaCache.remove_stale(caches)
@@ -1,13 +1,17 @@
-import logging
 from abc import ABC, abstractmethod
-from typing import Generic, List, Callable, TypeVar
+from typing import Any, Dict, Generic, List, Callable, Optional, TypeVar
 
-from scr.main import shared, LOG_FILE
+import numpy
+
+from scr.calculation_equipment.compilation import SharedEvaluation, parameter_values
+from scr.instrumentation import measure, add
+from scr.logs import get_logger
 from scr.parameter.AbstaractParameter import AbstractParameter
 from scr.solution.AbstractSolution import AbstractSolution
 from scr.solution.combiner.AbstractCombiner import AbstractCombiner
 from scr.solver.AbstractSolver import AbstractSolver
 from scr.stage.AbstractStage import AbstractStage
+from scr.stage.sharing import share_evaluation
 
 SOLUTION = TypeVar('SOLUTION', bound=AbstractSolution)
 COMBINER = TypeVar('COMBINER', bound=AbstractCombiner)
@@ -22,48 +26,57 @@ class AbstractConsumer(ABC, Generic[SOLUTION, COMBINER, PARAMETER]):
         self.combiner = combiner
         self.parameter = None  # Should be set in the appropriate setter
         self.processed_solutions: List[complex] = []
+        self.solutions: List[SOLUTION] = []
+        self.stage_results: List[List[complex]] = []  # The results of every stage for every processed solution
+        self.fused_evaluation = None  # Set when all the stages are compiled into one function
 
     def set_up_logger(self):
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.DEBUG)
-
-        # ch = logging.StreamHandler()
-        # ch.setLevel(logging.DEBUG)
-
-        fh = logging.FileHandler(shared[LOG_FILE])
-        fh.setLevel(logging.DEBUG)
-
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-        # ch.setFormatter(formatter)
-        fh.setFormatter(formatter)
-
-        # self.logger.addHandler(ch)
-        self.logger.addHandler(fh)
+        self.logger = get_logger(__name__)
 
     def set_parameter(self, parameter: PARAMETER):
         self.parameter = parameter
         for stage in self.stages:
             stage.set_parameter(parameter)
 
+    def set_fused_evaluation(self, evaluation: SharedEvaluation):
+        self.fused_evaluation = evaluation
+
+    def fuse_stages(self) -> SharedEvaluation:
+        self.set_fused_evaluation(share_evaluation(self.stages))
+        return self.fused_evaluation
+
     def consume_by_solver(self, solver: AbstractSolver[SOLUTION, PARAMETER]) -> float:
         solver.set_parameter(self.parameter)
 
         solutions: List[SOLUTION] = solver.solve()
+        self.solutions = solutions
         try:
             self.validate_solutions(solver, solutions)
         except Exception:
             self.logger.error(f"There's no solutions. It's assumed that hre result should be 0")
             return 0
 
-        for solution in solutions:
-            self.process_solution(solution)
+        if self.fused_evaluation is not None:
+            self.process_solutions(solutions)
+        else:
+            for solution in solutions:
+                self.process_solution(solution)
 
         return self.consume_result(self.processed_solutions)
 
+    def create_record(self, result: complex) -> Dict[str, Any]:
+        # The result of the last consumed parameter along with the roots and the stage results it is made of
+        return {
+            'y': result,
+            'roots': [list(solution.get_solution()) for solution in self.solutions],
+            'stages': [list(results) for results in self.stage_results]
+        }
+
     def clean(self):
         self.parameter = None
         self.processed_solutions = []
+        self.solutions = []
+        self.stage_results = []
 
     @staticmethod
     def validate_solutions(solver: AbstractSolver[SOLUTION, PARAMETER], solutions: List[SOLUTION]):
@@ -72,9 +85,71 @@ class AbstractConsumer(ABC, Generic[SOLUTION, COMBINER, PARAMETER]):
 
     def process_solution(self, solution: SOLUTION):
         stage_calculations: List[complex] = [stage.get_result(solution) for stage in self.stages]
+        if any(calculation is None for calculation in stage_calculations):
+            # The stage has logged its error already. The solution is left out of the result instead of combining None,
+            # which would fail the whole parameter point
+            self.logger.error(f"The solution {str(solution)} is skipped since a stage has failed on it")
+            return
         result = self.reduce(stage_calculations, self.combiner.combine)
+        self.stage_results.append(stage_calculations)
         self.processed_solutions.append(result)
 
+    def process_solutions(self, solutions: List[SOLUTION]):
+        # Every stage is calculated for the whole batch of solutions by one call of the fused function. The solutions
+        # all the stages have cached results for are taken from the result caches, the specialized stages are
+        # evaluated on their own, since the fused function is compiled for any parameter values
+        if any(stage.specialized_stage is not None for stage in self.stages):
+            for solution in solutions:
+                self.process_solution(solution)
+            return
+
+        calculations: List[Optional[List[complex]]] = [self.get_cached(solution) for solution in solutions]
+        missing = [number for number, results in enumerate(calculations) if results is None]
+        if len(missing) > 0:
+            kernels = numpy.array([solutions[number].get_solution() for number in missing], dtype=complex)
+            try:
+                with measure('consumer.fused_evaluation'):
+                    stage_calculations = [
+                        numpy.broadcast_to(values, (len(missing),))
+                        for values in self.fused_evaluation.evaluate(*kernels.T, *parameter_values(self.parameter))
+                    ]
+                # The fused function gives nan or inf on an overflow or an invalid operation instead of raising
+                if not all(numpy.all(numpy.isfinite(values)) for values in stage_calculations):
+                    raise ArithmeticError("Non-finite stage values are calculated")
+            except (ValueError, ArithmeticError) as e:
+                # The solutions are evaluated one by one, so only the ones the stages fail on are skipped
+                self.logger.error(f"The error: {str(e)} occurred in the fused evaluation, the solutions are processed "
+                                  f"one by one")
+                for solution in solutions:
+                    self.process_solution(solution)
+                return
+
+            for position, number in enumerate(missing):
+                calculations[number] = [complex(values[position]) for values in stage_calculations]
+                self.store_cached(solutions[number], calculations[number])
+
+        for results in calculations:
+            self.stage_results.append(results)
+            self.processed_solutions.append(self.reduce(results, self.combiner.combine))
+
+    def get_cached(self, solution: SOLUTION) -> Optional[List[complex]]:
+        # The results of all the stages for the solution, when every stage has its result cached
+        if any(stage.result_cache is None for stage in self.stages):
+            return None
+        results = []
+        for stage in self.stages:
+            result = stage.result_cache.get(solution, self.parameter)
+            if result is None:
+                return None
+            results.append(result)
+        add('consumer.cached')
+        return results
+
+    def store_cached(self, solution: SOLUTION, results: List[complex]):
+        for stage, result in zip(self.stages, results):
+            if stage.result_cache is not None:
+                stage.result_cache.store(solution, self.parameter, result)
+
     @staticmethod
     def reduce(items: List[complex], reducer: Callable[[complex, complex], complex]) -> complex:
         if len(items) == 1:
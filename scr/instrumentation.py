@@ -0,0 +1,105 @@
+import csv
+import json
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+JSON = 'json'
+CSV = 'csv'
+REPORT_FORMATS = (JSON, CSV)
+
+TOTAL = 'total'
+
+# Every measurement is kept as [count, seconds] under its name, both for the whole run and for the current sweep point
+Measurements = Dict[str, List[float]]
+
+records = {'enabled': True, 'total': {}, 'points': [], 'current': None}
+
+
+def set_enabled(enabled: bool):
+    records['enabled'] = enabled
+
+
+def add(name: str, count: float = 1, seconds: float = 0.):
+    if not records['enabled']:
+        return
+    targets = [records['total']] if records['current'] is None else [records['total'], records['current']]
+    for target in targets:
+        measurement = target.setdefault(name, [0, 0.])
+        measurement[0] += count
+        measurement[1] += seconds
+
+
+@contextmanager
+def measure(name: str) -> Iterator[None]:
+    # Counts the calls of the block and sums the time they take
+    if not records['enabled']:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add(name, 1, time.perf_counter() - start)
+
+
+@contextmanager
+def sweep_point(x_point: float) -> Iterator[Measurements]:
+    # The measurements of the block are also kept apart for the sweep point
+    previous = records['current']
+    records['current'] = {}
+    try:
+        yield records['current']
+    finally:
+        records['points'].append({'x': float(x_point), 'measurements': records['current']})
+        records['current'] = previous
+
+
+def merge_point(x_point: float, measurements: Measurements):
+    # The measurements of a sweep point made by another process
+    for name, (count, seconds) in measurements.items():
+        measurement = records['total'].setdefault(name, [0, 0.])
+        measurement[0] += count
+        measurement[1] += seconds
+    records['points'].append({'x': float(x_point), 'measurements': measurements})
+
+
+def reset():
+    records.update(total={}, points=[], current=None)
+
+
+def describe(measurements: Measurements) -> Dict[str, Dict[str, float]]:
+    return {name: {'count': count, 'seconds': seconds} for name, (count, seconds) in sorted(measurements.items())}
+
+
+def create_report() -> dict:
+    return {
+        TOTAL: describe(records['total']),
+        'points': [{'x': point['x'], 'measurements': describe(point['measurements'])}
+                   for point in sorted(records['points'], key=lambda point: point['x'])]
+    }
+
+
+def write_report(path: Path, report_format: str = JSON, report: Optional[dict] = None) -> Path:
+    """
+    Writes the report of the measurements made so far. The CSV one has a row per sweep point and measurement, the
+    measurements of the whole run have the point total.
+    """
+    report = create_report() if report is None else report
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if report_format == JSON:
+        with path.open('w') as file:
+            json.dump(report, file, indent=2)
+    elif report_format == CSV:
+        with path.open('w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['point', 'measurement', 'count', 'seconds'])
+            for name, measurement in report[TOTAL].items():
+                writer.writerow([TOTAL, name, measurement['count'], measurement['seconds']])
+            for point in report['points']:
+                for name, measurement in point['measurements'].items():
+                    writer.writerow([point['x'], name, measurement['count'], measurement['seconds']])
+    else:
+        raise ValueError(f"Unknown report format: {report_format}. Expected one of: {list(REPORT_FORMATS)}")
+    return path
@@ -0,0 +1,135 @@
+import atexit
+import logging
+import multiprocessing
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+from multiprocessing.context import BaseContext
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple, Union
+
+from scr.main import shared, LOG_FILE, LOG_LEVEL
+
+PACKAGE = 'scr'
+FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# The queue handler of the package logger and the listener writing its records, set up once per process and log file.
+# The records of the worker processes come by a queue and a listener per start method of the processes, the worker one
+# is the process the records are put in
+pipeline = {'handler': None, 'listener': None, 'file': None, 'process': None, 'finalized': None,
+            'workers': {}, 'worker': None}
+
+
+def set_log_level(level: Union[int, str]):
+    shared[LOG_LEVEL] = level
+    logging.getLogger(PACKAGE).setLevel(level)
+
+
+def set_up_logging(log_file: Optional[Path] = None):
+    """
+    Every logger of the package puts its records into one queue and a single listener thread writes them to the log
+    file, so logging never waits for the disk inside the calculations. The file defaults to the shared one, the level
+    is the shared one. Calling it again with the same file changes nothing else.
+    """
+    log_file = shared[LOG_FILE] if log_file is None else log_file
+    package_logger = logging.getLogger(PACKAGE)
+    package_logger.setLevel(shared[LOG_LEVEL])
+    if pipeline['worker'] == os.getpid():
+        # The records of a worker are written by the process that started it
+        return
+    if log_file is None or (pipeline['file'] == log_file and pipeline['process'] == os.getpid()):
+        return
+
+    stop_logging()
+    Path(log_file).parent.mkdir(parents=True, exist_ok=True)
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(logging.Formatter(FORMAT))
+    records = queue.SimpleQueue()
+    listener = QueueListener(records, file_handler)
+    listener.start()
+    handler = QueueHandler(records)
+    package_logger.addHandler(handler)
+    pipeline.update(handler=handler, listener=listener, file=log_file, process=os.getpid())
+    if pipeline['finalized'] != os.getpid():
+        # Worker processes leave by os._exit, which skips atexit but not the multiprocessing finalizers
+        Finalize(None, stop_logging, exitpriority=0)
+        pipeline['finalized'] = os.getpid()
+
+
+def stop_logging():
+    # Writes the queued records and closes the log file
+    if pipeline['handler'] is not None:
+        logging.getLogger(PACKAGE).removeHandler(pipeline['handler'])
+    listener = pipeline['listener']
+    if pipeline['process'] == os.getpid():
+        for workers in pipeline['workers'].values():
+            workers.stop()
+            workers.queue.close()
+        if listener is not None:
+            listener.stop()
+    if listener is not None:
+        for handler in listener.handlers:
+            handler.close()
+    pipeline.update(handler=None, listener=None, file=None, process=None, workers={}, worker=None)
+
+
+def forget_logging():
+    # A forked process has a copy of the pipeline but not its threads, the copy is dropped without touching the file
+    if pipeline['handler'] is not None:
+        logging.getLogger(PACKAGE).removeHandler(pipeline['handler'])
+    pipeline.update(handler=None, listener=None, file=None, process=None, workers={}, worker=None)
+
+
+def get_worker_queue(context: Optional[BaseContext] = None) -> Optional[multiprocessing.Queue]:
+    """
+    The queue the worker processes of the context put their records into. The records are written to the log file of
+    this process by its own listener, started with the queue. None when there's no log file.
+    """
+    set_up_logging()
+    if pipeline['listener'] is None or pipeline['worker'] == os.getpid():
+        return None
+    context = multiprocessing.get_context() if context is None else context
+    method = context.get_start_method()
+    if method not in pipeline['workers']:
+        workers = QueueListener(context.Queue(), *pipeline['listener'].handlers)
+        workers.start()
+        pipeline['workers'][method] = workers
+    return pipeline['workers'][method].queue
+
+
+def set_up_worker_logging(records: Optional[multiprocessing.Queue],
+                          level: Union[int, str],
+                          initializer: Optional[Callable[..., None]] = None,
+                          *initargs: Any):
+    # Runs first in every worker process, then the initializer of the pool
+    forget_logging()
+    shared[LOG_LEVEL] = level
+    package_logger = logging.getLogger(PACKAGE)
+    package_logger.setLevel(level)
+    if records is not None:
+        pipeline['handler'] = QueueHandler(records)
+        package_logger.addHandler(pipeline['handler'])
+    pipeline['worker'] = os.getpid()
+    if initializer is not None:
+        initializer(*initargs)
+
+
+def get_worker_initializer(initializer: Optional[Callable[..., None]] = None,
+                           *initargs: Any,
+                           context: Optional[BaseContext] = None) -> Tuple[Callable[..., None], Tuple[Any, ...]]:
+    """
+    The initializer and its arguments for a pool of worker processes of the context, so their records are written by
+    this process. The given initializer runs after the logging is set up.
+    """
+    return set_up_worker_logging, (get_worker_queue(context), shared[LOG_LEVEL], initializer, *initargs)
+
+
+def get_logger(name: str) -> logging.Logger:
+    set_up_logging()
+    return logging.getLogger(name)
+
+
+atexit.register(stop_logging)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=forget_logging)
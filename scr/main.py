@@ -4,6 +4,10 @@ RESOURCES = Path(__file__).parent.parent.absolute().joinpath('resources')
 FORMULAS = RESOURCES.joinpath('formulas')
 PLOTS = RESOURCES.joinpath('plots')
 LOG_FOLDER = RESOURCES.joinpath('logs')
+CACHE = RESOURCES.joinpath('cache')
 
-shared = {'LOG_FILE': None}
+shared = {'LOG_FILE': None, 'LOG_LEVEL': 'DEBUG', 'CACHE_DIRECTORY': CACHE, 'FORMULAS_DIRECTORY': FORMULAS}
 LOG_FILE = 'LOG_FILE'
+LOG_LEVEL = 'LOG_LEVEL'
+CACHE_DIRECTORY = 'CACHE_DIRECTORY'
+FORMULAS_DIRECTORY = 'FORMULAS_DIRECTORY'
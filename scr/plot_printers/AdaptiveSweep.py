@@ -0,0 +1,87 @@
+import logging
+from typing import Dict, List, Tuple
+
+from scr.plot_printers.SweepExecutor import SweepExecutor
+from scr.plot_printers.SweepResults import Record
+
+logger = logging.getLogger(__name__)
+
+TOLERANCE = 0.02
+CHANGE = 0.2
+BUDGET = 60
+RESOLUTION = 1e-4
+
+
+class AdaptiveSweep:
+    # The intervals between the calculated points are split in two while the curvature about them is bigger than the
+    # tolerance, the change of the y points over them is bigger than the change or the root count changes over them,
+    # as long as the budget allows. Every round of the splitting is calculated as one batch of the executor
+    def __init__(self,
+                 executor: SweepExecutor,
+                 tolerance: float = TOLERANCE,
+                 budget: int = BUDGET,
+                 change: float = CHANGE,
+                 resolution: float = RESOLUTION) -> None:
+        if tolerance <= 0 or change <= 0:
+            raise ValueError(f"Positive tolerance and change are required. Got: {tolerance}, {change}")
+        if resolution <= 0:
+            raise ValueError(f"A positive resolution is required. Got: {resolution}")
+
+        self.executor = executor
+        self.tolerance = tolerance
+        self.budget = budget
+        self.change = change
+        self.resolution = resolution  # The shortest interval to split as a share of the whole sweep
+
+    def sample(self, x_points: List[float]) -> Tuple[List[float], List[complex]]:
+        """
+        Calculates the initial x points and refines them until no interval exceeds the tolerance or the budget of
+        points is spent. The change and the curvature are measured relative to the biggest absolute y point.
+        """
+        if len(x_points) < 2:
+            raise ValueError(f"At least two initial points are required. Got: {len(x_points)}")
+        if self.budget < len(x_points):
+            raise ValueError(f"The budget {self.budget} is smaller than the {len(x_points)} initial points")
+
+        records: Dict[float, Record] = {}
+        new_points = sorted(set(float(x_point) for x_point in x_points))
+        while len(new_points) > 0:
+            for x_point, record in zip(new_points, self.executor.map_records(new_points)):
+                records[x_point] = record
+
+            new_points = self.split(records, self.budget - len(records))
+            logger.info(f"{len(new_points)} points are added to the {len(records)} calculated ones")
+
+        x_points = sorted(records)
+        return x_points, [records[x_point]['y'] for x_point in x_points]
+
+    def split(self, records: Dict[float, Record], budget: int) -> List[float]:
+        # The middles of the worst intervals exceeding the tolerance, as many of them as the budget allows
+        x_points = sorted(records)
+        shortest = self.resolution * (x_points[-1] - x_points[0])
+        scores = self.score(x_points, [records[x_point] for x_point in x_points], self.change / self.tolerance)
+        intervals = sorted((score, number) for number, score in enumerate(scores)
+                           if score > self.tolerance and x_points[number + 1] - x_points[number] > shortest)
+        intervals = intervals[::-1][:max(budget, 0)]
+        return sorted((x_points[number] + x_points[number + 1]) / 2 for _, number in intervals)
+
+    @staticmethod
+    def score(x_points: List[float], records: List[Record], ratio: float) -> List[float]:
+        # The change is divided by the ratio of the change to the tolerance, so both are compared to the tolerance
+        y_points = [complex(record['y']) for record in records]
+        scale = max(abs(y_point) for y_point in y_points) or 1.
+
+        scores = [abs(y_points[number + 1] - y_points[number]) / scale / ratio for number in range(len(x_points) - 1)]
+        for number in range(1, len(x_points) - 1):
+            # The distance of the point from the chord of its neighbours counts for both intervals about it
+            share = (x_points[number] - x_points[number - 1]) / (x_points[number + 1] - x_points[number - 1])
+            chord = y_points[number - 1] + share * (y_points[number + 1] - y_points[number - 1])
+            curvature = abs(y_points[number] - chord) / scale
+            scores[number - 1] = max(scores[number - 1], curvature)
+            scores[number] = max(scores[number], curvature)
+
+        for number in range(len(x_points) - 1):
+            if 'roots' in records[number] and 'roots' in records[number + 1] \
+                    and len(records[number]['roots']) != len(records[number + 1]['roots']):
+                scores[number] = float('inf')
+        return scores
@@ -1,14 +1,20 @@
-import logging
 import string
-from typing import List, Callable
+from pathlib import Path
+from typing import Any, Dict, List, Callable, Optional
 
 from matplotlib import pyplot
 
-from scr.main import PLOTS, LOG_FILE, shared
+from scr.calculation_equipment.FormulaCache import describe, calculate_key
+from scr.instrumentation import write_report, reset, JSON
+from scr.logs import get_logger
+from scr.main import PLOTS
+from scr.plot_printers.AdaptiveSweep import AdaptiveSweep, TOLERANCE
+from scr.plot_printers.SweepExecutor import SweepExecutor
+from scr.plot_printers.SweepResults import SweepResults
 
 
 class PlotPrinter:
-    def __init__(self, name: string,  x_points: List[float], calculator: Callable[[float], float]) -> None:
+    def __init__(self, name: string,  x_points: List[float], calculator: Callable[[float], Any]) -> None:
         self.logger = None
         self.set_up_logger()
         self.name = name
@@ -17,6 +23,16 @@ class PlotPrinter:
         self.calculator = calculator
         self.x_label = 'x-label'
         self.y_label = 'y-label'
+        self.workers = 1
+        self.contiguous = False  # Whether the workers get contiguous blocks of points, as the continuation requires
+        self.report_format = JSON  # The timing report is written next to the plot unless the format is None
+        self.report_path: Optional[Path] = None  # Where else to write the report
+        # Every calculated point is stored there, so a restarted print only calculates the points missing from it
+        self.results_path: Optional[Path] = self.storage.with_name(f"{self.name}-results.jsonl")
+        self.fingerprint: Dict[str, Any] = {}  # What else the points depend on, the stored ones must have been the same
+        # With the budget the x points are only the initial ones, refined where the plot changes sharply
+        self.budget: Optional[int] = None
+        self.tolerance = TOLERANCE
 
     def set_x_label(self, label: string):
         self.x_label = label
@@ -24,41 +40,73 @@ class PlotPrinter:
     def set_y_label(self, label: string):
         self.y_label = label
 
-    def set_up_logger(self):
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.DEBUG)
+    def set_workers(self, workers: int):
+        self.workers = workers
+
+    def set_contiguous(self, contiguous: bool):
+        self.contiguous = contiguous
+
+    def set_report_format(self, report_format: Optional[str]):
+        self.report_format = report_format
+
+    def set_report_path(self, path: Optional[Path]):
+        self.report_path = path
+
+    def set_results_path(self, path: Optional[Path]):
+        self.results_path = path
 
-        # ch = logging.StreamHandler()
-        # ch.setLevel(logging.DEBUG)
-        fh = logging.FileHandler(shared[LOG_FILE])
-        fh.setLevel(logging.DEBUG)
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    def set_fingerprint(self, fingerprint: Dict[str, Any]):
+        self.fingerprint = fingerprint
 
-        # ch.setFormatter(formatter)
-        fh.setFormatter(formatter)
+    def get_fingerprint(self) -> Dict[str, Any]:
+        return {
+            'calculator': calculate_key(describe(self.calculator)),
+            'x_range': [self.x_points[0], self.x_points[-1]],
+            **self.fingerprint
+        }
 
-        # self.logger.addHandler(ch)
-        self.logger.addHandler(fh)
+    def set_adaptive(self, budget: Optional[int], tolerance: float = TOLERANCE):
+        self.budget = budget
+        self.tolerance = tolerance
+
+    def set_up_logger(self):
+        self.logger = get_logger(__name__)
 
     def print(self) -> None:
         self.logger.info(f"Start to calculate y values for the plot from {self.x_points[0]} to {self.x_points[-1]} ")
+        # The report is of this sweep only
+        reset()
         # y_points = [self.calculator(x_point) for x_point in self.x_points]
 
-        y_points = []
-        for x_point in self.x_points:
-            self.logger.info(f"Start to calculate y point for x point = {x_point}")
-            y_point = self.calculator(x_point)
-            y_points.append(y_point)
-            self.logger.info(f"The y point = {y_point} has been calculated for x point = {x_point}")
+        results = SweepResults(self.results_path, self.get_fingerprint()) if self.results_path is not None else None
+        executor = SweepExecutor(self.calculator, self.workers, results=results, contiguous=self.contiguous)
+        if self.budget is None:
+            x_points, y_points = self.x_points, executor.map(self.x_points)
+        else:
+            x_points, y_points = AdaptiveSweep(executor, self.tolerance, self.budget).sample(self.x_points)
         self.logger.info(f"Y values for the plot calculated successfully")
 
+        self.render(x_points, y_points)
+
+        if self.report_format is not None:
+            path = self.report_path if self.report_path is not None \
+                else self.storage.with_name(f"{self.name}-report.{self.report_format}")
+            report = write_report(path, self.report_format)
+            self.logger.info(f"The timing report is written to {str(report)}")
+
+    def render(self, x_points: List[float], y_points: List[float]):
         figure = pyplot.figure()
         axes = figure.add_axes([0.15, 0.1, 0.75, 0.8])
 
-        axes.plot(self.x_points, y_points)
+        axes.plot(x_points, y_points)
         axes.set_title(self.name)
         axes.set_xlabel(self.x_label)
         axes.set_ylabel(self.y_label)
 
         figure.savefig(self.storage)
         # pyplot.show()
+
+    def render_results(self):
+        # The plot of the points stored so far, nothing is calculated
+        records = SweepResults(self.results_path).get_records()
+        self.render([record['x'] for record in records], [record['y'] for record in records])
@@ -0,0 +1,106 @@
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+from scr.instrumentation import sweep_point, merge_point, Measurements
+from scr.logs import get_worker_initializer
+from scr.plot_printers.SweepResults import SweepResults, Record
+
+logger = logging.getLogger(__name__)
+
+
+class SweepExecutor:
+    # Every worker process owns the solver and stages the calculator refers to, so nothing is shared between them.
+    # The calculator returns the y point or a record of it with the 'y' key and the other values of the point
+    def __init__(self,
+                 calculator: Callable[[float], Any],
+                 workers: int = 1,
+                 initializer: Optional[Callable[[], None]] = None,
+                 results: Optional[SweepResults] = None,
+                 contiguous: bool = False) -> None:
+        if workers < 1:
+            raise ValueError(f"At least one worker is required. Got: {workers}")
+
+        self.calculator = calculator
+        self.workers = workers
+        self.initializer = initializer
+        self.results = results
+        # Every worker gets a contiguous block of points, so the solver may continue the roots from point to point.
+        # Otherwise the points are handed out one by one, which balances the workers when the points differ in cost
+        self.contiguous = contiguous
+
+    def map(self, x_points: List[float]) -> List[float]:
+        """
+        Calculates the y points of the x points. With the results every point is stored as soon as it is calculated
+        and the points stored already aren't calculated again.
+        """
+        return [record['y'] for record in self.map_records(x_points)]
+
+    def map_records(self, x_points: List[float]) -> List[Record]:
+        if self.results is None:
+            calculated = {float(x_point): y_point for x_point, y_point in self.calculate_all(x_points)}
+            return [self.create_record(x_point, calculated[float(x_point)]) for x_point in x_points]
+
+        missing = [x_point for x_point in x_points if not self.results.contains(x_point)]
+        if len(missing) < len(x_points):
+            logger.info(f"{len(x_points) - len(missing)} of {len(x_points)} points are taken from "
+                        f"{str(self.results.path)}")
+        for x_point, y_point in self.calculate_all(missing):
+            self.results.append(self.create_record(x_point, y_point))
+        return [self.results.get(x_point) for x_point in x_points]
+
+    def calculate_all(self, x_points: List[float]) -> Iterator[Tuple[float, Any]]:
+        """
+        Gives back every point as soon as it is calculated, the parallel ones in the order they are finished. When a
+        point fails, the other points are still given back before the first error is raised.
+        """
+        if self.workers == 1 or len(x_points) < 2:
+            if self.initializer is not None and len(x_points) > 0:
+                self.initializer()
+            for x_point in x_points:
+                with sweep_point(x_point):
+                    y_point = self.calculate(x_point)
+                yield x_point, y_point
+            return
+
+        workers = min(self.workers, len(x_points))
+        logger.info(f"Start to calculate {len(x_points)} points by {workers} worker processes")
+        chunk = -(-len(x_points) // workers) if self.contiguous else 1
+        failure = None
+        initializer, initargs = get_worker_initializer(self.initializer)
+        with ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs) as executor:
+            blocks = [executor.submit(self.measure_block, x_points[begin:begin + chunk])
+                      for begin in range(0, len(x_points), chunk)]
+            for block in as_completed(blocks):
+                try:
+                    calculated = block.result()
+                except Exception as error:
+                    logger.error(f"A block of points has failed: {error!r}")
+                    failure = error if failure is None else failure
+                    continue
+                # The workers send the measurements of their points back to be reported by this process
+                for x_point, y_point, measurements in calculated:
+                    merge_point(x_point, measurements)
+                    yield x_point, y_point
+        if failure is not None:
+            raise failure
+
+    @staticmethod
+    def create_record(x_point: float, y_point: Any) -> Record:
+        record = dict(y_point) if isinstance(y_point, dict) else {'y': y_point}
+        record['x'] = x_point
+        return record
+
+    def calculate(self, x_point: float) -> Any:
+        logger.info(f"Start to calculate y point for x point = {x_point}")
+        y_point = self.calculator(x_point)
+        logger.info(f"The y point = {y_point} has been calculated for x point = {x_point}")
+        return y_point
+
+    def measure_block(self, x_points: List[float]) -> List[Tuple[float, Any, Measurements]]:
+        calculated = []
+        for x_point in x_points:
+            with sweep_point(x_point) as measurements:
+                y_point = self.calculate(x_point)
+            calculated.append((x_point, y_point, measurements))
+        return calculated
@@ -0,0 +1,100 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from scr.util import write_atomically
+
+logger = logging.getLogger(__name__)
+
+# A record keeps the x and y of a sweep point and whatever else the calculator has described it with
+Record = Dict[str, Any]
+
+FINGERPRINT = 'fingerprint'
+STALE = '.stale'
+
+
+def encode(value: Any) -> Any:
+    # Complex numbers become {"real": ..., "imag": ...} objects, mpmath and numpy numbers the built-in ones
+    if isinstance(value, dict):
+        return {key: encode(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode(item) for item in value]
+    if value is None or isinstance(value, (str, bool)):
+        return value
+    try:
+        return float(value)
+    except TypeError:
+        number = complex(value)
+        return {'real': number.real, 'imag': number.imag}
+
+
+def decode(value: Dict[str, Any]) -> Any:
+    return complex(value['real'], value['imag']) if value.keys() == {'real', 'imag'} else value
+
+
+class SweepResults:
+    # The records of the computed sweep points in a JSON lines file. Every record is appended and flushed as soon as
+    # its point is computed, so an interrupted sweep loses at most the point it was at. The file is read back on
+    # construction, a torn last line is skipped. With a fingerprint of everything the points depend on, the file starts
+    # with it and the points of a file with another one are moved aside to the .stale file instead of being reused
+    def __init__(self, path: Path, fingerprint: Optional[Dict[str, Any]] = None) -> None:
+        self.path = path
+        self.fingerprint = None if fingerprint is None else json.loads(json.dumps(encode(fingerprint)),
+                                                                      object_hook=decode)
+        self.records: Dict[float, Record] = {}
+        self.torn = False  # The file doesn't end with a line break, so the next record should start with one
+        self.load()
+
+    def load(self):
+        if not self.path.exists():
+            self.start()
+            return
+
+        fingerprint = None
+        with self.path.open('r') as file:
+            for line in file:
+                self.torn = not line.endswith('\n')
+                try:
+                    record = json.loads(line, object_hook=decode)
+                    if FINGERPRINT in record:
+                        fingerprint = record[FINGERPRINT]
+                        continue
+                    self.records[float(record['x'])] = record
+                except (ValueError, KeyError, TypeError):
+                    logger.warning(f"A damaged line of the sweep results {str(self.path)} is skipped: {line!r}")
+
+        if self.fingerprint is not None and fingerprint != self.fingerprint:
+            stale = self.path.with_name(self.path.name + STALE)
+            logger.warning(f"The sweep results {str(self.path)} are calculated for another fingerprint, they're "
+                           f"moved to {str(stale)}")
+            self.path.replace(stale)
+            self.records, self.torn = {}, False
+            self.start()
+            return
+        logger.info(f"{len(self.records)} sweep points are read from {str(self.path)}")
+
+    def start(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.fingerprint is not None:
+            write_atomically(self.path, (json.dumps({FINGERPRINT: encode(self.fingerprint)}) + '\n').encode('utf-8'))
+
+    def contains(self, x_point: float) -> bool:
+        return float(x_point) in self.records
+
+    def get(self, x_point: float) -> Optional[Record]:
+        return self.records.get(float(x_point))
+
+    def get_records(self) -> List[Record]:
+        return [self.records[x_point] for x_point in sorted(self.records)]
+
+    def append(self, record: Record):
+        line = json.dumps(encode(record))
+        with self.path.open('a') as file:
+            file.write(('\n' if self.torn else '') + line + '\n')
+            file.flush()
+            os.fsync(file.fileno())
+        self.torn = False
+        # The stored record is the one read back, so a resumed sweep and a fresh one give the same values
+        self.records[float(record['x'])] = json.loads(line, object_hook=decode)
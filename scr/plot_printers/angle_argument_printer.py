@@ -1,7 +1,11 @@
 from math import pi
+from os import cpu_count
+from typing import Any, Dict
 
 from mpmath import linspace
 
+from scr.calculation_equipment.FormulaCache import FormulaCache
+from scr.calculation_equipment.compilation import parameter_values
 from scr.calculation_equipment.generatoers import fading_generator
 from scr.consumer.EuclidConsumer import EuclidConsumer
 from scr.main import LOG_FOLDER, shared, LOG_FILE
@@ -21,6 +25,7 @@ shared[LOG_FILE] = LOG_FOLDER.joinpath(NAME)
 FROM = 0
 TO = 2 * pi
 FREQUENCY = 15
+WORKERS = cpu_count()
 
 X_VALUES = linspace(FROM, TO, FREQUENCY)
 
@@ -45,23 +50,31 @@ PROPEL_STAGE = PropelStage(fading_generator)
 STAGES = [ION_STAGE, PROPEL_STAGE]
 
 CONSUMER = EuclidConsumer(STAGES, COMBINER)
+CONSUMER.fuse_stages()
 
 SOLVER = EquationSolver(fading_generator, 2, -10, 10, 4)
 SOLVER.set_precision(0.001)
 
 
-def calculator(arg: float) -> float:
+def calculator(arg: float) -> Dict[str, Any]:
     BASIC_PARAMETER.p_theta = arg
     CONSUMER.set_parameter(BASIC_PARAMETER)
 
-    result = CONSUMER.consume_by_solver(SOLVER)
+    # The roots and the stage results are stored along with the y point
+    record = CONSUMER.create_record(CONSUMER.consume_by_solver(SOLVER))
     CONSUMER.clean()
 
-    return result
+    return record
 
 
 if __name__ == "__main__":
     plot_printer = PlotPrinter(NAME, X_VALUES, calculator)
     plot_printer.set_x_label(X)
     plot_printer.set_y_label(Y)
+    plot_printer.set_workers(WORKERS)
+    plot_printer.set_contiguous(SOLVER.continuation)
+    plot_printer.set_fingerprint({
+        'parameter': parameter_values(BASIC_PARAMETER),
+        'formulas': FormulaCache.combine(SOLVER.cache, ION_STAGE.cache, PROPEL_STAGE.cache).source_key
+    })
     plot_printer.print()
@@ -0,0 +1,89 @@
+from collections import defaultdict
+from math import floor, sqrt, hypot
+from typing import Dict, List, Tuple, Iterator, Iterable
+
+from scr.solution.TwoValueSolution import TwoValueSolution
+from scr.util import Number
+
+
+class RootRegistry:
+    # Solutions are equal when the squared distance between them is less than equal_round, so with buckets of side
+    # sqrt(equal_round) an equal solution can only be in the same or in a neighbouring bucket
+    # Points the converged runs passed through are kept as the mapped basins of their solutions when a basin radius
+    # is given
+    def __init__(self, equal_round: float, basin_radius: float = 0.) -> None:
+        if equal_round is None or equal_round <= 0:
+            raise ValueError(f"A positive equal round is required. Got: {equal_round}")
+
+        self.side = sqrt(equal_round)
+        self.buckets: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self.solutions: List[TwoValueSolution] = []
+        self.hits: List[int] = []
+        self.basin_radius = basin_radius
+        self.basins: Dict[Tuple[int, int], List[Tuple[Number, Number, int]]] = defaultdict(list)
+
+    def get_bucket(self, solution: TwoValueSolution) -> Tuple[int, int]:
+        return floor(solution.first_number.real / self.side), floor(solution.second_number.real / self.side)
+
+    def get_basin_bucket(self, x: Number, y: Number) -> Tuple[int, int]:
+        return floor(x.real / self.basin_radius), floor(y.real / self.basin_radius)
+
+    def find(self, solution: TwoValueSolution) -> int:
+        first, second = self.get_bucket(solution)
+        for first_shift in (-1, 0, 1):
+            for second_shift in (-1, 0, 1):
+                for index in self.buckets.get((first + first_shift, second + second_shift), ()):
+                    if self.solutions[index] == solution:
+                        return index
+        return -1
+
+    def add(self, solution: TwoValueSolution) -> bool:
+        index = self.find(solution)
+        if index >= 0:
+            self.hit(index)
+            return False
+
+        self.buckets[self.get_bucket(solution)].append(len(self.solutions))
+        self.solutions.append(solution)
+        self.hits.append(1)
+        return True
+
+    def hit(self, index: int):
+        self.hits[index] += 1
+
+    def map_basin(self, solution: TwoValueSolution, points: Iterable[Tuple[Number, Number]]):
+        index = self.find(solution)
+        if self.basin_radius <= 0 or index < 0:
+            return
+        for x, y in points:
+            self.basins[self.get_basin_bucket(x, y)].append((x, y, index))
+
+    def find_basin(self, x: Number, y: Number) -> int:
+        if self.basin_radius <= 0:
+            return -1
+        first, second = self.get_basin_bucket(x, y)
+        for first_shift in (-1, 0, 1):
+            for second_shift in (-1, 0, 1):
+                for point_x, point_y, index in self.basins.get((first + first_shift, second + second_shift), ()):
+                    if hypot(abs(point_x - x), abs(point_y - y)) < self.basin_radius:
+                        return index
+        return -1
+
+    def get_hits(self, solution: TwoValueSolution) -> int:
+        index = self.find(solution)
+        return self.hits[index] if index >= 0 else 0
+
+    def get_solutions(self) -> List[TwoValueSolution]:
+        return list(self.solutions)
+
+    def get_total_hits(self) -> int:
+        return sum(self.hits)
+
+    def __contains__(self, solution: TwoValueSolution) -> bool:
+        return self.find(solution) >= 0
+
+    def __len__(self) -> int:
+        return len(self.solutions)
+
+    def __iter__(self) -> Iterator[TwoValueSolution]:
+        return iter(self.solutions)
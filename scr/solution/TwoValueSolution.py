@@ -27,7 +27,7 @@ class TwoValueSolution(AbstractSolution[List[complex]]):
         return 42
 
     def __calculate_metric(self, other):
-        return ((self.first_number - other.first_number) ** 2) + ((self.second_number - other.second_number) ** 2)
+        return (abs(self.first_number - other.first_number) ** 2) + (abs(self.second_number - other.second_number) ** 2)
 
     def get_solution(self) -> List[complex]:
         return [self.first_number, self.second_number]
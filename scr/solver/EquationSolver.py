@@ -1,39 +1,63 @@
 import logging
-from typing import Iterable, List, Callable
+from math import sqrt
+from typing import Iterable, Iterator, List, Callable, Tuple, Sequence
 
 import numpy
-from numpy import linspace, array, ndarray
-from scipy.optimize import excitingmixing
-from scipy.optimize.nonlin import NoConvergence, anderson, newton_krylov, diagbroyden, linearmixing
-from sympy import Symbol, lambdify
+from numpy import ndarray
+from scipy.optimize import excitingmixing, root
+from scipy.optimize.nonlin import NoConvergence
+from sympy import Symbol
 
+from scr.calculation_equipment.FormulaCache import FormulaCache
 from scr.calculation_equipment.Formulas import Formulas, diff_list, real_quad
-from scr.main import FORMULAS, LOG_FILE, shared
+from scr.calculation_equipment.compilation import NUMERIC, PARAMETER_SYMBOLS, parameter_values, SpecializedFunction, \
+    SPECIALIZATIONS
+from scr.calculation_equipment.newton import solve_batch, TOLERANCE
+from scr.instrumentation import measure, add
+from scr.logs import get_logger
+from scr.main import FORMULAS
 from scr.parameter.IonizationGeneratorParameter import IonizationGeneratorParameter
 from scr.parameter.IonizationParameter import IonizationParameter
 from scr.parameter.IonizationSymbols import IonizationSymbols
+from scr.solution.RootRegistry import RootRegistry
 from scr.solution.TwoValueSolution import TwoValueSolution
-from scr.solver.AbstractSolver import AbstractSolver, SOLUTION
-from scr.util import fill, Number, multiply, square, restore_function, store_function
+from scr.solver.AbstractSolver import AbstractSolver
+from scr.solver.complex_plane import join_point, split_jacobian, split_point, split_residuals
+from scr.solver.continuation import path_position, predict_seeds, count_lost_branches, BRANCH_RADIUS
+from scr.solver.grids import COMPLEX, UNIFORM, iterate_grid
+from scr.util import Number, multiply, square
+
+
+PRECISION = 0.001  # The precision solutions are told apart with unless another one is set
+
+
+class KnownSolutionReached(Exception):
+    def __init__(self, index: int) -> None:
+        super().__init__(f"The solution {index} is reached")
+        self.index = index
 
 
 class EquationSolver(AbstractSolver[TwoValueSolution, IonizationParameter]):
     STORAGE_1 = FORMULAS.joinpath('equation_1')
     STORAGE_2 = FORMULAS.joinpath('equation_2')
+    JACOBIAN_NAMES = ('equation_1_dx', 'equation_1_dy', 'equation_2_dx', 'equation_2_dy')
 
     def __init__(self,
                  generator: Callable[[Number, IonizationGeneratorParameter], Number],
                  dimension: int,
                  left_border: int,
                  right_border: int,
-                 frequency: int
+                 frequency: int,
+                 mode: str = NUMERIC
                  ) -> None:
         super().__init__(generator)
+        self.mode = mode
         self.logger = None
         self.set_up_logger()
         self.logger.debug(f"The generator {generator} is set")
         self.formulas = None
         self.init_formulas()
+        self.cache = FormulaCache(generator, EquationSolver)
         self.logger.debug(f"Formulas for EquationSolver class initialized")
         self.x = Symbol('x')
         self.y = Symbol('y')
@@ -41,191 +65,377 @@ class EquationSolver(AbstractSolver[TwoValueSolution, IonizationParameter]):
         self.second_equation = self.get_second_analytic_equation()
         self.first_callable_equation = self.get_first_callable_equation()
         self.second_callable_equation = self.get_second_callable_equation()
+        self.jacobian = self.get_analytic_jacobian()
+        self.callable_jacobian = self.get_callable_jacobian()
 
         self.precision = None
+        self.batched = False
+        self.specialized_first = None  # The equations and the jacobian compiled for the fixed parameter values
+        self.specialized_second = None
+        self.specialized_jacobian = None
+        self.registry = None  # The solutions of the last solving with the number of seeds converged to each
+        self.pruning = False
+        self.basin_radius = 0.
+        self.iterations = 0  # The iterations made by the last solving
+        self.pruned = 0  # The seeds of the last solving stopped early or skipped as ones in a known basin
+        self.continuation = False
+        self.extrapolation = True
+        self.branch_radius = BRANCH_RADIUS
+        self.roots = None  # The roots found at the previous parameter values, kept for the continuation
+        self.position = None
+        self.previous_roots = None
+        self.previous_position = None
+        self.grid_kind = UNIFORM
+        self.grid_options = {}
         self._dimension = dimension
         self._left_border = left_border
         self._right_border = right_border
         self._frequency = frequency
+        if TwoValueSolution.get_equal_round() is None:
+            self.set_precision(PRECISION)
 
     def set_up_logger(self):
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.DEBUG)
-
-        # ch = logging.StreamHandler()
-        # ch.setLevel(logging.DEBUG)
-
-        fh = logging.FileHandler(shared[LOG_FILE])
-        fh.setLevel(logging.DEBUG)
-
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-        # ch.setFormatter(formatter)
-        fh.setFormatter(formatter)
-
-        # self.logger.addHandler(ch)
-        self.logger.addHandler(fh)
+        self.logger = get_logger(__name__)
 
     def init_formulas(self):
-        self.formulas = Formulas()
-        Formulas.generator = self.generator
+        self.formulas = Formulas.instance(self.generator)
         Formulas.parameter = self.parameter
 
+    @staticmethod
+    def compute_first_equation(formulas: Formulas, t1: Symbol, t2: Symbol) -> Symbol:
+        return multiply(formulas.K_2(t1, t2), diff_list(formulas.K_2(t1, t2), t2, t2))
+
+    @staticmethod
+    def compute_second_equation(formulas: Formulas, t1: Symbol, t2: Symbol) -> Symbol:
+        term1 = 0.5 * (square(formulas.P(t1)) - square(formulas.K_1(t1, t2)))
+        term2 = (0.5 * square(formulas.K_2(t1, t2)) + IonizationSymbols.I_p) * formulas.W(t1, t2)
+        return term1 + term2
+
     def get_first_analytic_equation(self) -> Symbol:
         self.logger.debug(f"Start to get first analytical equation")
 
-        def compute_equation(t1: Symbol, t2: Symbol) -> Symbol:
-            return multiply(self.formulas.K_2(t1, t2), diff_list(self.formulas.K_2(t1, t2), t2, t2))
-
-        if self.STORAGE_1.exists():
-            self.logger.debug(f"An already calculated fist equation detected in {str(self.STORAGE_1)}. It's using")
-            return restore_function(self.STORAGE_1)
+        equation = self.cache.restore_expression(self.STORAGE_1.name)
+        if equation is not None:
+            self.logger.debug(f"An already calculated first equation detected in {str(self.cache.directory)}. "
+                              f"It's using")
+            return equation
         else:
             self.logger.debug(f"Start to calculate the first equation")
-            equation = compute_equation(self.x, self.y)
-            store_function(self.STORAGE_1, equation)
+            equation = self.cache.derive_expression(
+                self.STORAGE_1.name, lambda: self.compute_first_equation(self.formulas, self.x, self.y),
+                self.cache.export_path(self.STORAGE_1.name))
             self.logger.debug(f"The first equation calculated successfully")
             return equation
 
     def get_second_analytic_equation(self) -> Symbol:
         self.logger.debug(f"Start to get second analytical equation")
 
-        def compute_equation(t1: Symbol, t2: Symbol) -> Symbol:
-            term1 = 0.5 * (square(self.formulas.P(t1)) - square(self.formulas.K_1(t1, t2)))
-            term2 = (0.5 * square(self.formulas.K_2(t1, t2)) + IonizationSymbols.I_p) * self.formulas.W(t1, t2)
-            return term1 + term2
-
-        if self.STORAGE_2.exists():
-            self.logger.debug(f"An already calculated second equation detected in {str(self.STORAGE_1)}. It's using")
-            return restore_function(self.STORAGE_2)
+        equation = self.cache.restore_expression(self.STORAGE_2.name)
+        if equation is not None:
+            self.logger.debug(f"An already calculated second equation detected in {str(self.cache.directory)}. "
+                              f"It's using")
+            return equation
         else:
             self.logger.debug(f"Start to calculate the second equation")
-            equation = compute_equation(self.x, self.y)
-            store_function(self.STORAGE_2, equation)
+            equation = self.cache.derive_expression(
+                self.STORAGE_2.name, lambda: self.compute_second_equation(self.formulas, self.x, self.y),
+                self.cache.export_path(self.STORAGE_2.name))
             self.logger.debug(f"The second equation calculated successfully")
             return equation
 
     def get_first_callable_equation(self):
-        callable_first = lambdify((self.x, self.y,
-                                   IonizationSymbols.T_d,
-                                   IonizationSymbols.F,
-                                   IonizationSymbols.omega_1,
-                                   IonizationSymbols.omega_2,
-                                   IonizationSymbols.etta_1,
-                                   IonizationSymbols.etta_2,
-                                   IonizationSymbols.N_1,
-                                   IonizationSymbols.N_2,
-                                   IonizationSymbols.f_0,
-                                   IonizationSymbols.I_p,
-                                   IonizationSymbols.p,
-                                   IonizationSymbols.p_theta
-                                   ),
-                                  self.first_equation,
-                                  modules=[{"pi": numpy.pi}, {"Integral": real_quad}, 'sympy']
-                                  )
+        callable_first = self.cache.compile(self.STORAGE_1.name, self.first_equation,
+                                            (self.x, self.y) + PARAMETER_SYMBOLS, self.mode, real_quad)
 
         self.logger.info(f"The callable first equation {callable_first} created successfully")
         return callable_first
 
     def get_second_callable_equation(self):
-        callable_second = lambdify((self.x, self.y,
-                                    IonizationSymbols.T_d,
-                                    IonizationSymbols.F,
-                                    IonizationSymbols.omega_1,
-                                    IonizationSymbols.omega_2,
-                                    IonizationSymbols.etta_1,
-                                    IonizationSymbols.etta_2,
-                                    IonizationSymbols.N_1,
-                                    IonizationSymbols.N_2,
-                                    IonizationSymbols.f_0,
-                                    IonizationSymbols.I_p,
-                                    IonizationSymbols.p,
-                                    IonizationSymbols.p_theta
-                                    ),
-                                   self.second_equation,
-                                   modules=[{"pi": numpy.pi}, {"Integral": real_quad}, 'sympy']
-                                   )
+        callable_second = self.cache.compile(self.STORAGE_2.name, self.second_equation,
+                                             (self.x, self.y) + PARAMETER_SYMBOLS, self.mode, real_quad)
 
         self.logger.info(f"The callable second equation {callable_second} created successfully")
         return callable_second
 
-    def solve(self) -> Iterable[SOLUTION]:
+    def get_analytic_jacobian(self) -> List[Symbol]:
+        self.logger.debug(f"Start to get analytical jacobian")
+
+        derivatives = [
+            (self.first_equation, self.x),
+            (self.first_equation, self.y),
+            (self.second_equation, self.x),
+            (self.second_equation, self.y)
+        ]
+        jacobian: List[Symbol] = []
+
+        for name, (equation, variable) in zip(self.JACOBIAN_NAMES, derivatives):
+            derivative = self.cache.restore_expression(name)
+            if derivative is not None:
+                self.logger.debug(f"An already calculated derivative {name} detected in the cache. It's using")
+            else:
+                self.logger.debug(f"Start to calculate the derivative {name}")
+                derivative = self.cache.derive_expression(name, lambda: equation.diff(variable),
+                                                          self.cache.export_path(name))
+            jacobian.append(derivative)
+
+        self.logger.debug(f"The analytical jacobian calculated successfully")
+        return jacobian
+
+    def get_callable_jacobian(self) -> Callable[..., Tuple[Number, Number, Number, Number]]:
+        callable_jacobian = self.cache.compile_shared('jacobian', self.jacobian, (self.x, self.y) + PARAMETER_SYMBOLS,
+                                                      self.mode, real_quad)
+
+        self.logger.info(f"The callable jacobian created successfully")
+        return callable_jacobian
+
+    def solve(self) -> Iterable[TwoValueSolution]:
         self.logger.info(f"Start to find solution for parameter values: {str(self.parameter)}")
+        self.registry = self.create_registry()
+        self.iterations = 0
+        self.pruned = 0
+        with measure('solver.solve'):
+            if not self.continuation or self.roots is None or len(self.roots) == 0:
+                solutions = self.solve_from_grid(self.registry)
+            else:
+                seeds = self.get_continuation_seeds()
+                solutions = self.solve_from(seeds, self.registry)
+                lost = count_lost_branches(seeds, solutions, self.branch_radius)
+                if lost > 0:
+                    self.logger.info(f"{lost} root branches are lost. Start to solve from the whole grid")
+                    solutions = self.solve_from_grid(self.registry)
+
+        add('solver.iterations', self.iterations)
+        add('solver.converged', self.registry.get_total_hits())
+        add('solver.solutions', len(self.registry))
+        add('solver.pruned', self.pruned)
+        self.logger.info(f"{len(self.registry)} solutions found by {self.registry.get_total_hits()} converged seeds, "
+                         f"{self.iterations} iterations made, {self.pruned} seeds pruned")
+        return self.remember_roots(solutions)
+
+    def solve_from_grid(self, registry: RootRegistry) -> List[TwoValueSolution]:
+        for seeds in self.__get_grid():
+            self.solve_from(seeds, registry)
+        return registry.get_solutions()
+
+    def solve_from(self, seeds: ndarray, registry: RootRegistry = None) -> List[TwoValueSolution]:
+        if registry is None:
+            registry = self.create_registry()
+        if self.batched:
+            return self.solve_batch(seeds, registry)
+
+        add('solver.seeds', len(seeds))
+        trajectory: List[Tuple[Number, Number]] = []
+        complex_plane = numpy.iscomplexobj(seeds)
+
+        def point(arg) -> Tuple[Number, Number]:
+            return join_point(arg) if complex_plane else (arg[0], arg[1])
 
         def equation(arg):
-            return [self.parametrized_first_equation(arg[0], arg[1]), self.parametrized_second_equation(arg[0], arg[1])]
-
-        grid: ndarray = self.__get_grid()
-        solutions: List[TwoValueSolution] = []
-
-        for approx_point in grid:
+            x, y = point(arg)
+            self.iterations += 1
+            trajectory.append((x, y))
+            if self.pruning:
+                index = registry.find(TwoValueSolution(x, y))
+                if index >= 0:
+                    raise KnownSolutionReached(index)
+            first, second = self.parametrized_first_equation(x, y), self.parametrized_second_equation(x, y)
+            return split_residuals(first, second) if complex_plane else [first, second]
+
+        def jacobian(arg):
+            d1_dx, d1_dy, d2_dx, d2_dy = self.parametrized_jacobian(*point(arg))
+            if complex_plane:
+                return split_jacobian(d1_dx, d1_dy, d2_dx, d2_dy)
+            return [[d1_dx, d1_dy], [d2_dx, d2_dy]]
+
+        for approx_point in seeds:
+            known = registry.find_basin(approx_point[0], approx_point[1]) if self.pruning else -1
+            if known >= 0:
+                registry.hit(known)
+                self.pruned += 1
+                continue
+
+            trajectory.clear()
+            start = split_point(approx_point) if complex_plane else approx_point
             try:
-                dirty_solution = excitingmixing(
-                    equation,
-                    approx_point
-                )
+                with measure('solver.root_finding'):
+                    if self.mode == NUMERIC:
+                        result = root(equation, start, jac=jacobian, method='lm')
+                        if not result.success or not numpy.all(numpy.isfinite(result.fun)):
+                            raise NoConvergence(result.message)
+                        # The method also stops at stationary points of the residual norm, those aren't roots
+                        if numpy.max(numpy.abs(result.fun)) > TOLERANCE:
+                            raise NoConvergence(f"The residual {numpy.max(numpy.abs(result.fun))} remains")
+                        dirty_solution = result.x
+                    else:
+                        dirty_solution = excitingmixing(
+                            equation,
+                            start
+                        )
                 if dirty_solution is None:
                     raise ValueError(f"The NoneType solution returned")
 
-                solution = TwoValueSolution(dirty_solution.item(0), dirty_solution.item(1))
-                if solution not in solutions:
+                solution = TwoValueSolution(*point(dirty_solution.tolist()))
+                if registry.add(solution) and self.logger.isEnabledFor(logging.INFO):
                     self.logger.info(
                         f"The solution: x = {solution.first_number}, y = {solution.second_number} is found")
-                    solutions.append(solution)
+                registry.map_basin(solution, trajectory)
 
+            except KnownSolutionReached as reached:
+                registry.hit(reached.index)
+                registry.map_basin(registry.get_solutions()[reached.index], trajectory)
+                self.pruned += 1
             except (ValueError, ArithmeticError) as e:
                 self.logger.error(f"The error: {str(e)} occurred")
             except NoConvergence:
+                add('solver.no_convergence')
                 self.logger.error(f"A solution started from {approx_point} does not converge")
 
+        return registry.get_solutions()
+
+    def solve_batch(self, seeds: ndarray = None, registry: RootRegistry = None) -> List[TwoValueSolution]:
+        if self.mode != NUMERIC:
+            raise ValueError(f"The batched solving requires the {NUMERIC} mode. Got: {self.mode}")
+
+        def residuals(x: ndarray, y: ndarray):
+            return self.parametrized_first_equation(x, y), self.parametrized_second_equation(x, y)
+
+        if registry is None:
+            registry = self.create_registry()
+        if seeds is None:
+            for seeds in self.__get_grid():
+                self.solve_batch(seeds, registry)
+            return registry.get_solutions()
+
+        grid: ndarray = numpy.asarray(seeds, dtype=numpy.result_type(seeds, float))
+        add('solver.seeds', len(grid))
+        if self.pruning:
+            known = numpy.array([registry.find_basin(first, second) for first, second in grid], dtype=int)
+            for index in known[known >= 0]:
+                registry.hit(index)
+            self.pruned += int((known >= 0).sum())
+            grid = grid[known < 0]
+
+        radius = sqrt(TwoValueSolution.get_equal_round()) if self.pruning else 0.
+        with measure('solver.root_finding'):
+            x, y, converged, iterations = solve_batch(residuals, grid[:, 0], grid[:, 1], self.parametrized_jacobian,
+                                                      radius=radius)
+        add('solver.no_convergence', len(grid) - int(converged.sum()))
+        self.iterations += int(iterations.sum())
+        self.logger.info(f"{converged.sum()} of {len(grid)} seeds converged, {iterations.sum()} iterations made")
+
+        for first, second in zip(x[converged], y[converged]):
+            solution = TwoValueSolution(first.item(), second.item())
+            if registry.add(solution) and self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"The solution: x = {solution.first_number}, y = {solution.second_number} is found")
+
+        return registry.get_solutions()
+
+    def create_registry(self) -> RootRegistry:
+        return RootRegistry(TwoValueSolution.get_equal_round(), self.basin_radius if self.pruning else 0.)
+
+    def get_continuation_seeds(self) -> ndarray:
+        if not self.extrapolation:
+            return self.roots
+
+        return predict_seeds(self.roots, self.position, path_position(parameter_values(self.parameter)),
+                             self.previous_roots, self.previous_position)
+
+    def remember_roots(self, solutions: List[TwoValueSolution]) -> List[TwoValueSolution]:
+        if self.continuation:
+            self.previous_roots, self.previous_position = self.roots, self.position
+            self.roots = numpy.array([solution.get_solution() for solution in solutions])
+            if not numpy.iscomplexobj(self.roots) or numpy.all(numpy.imag(self.roots) == 0):
+                self.roots = numpy.real(self.roots).astype(float)
+            self.position = path_position(parameter_values(self.parameter))
         return solutions
 
+    def reset_continuation(self):
+        self.roots = None
+        self.position = None
+        self.previous_roots = None
+        self.previous_position = None
+
     def parametrized_first_equation(self, one1: Number, two1: Number) -> Number:
-        return self.first_callable_equation(one1, two1,
-                                            self.parameter.T_d,
-                                            self.parameter.F,
-                                            self.parameter.omega_1,
-                                            self.parameter.omega_2,
-                                            self.parameter.etta_1,
-                                            self.parameter.etta_2,
-                                            self.parameter.N_1,
-                                            self.parameter.N_2,
-                                            self.parameter.f_0,
-                                            self.parameter.I_p,
-                                            self.parameter.p,
-                                            self.parameter.p_theta
-                                            ).evalf()
+        if self.specialized_first is not None:
+            return self.specialized_first.evaluate(self.parameter, one1, two1)
+        return self.first_callable_equation(one1, two1, *parameter_values(self.parameter))
 
     def parametrized_second_equation(self, one1: Number, two2: Number) -> Number:
-        return self.second_callable_equation(one1, two2,
-                                             self.parameter.T_d,
-                                             self.parameter.F,
-                                             self.parameter.omega_1,
-                                             self.parameter.omega_2,
-                                             self.parameter.etta_1,
-                                             self.parameter.etta_2,
-                                             self.parameter.N_1,
-                                             self.parameter.N_2,
-                                             self.parameter.f_0,
-                                             self.parameter.I_p,
-                                             self.parameter.p,
-                                             self.parameter.p_theta
-                                             ).evalf()
-
-    def __get_grid(self) -> ndarray:
-        basic_grid: ndarray = linspace(self._left_border, self._right_border, self._frequency)
-        items = range(0, self._dimension)
-        grid: ndarray = array([])
-
-        for _ in items:
-            grid = fill(grid, basic_grid)
-
-        return grid
+        if self.specialized_second is not None:
+            return self.specialized_second.evaluate(self.parameter, one1, two2)
+        return self.second_callable_equation(one1, two2, *parameter_values(self.parameter))
+
+    def parametrized_jacobian(self, one1: Number, two1: Number) -> Tuple[Number, Number, Number, Number]:
+        if self.specialized_jacobian is not None:
+            d1_dx, d1_dy, d2_dx, d2_dy = self.specialized_jacobian.evaluate(self.parameter, one1, two1)
+        else:
+            d1_dx, d1_dy, d2_dx, d2_dy = self.callable_jacobian(one1, two1, *parameter_values(self.parameter))
+        return d1_dx, d1_dy, d2_dx, d2_dy
+
+    def __get_grid(self) -> Iterator[ndarray]:
+        return iterate_grid(self.grid_kind, self._dimension, self._left_border, self._right_border, self._frequency,
+                            **self.grid_options)
 
     def set_parameter(self, parameter: IonizationParameter):
         super().set_parameter(parameter)
         self.logger.info(f"The parameter {str(parameter)} is set")
 
+    def set_batched(self, batched: bool):
+        self.batched = batched
+        self.logger.debug(f"The batched solving is {'enabled' if batched else 'disabled'}")
+
+    def set_specialization(self, specialized: bool, free: Sequence[Symbol] = (), size: int = SPECIALIZATIONS):
+        """
+        With the specialization the equations and the jacobian are compiled anew for every values of the parameters
+        but the free ones, with those values folded in. The compiled functions are kept for the last size values.
+        """
+        if specialized and self.mode != NUMERIC:
+            raise ValueError(f"The specialization requires the {NUMERIC} mode. Got: {self.mode}")
+
+        if specialized:
+            arguments = (self.x, self.y)
+            self.specialized_first = SpecializedFunction([self.first_equation], arguments, free, False, size)
+            self.specialized_second = SpecializedFunction([self.second_equation], arguments, free, False, size)
+            self.specialized_jacobian = SpecializedFunction(self.jacobian, arguments, free, True, size)
+        else:
+            self.specialized_first = self.specialized_second = self.specialized_jacobian = None
+        self.logger.debug(f"The specialization is {'enabled' if specialized else 'disabled'}, free parameters: "
+                          f"{list(free)}")
+
+    def set_grid(self, kind: str, **options):
+        self.grid_kind = kind
+        self.grid_options = options
+        self.logger.debug(f"The {kind} grid with options {options} is set")
+
+    def set_complex_plane(self, imaginary_left: float, imaginary_right: float, imaginary_frequency: int):
+        """
+        The roots are searched for in the complex (x, y) space. Seeds are taken from the grid of the real borders and
+        the given imaginary ones.
+        """
+        self.set_grid(COMPLEX, imaginary_left=imaginary_left, imaginary_right=imaginary_right,
+                      imaginary_frequency=imaginary_frequency)
+
+    def set_pruning(self, pruning: bool, basin_radius: float = 0.):
+        """
+        With the pruning a seed stops once it comes into the precision ball of an already found solution.
+        Seeds closer than the basin radius to a point some earlier converged seed passed through are skipped.
+        """
+        self.pruning = pruning
+        self.basin_radius = basin_radius
+        self.logger.debug(f"The pruning is {'enabled' if pruning else 'disabled'}, basin radius = {basin_radius}")
+
+    def set_continuation(self, continuation: bool, extrapolation: bool = True, branch_radius: float = BRANCH_RADIUS):
+        """
+        With the continuation the roots of the previous parameter values are the seeds. The whole grid is solved again
+        once a root has no continued one within the branch radius of its seed.
+        """
+        self.continuation = continuation
+        self.extrapolation = extrapolation
+        self.branch_radius = branch_radius
+        self.reset_continuation()
+        self.logger.debug(f"The continuation is {'enabled' if continuation else 'disabled'}, branch radius = "
+                          f"{branch_radius}")
+
     def set_precision(self, precision: float):
         TwoValueSolution.equal_round = precision
         self.logger.debug(f"The precision = {str(precision)} is set")
@@ -0,0 +1,33 @@
+from typing import List, Tuple
+
+import numpy
+from numpy import ndarray
+
+from scr.util import Number
+
+
+# A complex point (x, y) is searched for as the four real unknowns (Re x, Im x, Re y, Im y)
+def split_point(point: ndarray) -> ndarray:
+    point = numpy.asarray(point, dtype=complex)
+    return numpy.column_stack((point.real, point.imag)).ravel()
+
+
+def join_point(unknowns: ndarray) -> Tuple[complex, complex]:
+    return complex(unknowns[0], unknowns[1]), complex(unknowns[2], unknowns[3])
+
+
+def split_residuals(first: Number, second: Number) -> List[float]:
+    first, second = complex(first), complex(second)
+    return [first.real, first.imag, second.real, second.imag]
+
+
+def split_jacobian(d1_dx: Number, d1_dy: Number, d2_dx: Number, d2_dy: Number) -> List[List[float]]:
+    # The residuals are analytic, so by the Cauchy-Riemann equations every complex derivative f' gives the real block
+    # | Re f'  -Im f' |
+    # | Im f'   Re f' |
+    def block(derivative: Number) -> Tuple[List[float], List[float]]:
+        derivative = complex(derivative)
+        return [derivative.real, -derivative.imag], [derivative.imag, derivative.real]
+
+    (a_1, a_2), (b_1, b_2), (c_1, c_2), (d_1, d_2) = block(d1_dx), block(d1_dy), block(d2_dx), block(d2_dy)
+    return [a_1 + b_1, a_2 + b_2, c_1 + d_1, c_2 + d_2]
@@ -0,0 +1,45 @@
+from typing import Optional, Tuple, List
+
+import numpy
+from numpy import ndarray
+
+from scr.solution.RootRegistry import RootRegistry
+from scr.solution.TwoValueSolution import TwoValueSolution
+from scr.util import Number
+
+BRANCH_RADIUS = 1.
+
+
+def path_position(values: Tuple[Number, ...]) -> ndarray:
+    return numpy.asarray(values, dtype=complex)
+
+
+def predict_seeds(roots: ndarray,
+                  position: ndarray,
+                  next_position: ndarray,
+                  previous_roots: Optional[ndarray] = None,
+                  previous_position: Optional[ndarray] = None) -> ndarray:
+    # Every root is moved along the secant through the nearest root of the previous point of the path
+    if previous_roots is None or len(previous_roots) == 0 or len(roots) == 0:
+        return roots
+
+    step = position - previous_position
+    length = numpy.real(numpy.vdot(step, step))
+    if length == 0:
+        return roots
+
+    ratio = numpy.real(numpy.vdot(step, next_position - position)) / length
+    distances = numpy.linalg.norm(roots[:, numpy.newaxis, :] - previous_roots[numpy.newaxis, :, :], axis=2)
+    predecessors = previous_roots[numpy.argmin(distances, axis=1)]
+    return roots + ratio * (roots - predecessors)
+
+
+def count_lost_branches(seeds: ndarray, solutions: List[TwoValueSolution], radius: float = BRANCH_RADIUS) -> int:
+    # A branch is continued by the root within the radius of its seed, a root continues one branch at most
+    registry = RootRegistry(TwoValueSolution.get_equal_round(), radius)
+    for solution in solutions:
+        registry.add(solution)
+        registry.map_basin(solution, [(solution.first_number, solution.second_number)])
+
+    continued = {registry.find_basin(first, second) for first, second in seeds} - {-1}
+    return len(seeds) - len(continued)
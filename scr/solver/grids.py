@@ -0,0 +1,93 @@
+from math import ceil, log2
+from typing import Iterator, Sequence
+
+import numpy
+from numpy import ndarray
+from scipy.stats import qmc
+
+UNIFORM = 'uniform'
+LOGARITHMIC = 'logarithmic'
+SOBOL = 'sobol'
+HALTON = 'halton'
+COMPLEX = 'complex'
+
+CHUNK_SIZE = 1024
+
+
+def uniform_axis(left: float, right: float, frequency: int) -> ndarray:
+    return numpy.linspace(left, right, frequency)
+
+
+def logarithmic_axis(left: float, right: float, frequency: int, scale: float = 1.) -> ndarray:
+    # Logarithmically spaced far from zero and linearly near it, so the borders may have any signs
+    return scale * numpy.sinh(numpy.linspace(numpy.arcsinh(left / scale), numpy.arcsinh(right / scale), frequency))
+
+
+def complex_axis(left: float,
+                 right: float,
+                 frequency: int,
+                 imaginary_left: float,
+                 imaginary_right: float,
+                 imaginary_frequency: int) -> ndarray:
+    real, imaginary = numpy.meshgrid(uniform_axis(left, right, frequency),
+                                     uniform_axis(imaginary_left, imaginary_right, imaginary_frequency),
+                                     indexing='ij')
+    return (real + 1j * imaginary).ravel()
+
+
+def cartesian(axes: Sequence[ndarray]) -> ndarray:
+    if len(axes) == 0:
+        return numpy.empty((0, 0))
+    return numpy.stack([mesh.ravel() for mesh in numpy.meshgrid(*axes, indexing='ij')], axis=-1)
+
+
+def iterate_cartesian(axes: Sequence[ndarray], chunk_size: int = CHUNK_SIZE) -> Iterator[ndarray]:
+    # The rows of the cartesian product in the order of cartesian(axes) by chunks of at most chunk_size rows
+    shape = tuple(len(axis) for axis in axes)
+    total = int(numpy.prod(shape)) if shape else 0
+    for start in range(0, total, chunk_size):
+        indices = numpy.unravel_index(numpy.arange(start, min(start + chunk_size, total)), shape)
+        yield numpy.stack([axis[index] for axis, index in zip(axes, indices)], axis=-1)
+
+
+def iterate_low_discrepancy(engine: qmc.QMCEngine,
+                            left: float,
+                            right: float,
+                            count: int,
+                            chunk_size: int = CHUNK_SIZE) -> Iterator[ndarray]:
+    for start in range(0, count, chunk_size):
+        yield left + (right - left) * engine.random(min(chunk_size, count - start))
+
+
+def iterate_grid(kind: str,
+                 dimension: int,
+                 left: float,
+                 right: float,
+                 frequency: int,
+                 chunk_size: int = CHUNK_SIZE,
+                 **options) -> Iterator[ndarray]:
+    """
+    Seeds of the given kind by chunks. The low discrepancy kinds have as many points as the uniform grid has, for
+    Sobol the number is rounded up to a power of 2. Options: scale for the logarithmic kind, seed for the low discrepancy
+    kinds, imaginary_left, imaginary_right and imaginary_frequency for the complex one.
+    """
+    if kind == UNIFORM:
+        return iterate_cartesian([uniform_axis(left, right, frequency)] * dimension, chunk_size)
+    if kind == LOGARITHMIC:
+        axis = logarithmic_axis(left, right, frequency, options.get('scale', 1.))
+        return iterate_cartesian([axis] * dimension, chunk_size)
+    if kind == COMPLEX:
+        axis = complex_axis(left, right, frequency, options.get('imaginary_left', left),
+                            options.get('imaginary_right', right), options.get('imaginary_frequency', frequency))
+        return iterate_cartesian([axis] * dimension, chunk_size)
+    if kind == SOBOL:
+        count = 2 ** ceil(log2(max(frequency ** dimension, 1)))
+        # Chunks of a power of 2 keep the balance properties of the Sobol sequence
+        chunk_size = 2 ** int(log2(max(chunk_size, 1)))
+        engine = qmc.Sobol(dimension, seed=options.get('seed', 0))
+        return iterate_low_discrepancy(engine, left, right, count, chunk_size)
+    if kind == HALTON:
+        engine = qmc.Halton(dimension, seed=options.get('seed', 0))
+        return iterate_low_discrepancy(engine, left, right, frequency ** dimension, chunk_size)
+
+    raise ValueError(f"Unknown grid kind: {kind}. Expected one of: {[UNIFORM, LOGARITHMIC, SOBOL, HALTON, COMPLEX]}")
@@ -1,10 +1,18 @@
+import logging
 from abc import ABC
-from typing import Generic, TypeVar, Callable
+from typing import Generic, TypeVar, Callable, Sequence, Tuple
 
+import numpy
+from sympy import Symbol
+
+from scr.calculation_equipment.compilation import SharedEvaluation, NUMERIC, SPECIALIZATIONS, SpecializedFunction, \
+    parameter_values
+from scr.instrumentation import measure, add
 from scr.parameter.AbstaractParameter import AbstractParameter
 from scr.parameter.AbstractGeneratorParameter import AbstractGeneratorParameter
 from scr.parameter.IonizationGeneratorParameter import IonizationGeneratorParameter
 from scr.solution.AbstractSolution import AbstractSolution
+from scr.stage.ResultCache import ResultCache, RESULTS
 from scr.util import Number
 
 SOLUTION = TypeVar('SOLUTION', bound=AbstractSolution)
@@ -15,9 +23,87 @@ class AbstractStage(ABC, Generic[SOLUTION, PARAMETER]):
     def __init__(self, generator: Callable[[Number, AbstractGeneratorParameter], Number]):
         self.generator = generator
         self.parameter = None  # Should be set in the appropriate setter before use
+        self.mode = NUMERIC
+        self.logger = None
+        self.callable_stage = None  # The stage compiled with the parameters as arguments after the stage ones
+        self.shared_evaluation = None  # Set when the stage is evaluated together with other stages
+        self.shared_index = None
+        self.specialized_stage = None  # The stage compiled for the fixed parameter values
+        self.result_cache = None  # Set when the results are memoized
 
     def get_result(self, solution: SOLUTION) -> Number:
-        pass
+        # The messages are built only when they are written, since the stages are evaluated for every solution
+        name = type(self).__module__
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug(f"Start to calculate {name} for {str(solution)}")
+
+        if self.result_cache is not None:
+            result = self.result_cache.get(solution, self.parameter)
+            if result is not None:
+                add(f"{self.STORAGE.name}.cached")
+                if self.logger.isEnabledFor(logging.INFO):
+                    self.logger.info(f"The {result} value of {name} is taken from the result cache")
+                return result
+
+        result = None
+        try:
+            with measure(f"{self.STORAGE.name}.get_result"):
+                result = self.parametrized_stage(*solution.get_solution())
+            # The compiled numeric stage gives nan or inf on an overflow or an invalid operation instead of raising
+            if self.mode == NUMERIC and not numpy.all(numpy.isfinite(result)):
+                raise ArithmeticError(f"The non-finite value {result} is calculated")
+        except (ValueError, ArithmeticError) as e:
+            result = None
+            self.logger.error(f"The error: {str(e)} occurred")
+        if self.result_cache is not None and result is not None:
+            self.result_cache.store(solution, self.parameter, result)
+
+        if self.logger.isEnabledFor(logging.INFO):
+            self.logger.info(f"The {result} value calculated by {name}")
+        return result
+
+    def get_expression(self) -> Symbol:
+        # The formula of the stage, it's compiled by the stage itself
+        raise NotImplementedError
+
+    def get_arguments(self) -> Tuple[Symbol, ...]:
+        # The symbols of the solution the formula of the stage takes before the parameters
+        raise NotImplementedError
 
     def set_parameter(self, parameter: PARAMETER):
         self.parameter = parameter
+
+    def set_shared_evaluation(self, evaluation: SharedEvaluation, index: int):
+        self.shared_evaluation = evaluation
+        self.shared_index = index
+
+    def parametrized_stage(self, *arguments: Number) -> Number:
+        if self.mode == NUMERIC:
+            arguments = tuple(complex(argument) for argument in arguments)
+        if self.specialized_stage is not None:
+            return self.specialized_stage.evaluate(self.parameter, *arguments)
+        if self.shared_evaluation is not None:
+            return self.shared_evaluation.get(self.shared_index, *arguments, *parameter_values(self.parameter))
+        return self.callable_stage(*arguments, *parameter_values(self.parameter))
+
+    def set_specialization(self, specialized: bool, free: Sequence[Symbol] = (), size: int = SPECIALIZATIONS):
+        """
+        With the specialization the stage is compiled anew for every values of the parameters but the free ones, with
+        those values folded in. It's used instead of the shared evaluation.
+        """
+        if specialized and self.mode != NUMERIC:
+            raise ValueError(f"The specialization requires the {NUMERIC} mode. Got: {self.mode}")
+
+        self.specialized_stage = SpecializedFunction([self.get_expression()], self.get_arguments(), free, False, size) \
+            if specialized else None
+        self.logger.debug(f"The specialization is {'enabled' if specialized else 'disabled'}, free parameters: "
+                          f"{list(free)}")
+
+    def set_result_cache(self, cached: bool, size: int = RESULTS, stored: bool = False):
+        """
+        With the result cache the results are memoized per solution and parameter values. With stored ones they are
+        also kept in the formula cache directory for the next runs.
+        """
+        path = self.cache.results_path(self.STORAGE.name) if stored else None
+        self.result_cache = ResultCache(size, path) if cached else None
+        self.logger.debug(f"The result cache is {'enabled' if cached else 'disabled'}, stored in: {path}")
@@ -1,121 +1,93 @@
-import logging
+from typing import Tuple
 
-from sympy import exp, sqrt, pi, Symbol, lambdify, Integral
-from sympy.stats.frv_types import numpy
+from sympy import exp, pi, Symbol, Integral, Mul, Pow, S
 
+from scr.calculation_equipment.FormulaCache import FormulaCache
 from scr.calculation_equipment.Formulas import Formulas, complex_quad
-from scr.main import FORMULAS, LOG_FILE, shared
+from scr.calculation_equipment.compilation import NUMERIC, PARAMETER_SYMBOLS
+from scr.logs import get_logger
+from scr.main import FORMULAS
 from scr.parameter.IonizationParameter import IonizationParameter
-from scr.parameter.IonizationSymbols import IonizationSymbols
 from scr.solution.TwoValueSolution import TwoValueSolution
 from scr.stage.AbstractStage import AbstractStage
-from scr.util import Number, square, store_function, restore_function
+from scr.util import square
 
 
 class PropelStage(AbstractStage[TwoValueSolution, IonizationParameter]):
     STORAGE = FORMULAS.joinpath('propel_stage')
 
-    def __init__(self, generator):
+    def __init__(self, generator, mode: str = NUMERIC, closed_form: bool = True):
         super().__init__(generator)
+        self.mode = mode
+        self.closed_form = closed_form
         self.logger = None
         self.set_up_logger()
         self.x = Symbol('x')
         self.y = Symbol('y')
         self.formulas = None
         self.init_formulas()
+        self.cache = FormulaCache(generator, PropelStage, variant=self.cache_variant(closed_form))
         self.stage = self.get_stage()
         self.callable_stage = self.get_callable_stage()
 
     def set_up_logger(self):
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.DEBUG)
-
-        # ch = logging.StreamHandler()
-        # ch.setLevel(logging.DEBUG)
-
-        fh = logging.FileHandler(shared[LOG_FILE])
-        fh.setLevel(logging.DEBUG)
-
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-        # ch.setFormatter(formatter)
-        fh.setFormatter(formatter)
-
-        # self.logger.addHandler(ch)
-        self.logger.addHandler(fh)
+        self.logger = get_logger(__name__)
 
     def init_formulas(self):
-        self.formulas = Formulas()
-        Formulas.generator = self.generator
+        self.formulas = Formulas.instance(self.generator, self.closed_form)
         Formulas.parameter = self.parameter
 
-    def get_stage(self):
-        self.logger.debug(f"Start to get {str(__name__)} analytical equation")
-
-        def compute_stage(t1: Symbol, t2: Symbol) -> Symbol:
-            t = Symbol('t')
-            to_integrate = 0.5j * square(self.formulas.get_impulse() + self.formulas.A(t)).expand()
+    @staticmethod
+    def cache_variant(closed_form: bool) -> str:
+        return f"closed_form={closed_form}"
+
+    @classmethod
+    def export_name(cls, closed_form: bool) -> str:
+        # The integral form is exported apart, so building it never replaces the stored closed form
+        return cls.STORAGE.name if closed_form else f"{cls.STORAGE.name}_numeric"
+
+    @staticmethod
+    def compute_stage(formulas: Formulas, t1: Symbol, t2: Symbol) -> Symbol:
+        t = Symbol('t')
+        if formulas.closed_form:
+            # The integrand is p^2 + A^2, the integral of A^2 is shared with S
+            integral = 0.5j * (square(formulas.get_impulse()) * (t2 - t1) - formulas.A_square_integral(t1, t2))
+        else:
+            to_integrate = 0.5j * square(formulas.get_impulse() + formulas.A(t)).expand()
             integral = Integral(to_integrate, (t, t1, t2))  # TODO need to make sure
 
-            return sqrt(2 * pi / self.formulas.L(t1, t2)) * (exp(1j * self.formulas.S(t1, t2) + integral)) / (
-                    t1 - t2) ** 3 / 2
+        # Evaluating the product of such large factors takes sympy minutes and simplifies nothing
+        return Mul(Pow(2 * pi / formulas.L(t1, t2), S.Half, evaluate=False),
+                   exp(1j * formulas.S(t1, t2) + integral),
+                   Pow(t1 - t2, -3),
+                   S.Half,
+                   evaluate=False)
+
+    def get_stage(self):
+        self.logger.debug(f"Start to get {str(__name__)} analytical equation")
 
-        if self.STORAGE.exists():
-            self.logger.debug(f"An already calculated {__name__} equation detected in {str(self.STORAGE)}. It's using")
-            return restore_function(self.STORAGE)
+        equation = self.cache.restore_expression(self.STORAGE.name)
+        if equation is not None:
+            self.logger.debug(f"An already calculated {__name__} equation detected in {str(self.cache.directory)}. "
+                              f"It's using")
+            return equation
         else:
             self.logger.debug(f"Start to calculate the {__name__}")
-            equation = compute_stage(self.x, self.y)
-            store_function(self.STORAGE, equation)
+            equation = self.cache.derive_expression(
+                self.STORAGE.name, lambda: self.compute_stage(self.formulas, self.x, self.y),
+                self.cache.export_path(self.export_name(self.closed_form)))
             self.logger.debug(f"The {__name__} equation calculated successfully")
             return equation
 
+    def get_expression(self) -> Symbol:
+        return self.stage
+
+    def get_arguments(self) -> Tuple[Symbol, ...]:
+        return self.x, self.y
+
     def get_callable_stage(self):
-        callable_stage = lambdify((self.x, self.y,
-                                   IonizationSymbols.T_d,
-                                   IonizationSymbols.F,
-                                   IonizationSymbols.omega_1,
-                                   IonizationSymbols.omega_2,
-                                   IonizationSymbols.etta_1,
-                                   IonizationSymbols.etta_2,
-                                   IonizationSymbols.N_1,
-                                   IonizationSymbols.N_2,
-                                   IonizationSymbols.f_0,
-                                   IonizationSymbols.I_p,
-                                   IonizationSymbols.p,
-                                   IonizationSymbols.p_theta
-                                   ),
-                                  self.stage,
-                                  modules=[{"pi": numpy.pi}, {"Integral": complex_quad}, 'sympy']
-                                  )
+        callable_stage = self.cache.compile(self.STORAGE.name, self.stage, (self.x, self.y) + PARAMETER_SYMBOLS,
+                                            self.mode, complex_quad)
 
         self.logger.info(f"The callable stage of {__name__} {callable_stage} created successfully")
         return callable_stage
-
-    def get_result(self, solution: TwoValueSolution) -> Number:
-        self.logger.debug(f"Start to calculate {__name__} for {str(solution)}")
-
-        result = None
-        try:
-            result = self.parametrized_stage(solution.first_number, solution.second_number)
-        except (ValueError, ArithmeticError) as e:
-            self.logger.error(f"The error: {str(e)} occurred")
-
-        self.logger.info(f"The {result} value calculated by {__name__}")
-        return result
-
-    def parametrized_stage(self, one1: Number, two1: Number) -> Number:
-        return self.callable_stage(one1, two1,
-                                   self.parameter.T_d,
-                                   self.parameter.F,
-                                   self.parameter.omega_1,
-                                   self.parameter.omega_2,
-                                   self.parameter.etta_1,
-                                   self.parameter.etta_2,
-                                   self.parameter.N_1,
-                                   self.parameter.N_2,
-                                   self.parameter.f_0,
-                                   self.parameter.I_p,
-                                   self.parameter.p,
-                                   self.parameter.p_theta
-                                   ).evalf()
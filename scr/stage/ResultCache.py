@@ -0,0 +1,110 @@
+import ast
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy
+
+from scr.calculation_equipment.compilation import parameter_values
+from scr.parameter.IonizationParameter import IonizationParameter
+from scr.solution.TwoValueSolution import TwoValueSolution
+from scr.util import Number, write_atomically
+
+logger = logging.getLogger(__name__)
+
+RESULTS = 4096
+QUANTUM = 1e-9
+
+Key = Tuple[int, int, int, int, Tuple[Number, ...]]
+
+
+def plain(value: Number) -> Number:
+    # Numpy scalars are turned into the built-in ones, so the stored keys and results are read back as literals
+    return complex(value) if numpy.iscomplexobj(value) else float(value)
+
+
+class ResultCache:
+    # Stage results keyed by the solution rounded to the quantum and by the parameter values. The last used size results
+    # are kept in memory. With a path every new result is also appended to that file and the last size results of the
+    # file are read back on construction, a torn last line left by an interrupted run is skipped. Once the file has
+    # twice as many lines as the size, it's rewritten with the results kept in memory
+    def __init__(self, size: int = RESULTS, path: Optional[Path] = None, quantum: float = QUANTUM) -> None:
+        if size < 1:
+            raise ValueError(f"At least one result should be kept. Got: {size}")
+        if quantum <= 0:
+            raise ValueError(f"A positive quantum is required. Got: {quantum}")
+
+        self.size = size
+        self.path = path
+        self.quantum = quantum
+        self.results: OrderedDict = OrderedDict()
+        self.torn = False  # The file doesn't end with a line break, so the next result should start with one
+        self.lines = 0  # The lines of the file
+        self.hits = 0
+        self.misses = 0
+        if path is not None:
+            self.load()
+
+    def get_key(self, solution: TwoValueSolution, parameter: IonizationParameter) -> Key:
+        first, second = complex(solution.first_number), complex(solution.second_number)
+        return (round(first.real / self.quantum), round(first.imag / self.quantum),
+                round(second.real / self.quantum), round(second.imag / self.quantum),
+                tuple(plain(value) for value in parameter_values(parameter)))
+
+    def get(self, solution: TwoValueSolution, parameter: IonizationParameter) -> Optional[Number]:
+        key = self.get_key(solution, parameter)
+        if key not in self.results:
+            self.misses += 1
+            return None
+
+        self.results.move_to_end(key)
+
+        self.hits += 1
+        return self.results[key]
+
+    def store(self, solution: TwoValueSolution, parameter: IonizationParameter, result: Number):
+        key, result = self.get_key(solution, parameter), plain(result)
+        known = key in self.results
+        self.remember(key, result)
+        if self.path is not None and not known:
+            with self.path.open('a') as file:
+                file.write(('\n' if self.torn else '') + f"{repr(key)}\t{repr(result)}\n")
+            self.torn = False
+            self.lines += 1
+            if self.lines > 2 * self.size:
+                self.compact()
+
+    def remember(self, key: Key, result: Number):
+        self.results[key] = result
+        self.results.move_to_end(key)
+        if len(self.results) > self.size:
+            self.results.popitem(last=False)
+
+    def load(self):
+        if not self.path.exists():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            return
+
+        with self.path.open('r') as file:
+            for line in file:
+                self.lines += 1
+                self.torn = not line.endswith('\n')
+                try:
+                    key, result = line.rstrip('\n').split('\t')
+                    self.remember(ast.literal_eval(key), ast.literal_eval(result))
+                except (ValueError, SyntaxError):
+                    logger.warning(f"A damaged line of the results {str(self.path)} is skipped: {line!r}")
+        logger.debug(f"{len(self.results)} results are read from {str(self.path)}")
+        if self.lines > 2 * self.size:
+            self.compact()
+
+    def compact(self):
+        write_atomically(self.path, ''.join(f"{repr(key)}\t{repr(result)}\n"
+                                            for key, result in self.results.items()).encode('utf-8'))
+        logger.debug(f"The results {str(self.path)} are compacted from {self.lines} to {len(self.results)} lines")
+        self.lines, self.torn = len(self.results), False
+
+    def get_hit_rate(self) -> float:
+        requests = self.hits + self.misses
+        return self.hits / requests if requests > 0 else 0.
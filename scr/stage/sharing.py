@@ -0,0 +1,24 @@
+from typing import List
+
+from sympy import Symbol
+
+from scr.calculation_equipment.FormulaCache import FormulaCache
+from scr.calculation_equipment.compilation import NUMERIC, PARAMETER_SYMBOLS, SharedEvaluation
+from scr.stage.AbstractStage import AbstractStage
+
+
+def share_evaluation(stages: List[AbstractStage]) -> SharedEvaluation:
+    # The stages are compiled into one function, so subterms they have in common are computed once per solution
+    for stage in stages:
+        if stage.mode != NUMERIC:
+            raise ValueError(f"Only stages in the {NUMERIC} mode can share evaluation. Got: {stage.mode} for {stage}")
+
+    cache = FormulaCache.combine(*[stage.cache for stage in stages])
+    name = '+'.join(stage.STORAGE.name for stage in stages)
+    function = cache.compile_shared(name, [stage.stage for stage in stages],
+                                    (Symbol('x'), Symbol('y')) + PARAMETER_SYMBOLS)
+
+    evaluation = SharedEvaluation(function)
+    for index, stage in enumerate(stages):
+        stage.set_shared_evaluation(evaluation, index)
+    return evaluation
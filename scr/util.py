@@ -1,24 +1,124 @@
+import os
+import pickle
+import stat
+import tempfile
+from contextlib import contextmanager
+from hashlib import sha256
 from pathlib import Path
-from typing import Callable, Union, List
+from typing import Callable, Union, List, Optional, Iterator
 
 from numpy.core.records import ndarray
-from numpy.ma import empty, append, array
-from sympy import symbols, diff, lambdify, integrate, Symbol
+import numpy
+from numpy.ma import array
+from sympy import symbols, diff, lambdify, integrate, Symbol, evaluate
 from sympy.parsing.sympy_parser import parse_expr
+from sympy.printing.str import sstr
+
+from scr.instrumentation import measure
 
 Number = Union[float, complex]
 Summable = Union[Number, Symbol]
 
-
-def store_function(path: Path, function: Symbol) -> None:
-    with path.open('w') as file:
-        r = function.__str__()
-        file.write(function.__str__())
-
-
-def restore_function(path: Path) -> Symbol:
-    with open(path, 'r') as file:
-        return parse_expr(file.read())
+# The text form is a readable export, the binary one is a pickle loading orders of magnitude faster than parsing
+TEXT = 'text'
+BINARY = 'binary'
+FORMATS = (TEXT, BINARY)
+
+CHECKSUM_PREFIX = b'# sha256 '
+
+
+def add_checksum(data: bytes) -> bytes:
+    # The checksum line is a comment, so stored formulas and sources stay readable as they are
+    return CHECKSUM_PREFIX + sha256(data).hexdigest().encode('ascii') + b'\n' + data
+
+
+def strip_checksum(data: bytes) -> Optional[bytes]:
+    # The data without the checksum line or None if the checksum is missing or doesn't match
+    header, separator, body = data.partition(b'\n')
+    if not separator or not header.startswith(CHECKSUM_PREFIX):
+        return None
+    if header[len(CHECKSUM_PREFIX):] != sha256(body).hexdigest().encode('ascii'):
+        return None
+    return body
+
+
+def write_atomically(path: Path, data: bytes) -> None:
+    # Readers see either no file or the whole of it, even if several processes store the same entry at once
+    path.parent.mkdir(parents=True, exist_ok=True)
+    descriptor, temporary = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(descriptor, 'wb') as file:
+            file.write(data)
+        # The temporary file is private, the stored one keeps the mode of the replaced file or gets the usual one
+        os.chmod(temporary, get_mode(path))
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+
+def get_mode(path: Path) -> int:
+    try:
+        return stat.S_IMODE(path.stat().st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextmanager
+def lock_file(path: Path) -> Iterator[None]:
+    # An exclusive lock between processes, held while the block runs. The lock file itself is left in place, since
+    # removing it would let a process waiting on the removed file and a new one on a fresh file hold the lock at once
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('a+b') as file:
+        if os.name == 'nt':
+            import msvcrt
+            file.seek(0)
+            msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == 'nt':
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+def dump_function(function: Symbol, formula_format: str = TEXT) -> bytes:
+    if formula_format == TEXT:
+        # Ordering the terms of large expressions takes longer than deriving them
+        return sstr(function, order='none').encode('utf-8')
+    if formula_format == BINARY:
+        return pickle.dumps(function, protocol=pickle.HIGHEST_PROTOCOL)
+    raise ValueError(f"Unknown formula format: {formula_format}. Expected one of: {list(FORMATS)}")
+
+
+def load_function(data: bytes, formula_format: str = TEXT) -> Symbol:
+    if formula_format == TEXT:
+        return parse_expr(data.decode('utf-8'))
+    if formula_format == BINARY:
+        # The stored expression is already canonical, so it isn't evaluated once more while being rebuilt
+        with evaluate(False):
+            return pickle.loads(data)
+    raise ValueError(f"Unknown formula format: {formula_format}. Expected one of: {list(FORMATS)}")
+
+
+def store_function(path: Path, function: Symbol, formula_format: str = TEXT) -> None:
+    write_atomically(path, add_checksum(dump_function(function, formula_format)))
+
+
+def restore_function(path: Path, formula_format: str = TEXT) -> Symbol:
+    with measure('formula_restore'):
+        with open(path, 'rb') as file:
+            data = strip_checksum(file.read())
+        if data is None:
+            raise ValueError(f"The stored formula {str(path)} is damaged: its checksum doesn't match")
+        return load_function(data, formula_format)
 
 
 # def sum_as_vectors(*terms: List[Summable]) -> List[Summable]:
@@ -57,20 +157,13 @@ def increase(factor: Summable, vector: List[Summable]) -> List[Summable]:
 
 
 def fill(destination: ndarray, source: ndarray):
-    predictable_size: int
-
+    # Every row of the destination is extended with every member of the source
+    source = numpy.asarray(source)
     if destination.size == 0:
-        return array([array([member]) for member in source])
-    else:
-        predictable_size: int = destination.shape[1] + 1
-
-    result: ndarray = empty((0, predictable_size), float)
+        return source.reshape(-1, 1)
 
-    for to_append in destination:
-        for item in source:
-            to_store = append(to_append, item)
-            result = append(result, array([to_store]), axis=0)
-    return result
+    destination = numpy.asarray(destination)
+    return numpy.column_stack((numpy.repeat(destination, len(source), axis=0), numpy.tile(source, len(destination))))
 
 
 class Integrate:
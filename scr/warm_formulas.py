@@ -0,0 +1,17 @@
+from os import cpu_count
+
+from scr.calculation_equipment.generatoers import fading_generator
+from scr.calculation_equipment.warming import warm_formulas, remove_stale_entries
+from scr.main import LOG_FOLDER, LOG_FILE, shared
+
+shared[LOG_FILE] = LOG_FOLDER.joinpath('warm_formulas')
+
+GENERATOR = fading_generator
+GENERATORS = (fading_generator,)  # Every generator the cache is kept for, the entries of the others are removed
+WORKERS = cpu_count()
+
+if __name__ == '__main__':
+    for entry in warm_formulas(GENERATOR, WORKERS):
+        print(f"{entry} is derived")
+    for path in remove_stale_entries(GENERATORS):
+        print(f"{path.name} is removed as stale")
@@ -0,0 +1,70 @@
+import unittest
+from pathlib import Path
+from typing import Tuple
+
+from sympy import Symbol
+
+from scr.calculation_equipment.compilation import PARAMETER_SYMBOLS, compile_function
+from scr.logs import get_logger
+from scr.parameter.IonizationParameter import IonizationParameter
+from scr.parameter.IonizationSymbols import IonizationSymbols
+from scr.solution.TwoValueSolution import TwoValueSolution
+from scr.stage.AbstractStage import AbstractStage
+
+
+class ProductStage(AbstractStage):
+    STORAGE = Path('product_stage')
+    x = Symbol('x')
+    y = Symbol('y')
+
+    def __init__(self):
+        super().__init__(None)
+        self.logger = get_logger(__name__)
+        self.stage = self.x * self.y * IonizationSymbols.T_d + IonizationSymbols.F
+        self.callable_stage = compile_function(self.stage, (self.x, self.y) + PARAMETER_SYMBOLS)
+
+    def get_expression(self) -> Symbol:
+        return self.stage
+
+    def get_arguments(self) -> Tuple[Symbol, ...]:
+        return self.x, self.y
+
+
+class AbstractStageTest(unittest.TestCase):
+    def create_stage(self) -> ProductStage:
+        parameter = IonizationParameter()
+        for symbol in PARAMETER_SYMBOLS:
+            setattr(parameter, symbol.name, 2.)
+        stage = ProductStage()
+        stage.set_parameter(parameter)
+        return stage
+
+    def test_specialized_stage_matches_compiled_one(self):
+        stage = self.create_stage()
+        expected = stage.parametrized_stage(1.5, 1j)
+
+        stage.set_specialization(True, free=(IonizationSymbols.T_d,))
+
+        self.assertAlmostEqual(expected, stage.parametrized_stage(1.5, 1j))
+        self.assertAlmostEqual(2 + 3j, stage.parametrized_stage(1.5, 1j))
+
+    def test_results_are_taken_from_result_cache(self):
+        stage = self.create_stage()
+        stage.set_result_cache(True)
+        solution = TwoValueSolution(1.5, 1j)
+
+        self.assertAlmostEqual(2 + 3j, stage.get_result(solution))
+        self.assertAlmostEqual(2 + 3j, stage.get_result(solution))
+        self.assertEqual((1, 1), (stage.result_cache.hits, stage.result_cache.misses))
+
+    def test_non_finite_result_is_none(self):
+        stage = self.create_stage()
+        stage.set_result_cache(True)
+        stage.parameter.F = float('nan')
+
+        self.assertIsNone(stage.get_result(TwoValueSolution(1.5, 1j)))
+        self.assertEqual(0, len(stage.result_cache.results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+from math import tanh
+from unittest import TestCase
+
+from scr.plot_printers.AdaptiveSweep import AdaptiveSweep
+from scr.plot_printers.SweepExecutor import SweepExecutor
+
+INITIAL = [0.25 * number for number in range(5)]
+
+
+def step(x: float) -> float:
+    return tanh(50 * (x - 0.5))
+
+
+def roots(x: float) -> dict:
+    # The y point is flat, only the root count changes
+    return {'y': 1., 'roots': [[1., 1.]] * (1 if x < 0.3 else 2)}
+
+
+class Test(TestCase):
+    def test_sharp_change_is_refined_within_budget(self):
+        x_points, y_points = AdaptiveSweep(SweepExecutor(step), budget=30).sample(INITIAL)
+
+        self.assertEqual(30, len(x_points))
+        self.assertEqual([step(x) for x in x_points], y_points)
+        self.assertGreater(len([x for x in x_points if 0.4 < x < 0.6]), len(x_points) / 2)
+
+    def test_straight_line_is_barely_refined(self):
+        x_points, _ = AdaptiveSweep(SweepExecutor(lambda x: x), budget=30).sample(INITIAL)
+
+        self.assertEqual([0.125 * number for number in range(9)], x_points)
+
+    def test_root_count_change_is_refined_to_resolution(self):
+        x_points, _ = AdaptiveSweep(SweepExecutor(roots), budget=100, resolution=1e-3).sample(INITIAL)
+
+        around = [x for x in x_points if abs(x - 0.3) < 0.002]
+        self.assertLess(len(x_points), 100)
+        self.assertGreaterEqual(len(around), 2)
+        self.assertLess(max(around) - min(around), 0.002)
+
+    def test_budget_below_initial_points_is_rejected(self):
+        with self.assertRaises(ValueError):
+            AdaptiveSweep(SweepExecutor(step), budget=3).sample(INITIAL)
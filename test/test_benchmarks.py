@@ -0,0 +1,56 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from types import ModuleType
+
+from scr.benchmarks.runner import discover, run, save, load, compare
+
+
+class Counting:
+    repeat = 2
+    number = 3
+
+    def setup(self):
+        self.calls = 0
+
+    def time_call(self):
+        self.calls += 1
+
+    def helper(self):
+        pass
+
+
+def create_module() -> ModuleType:
+    module = ModuleType('counting_benchmarks')
+    Counting.__module__ = module.__name__
+    module.Counting = Counting
+    return module
+
+
+class RunnerTest(unittest.TestCase):
+    def test_only_time_methods_are_benchmarks(self):
+        self.assertEqual([('Counting.time_call', Counting, 'time_call')], discover(create_module()))
+
+    def test_results_are_per_call(self):
+        results = run(create_module())
+
+        self.assertEqual({'Counting.time_call'}, set(results))
+        self.assertEqual((2, 3), (results['Counting.time_call']['repeat'], results['Counting.time_call']['number']))
+        self.assertLessEqual(results['Counting.time_call']['min'], results['Counting.time_call']['median'])
+
+    def test_saved_baseline_is_loaded(self):
+        results = {'Counting.time_call': {'min': 1., 'median': 2., 'repeat': 2, 'number': 3}}
+        with TemporaryDirectory() as directory:
+            save(results, 'baseline', Path(directory))
+
+            self.assertEqual(results, load('baseline', Path(directory)))
+
+    def test_only_slower_benchmarks_are_regressions(self):
+        baseline = {'fast': {'min': 1.}, 'slow': {'min': 1.}, 'new': {'min': 1.}}
+        results = {'fast': {'min': 1.1}, 'slow': {'min': 1.5}, 'other': {'min': 9.}}
+
+        self.assertEqual({'slow': 1.5}, compare(results, baseline, 0.2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,161 @@
+import unittest
+from math import exp as math_exp, pi as math_pi, sqrt as math_sqrt, atan as math_atan
+
+import numpy
+
+from sympy import Symbol, Integral, exp, sqrt, pi, cos, Float
+
+from scr.parameter.IonizationParameter import IonizationParameter
+from scr.parameter.IonizationSymbols import IonizationSymbols
+
+from scr.calculation_equipment.compilation import compile_function, NUMERIC, SYMBOLIC, integrate_numerically, \
+    compile_shared, generate_shared_source, SharedEvaluation, specialize, SpecializedFunction, PARAMETER_SYMBOLS
+
+
+class CompilationTest(unittest.TestCase):
+    x = Symbol('x')
+    y = Symbol('y')
+    t = Symbol('t')
+
+    def test_numeric_mode_matches_symbolic_mode(self):
+        expression = exp(-self.x ** 2) * cos(pi * self.y) + sqrt(self.x * self.y)
+
+        numeric = compile_function(expression, (self.x, self.y), NUMERIC)
+        symbolic = compile_function(expression, (self.x, self.y), SYMBOLIC)
+
+        self.assertAlmostEqual(complex(symbolic(0.5, 2.)), complex(numeric(0.5, 2.)))
+
+    def test_numeric_mode_returns_plain_numbers(self):
+        numeric = compile_function(self.x * self.y, (self.x, self.y), NUMERIC)
+
+        self.assertIsInstance(numeric(2., 3.), float)
+
+    def test_numeric_mode_works_for_complex_arguments(self):
+        numeric = compile_function(sqrt(self.x), (self.x,), NUMERIC)
+
+        self.assertAlmostEqual(1j, numeric(-1 + 0j))
+
+    def test_integral_is_calculated_numerically(self):
+        expression = Integral(exp(-self.t ** 2) * self.x, (self.t, self.y, self.x))
+        numeric = compile_function(expression, (self.x, self.y), NUMERIC)
+
+        self.assertAlmostEqual(10 * math_sqrt(math_pi), numeric(10., -10.))
+
+    def test_symbolic_mode_compiles_integrand_once(self):
+        integrands = []
+
+        def integrator(integrand, begin, end, *arguments):
+            integrands.append(integrand)
+            return integrate_numerically(lambda t: integrand(t, *arguments), float(begin), float(end))
+
+        expression = Integral(exp(-self.t ** 2) * self.x, (self.t, self.y, self.x)) * cos(self.x)
+        symbolic = compile_function(expression, (self.x, self.y), SYMBOLIC, integrator)
+        numeric = compile_function(expression, (self.x, self.y), NUMERIC)
+
+        for x in (1., 2., 3.):
+            self.assertAlmostEqual(complex(numeric(x, -1.)), complex(symbolic(x, -1.)))
+        self.assertEqual(1, len(set(integrands)))
+
+    def test_complex_integrand_is_integrated(self):
+        self.assertAlmostEqual(1 + 1j, integrate_numerically(lambda t: 1 + 1j, 0., 1.))
+        self.assertAlmostEqual(1 - math_exp(-1), integrate_numerically(lambda t: math_exp(-t), 0, 1 + 0j))
+
+    def test_peaked_integrand_is_refined_adaptively(self):
+        width = 1e-4
+
+        self.assertAlmostEqual(2 * math_atan(1 / width) / width,
+                               integrate_numerically(lambda t: 1 / (width ** 2 + t ** 2), -1., 1.), delta=1e-6)
+
+    def test_oscillating_integrand_is_refined_on_batch(self):
+        frequency = numpy.array([1., 200.])
+
+        result = integrate_numerically(lambda t: numpy.exp(1j * frequency * t), numpy.zeros(2), numpy.ones(2))
+
+        numpy.testing.assert_allclose((numpy.exp(1j * frequency) - 1) / (1j * frequency), result, rtol=1e-9)
+
+    def test_essentially_complex_limits_give_integral_along_segment(self):
+        self.assertAlmostEqual(-0.5, integrate_numerically(lambda t: t, 0., 1j))
+        self.assertAlmostEqual(numpy.exp(1 + 1j) - numpy.exp(-1j),
+                               integrate_numerically(lambda t: numpy.exp(t), -1j, 1 + 1j))
+
+    def test_compiled_integral_takes_complex_limits(self):
+        expression = Integral(exp(self.x * self.t), (self.t, 0, self.y))
+        numeric = compile_function(expression, (self.x, self.y), NUMERIC)
+
+        self.assertAlmostEqual((numpy.exp(2j * (1 + 1j)) - 1) / 2j, numeric(2j, 1 + 1j))
+
+    def test_unknown_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            compile_function(self.x, (self.x,), 'unknown')
+
+    def test_shared_subterms_are_computed_once(self):
+        shared = cos(self.x * self.y)
+        source = generate_shared_source([shared + 1, shared ** 2], (self.x, self.y))
+
+        self.assertEqual(1, source.count('numpy.cos'))
+
+    def test_shared_integrals_are_computed_once(self):
+        integral = Integral(exp(-self.t ** 2), (self.t, self.y, self.x))
+        function = compile_shared([integral + 1, 2 * integral], (self.x, self.y))
+
+        first, second = function(10., -10.)
+        self.assertAlmostEqual(math_sqrt(math_pi) + 1, first)
+        self.assertAlmostEqual(2 * math_sqrt(math_pi), second)
+        self.assertEqual(1, generate_shared_source([integral + 1, 2 * integral], (self.x, self.y))
+                         .count('integrate_numerically'))
+
+    def test_shared_evaluation_reuses_last_values(self):
+        calls = []
+
+        def function(*arguments):
+            calls.append(arguments)
+            return arguments[0] + 1, arguments[0] + 2
+
+        evaluation = SharedEvaluation(function)
+
+        self.assertEqual(2, evaluation.get(0, 1))
+        self.assertEqual(3, evaluation.get(1, 1))
+        self.assertEqual(4, evaluation.get(1, 2))
+        self.assertEqual([(1,), (2,)], calls)
+
+    def test_constant_subterms_are_folded(self):
+        omega, delay = IonizationSymbols.omega_1, IonizationSymbols.T_d
+        expression = cos(omega * pi) * exp(-self.x ** 2 / omega) + omega * self.y + (omega - 2) * delay
+
+        specialized = specialize(expression, {omega: 2})
+
+        self.assertEqual({self.x, self.y}, specialized.free_symbols)
+        self.assertAlmostEqual(math_exp(-0.5) + 2, float(specialized.subs({self.x: 1, self.y: 1})))
+
+    def test_integrals_are_kept_while_folding(self):
+        omega = IonizationSymbols.omega_1
+        expression = Integral(exp(-omega * self.t ** 2), (self.t, 0, self.x)) * (omega + 1)
+
+        specialized = specialize(expression, {omega: 1})
+        numeric = compile_function(specialized, (self.x,), NUMERIC)
+
+        self.assertTrue(specialized.has(Integral))
+        self.assertIn(Float(2), specialized.args)
+        self.assertAlmostEqual(math_sqrt(math_pi), numeric(10.))
+
+    def test_specialized_function_keeps_last_fingerprints(self):
+        parameter = IonizationParameter()
+        for number, symbol in enumerate(PARAMETER_SYMBOLS):
+            setattr(parameter, symbol.name, number + 1)
+        expression = self.x * IonizationSymbols.F + IonizationSymbols.T_d
+        function = SpecializedFunction([expression], (self.x,), (IonizationSymbols.T_d,), size=2)
+
+        self.assertEqual(2 * 3 + 1, function.evaluate(parameter, 3.))
+        parameter.T_d = 5
+        self.assertEqual(2 * 3 + 5, function.evaluate(parameter, 3.))
+        self.assertEqual(1, function.compilations)
+
+        for amplitude in (3, 4, 2):
+            parameter.F = amplitude
+            self.assertEqual(amplitude * 3 + 5, function.evaluate(parameter, 3.))
+        self.assertEqual(4, function.compilations)
+        self.assertEqual(2, len(function.functions))
+
+
+if __name__ == '__main__':
+    unittest.main()
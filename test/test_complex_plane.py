@@ -0,0 +1,46 @@
+import unittest
+
+import numpy
+from scipy.optimize import root
+
+from scr.solver.complex_plane import join_point, split_jacobian, split_point, split_residuals
+
+
+def problem(x, y):
+    return x ** 2 + 1, y - 2 * x
+
+
+def problem_jacobian(x, y):
+    return 2 * x, 0, -2, 1
+
+
+class ComplexPlaneTest(unittest.TestCase):
+    def test_point_is_split_into_real_unknowns(self):
+        unknowns = split_point(numpy.array([1 + 2j, 3 - 4j]))
+
+        numpy.testing.assert_allclose([1., 2., 3., -4.], unknowns)
+        self.assertEqual((1 + 2j, 3 - 4j), join_point(unknowns))
+
+    def test_jacobian_matches_finite_differences(self):
+        unknowns, step = numpy.array([0.3, 0.7, -1.1, 0.2]), 1e-7
+        residuals = numpy.array(split_residuals(*problem(*join_point(unknowns))))
+
+        expected = numpy.column_stack([
+            (numpy.array(split_residuals(*problem(*join_point(unknowns + step * direction)))) - residuals) / step
+            for direction in numpy.eye(4)
+        ])
+
+        numpy.testing.assert_allclose(expected, split_jacobian(*problem_jacobian(*join_point(unknowns))), atol=1e-6)
+
+    def test_complex_root_is_found_from_complex_seed(self):
+        result = root(lambda unknowns: split_residuals(*problem(*join_point(unknowns))),
+                      split_point(numpy.array([0.5 + 0.5j, 0j])),
+                      jac=lambda unknowns: split_jacobian(*problem_jacobian(*join_point(unknowns))), method='lm')
+
+        x, y = join_point(result.x)
+        self.assertAlmostEqual(1j, x)
+        self.assertAlmostEqual(2j, y)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,193 @@
+import tempfile
+import unittest
+from pathlib import Path
+from typing import List
+
+import numpy
+
+from scr.calculation_equipment.compilation import PARAMETER_SYMBOLS, SharedEvaluation
+from scr.consumer.EuclidConsumer import EuclidConsumer
+from scr.main import shared, LOG_FILE
+from scr.parameter.IonizationParameter import IonizationParameter
+from scr.solution.TwoValueSolution import TwoValueSolution
+from scr.stage.AbstractStage import AbstractStage
+from scr.stage.ResultCache import ResultCache
+from test_equpment.solution.combiner.MultiplyCombiner import MultiplyCombiner
+
+
+def stage_values(x, y, T_d, *_):
+    return x + y, x * y * T_d, x - y
+
+
+class FunctionStage(AbstractStage):
+    def __init__(self, index: int):
+        super().__init__(None)
+        self.index = index
+
+    def get_result(self, solution: TwoValueSolution) -> complex:
+        return stage_values(*solution.get_solution(), *[1.] * len(PARAMETER_SYMBOLS))[self.index]
+
+
+class FailingStage(FunctionStage):
+    # Fails on the solutions with the first number 0.5 the way the stages do, by logging and giving None back
+    def get_result(self, solution: TwoValueSolution) -> complex:
+        return None if solution.first_number == 0.5 else super().get_result(solution)
+
+
+def failing_values(x, y, T_d, *_):
+    if numpy.any(x == 0.5):
+        raise ZeroDivisionError('complex division by zero')
+    return stage_values(x, y, T_d)
+
+
+def overflowing_values(x, y, T_d, *_):
+    return tuple(numpy.where(x == 0.5, numpy.inf, values) for values in stage_values(x, y, T_d))
+
+
+class Solver:
+    def __init__(self, solutions: List[TwoValueSolution]):
+        self.solutions = solutions
+
+    def set_parameter(self, parameter):
+        pass
+
+    def solve(self) -> List[TwoValueSolution]:
+        return self.solutions
+
+
+class ConsumerTest(unittest.TestCase):
+    solutions = [TwoValueSolution(1 + 1j, 2), TwoValueSolution(0.5, -3j), TwoValueSolution(2, 2)]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()
+        shared[LOG_FILE] = Path(cls.directory.name).joinpath('consumer')
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.directory.cleanup()
+
+    def create_consumer(self) -> EuclidConsumer:
+        parameter = IonizationParameter()
+        for symbol in PARAMETER_SYMBOLS:
+            setattr(parameter, symbol.name, 1.)
+
+        consumer = EuclidConsumer([FunctionStage(index) for index in range(3)], MultiplyCombiner())
+        consumer.set_parameter(parameter)
+        return consumer
+
+    def test_fused_evaluation_matches_stage_by_stage_evaluation(self):
+        consumer = self.create_consumer()
+        expected = consumer.consume_by_solver(Solver(self.solutions))
+        expected_solutions = consumer.processed_solutions
+
+        fused = self.create_consumer()
+        fused.set_fused_evaluation(SharedEvaluation(stage_values))
+
+        self.assertAlmostEqual(complex(expected), complex(fused.consume_by_solver(Solver(self.solutions))))
+        for first, second in zip(expected_solutions, fused.processed_solutions):
+            self.assertAlmostEqual(first, second)
+
+    def test_solutions_a_stage_fails_on_are_left_out(self):
+        consumer = self.create_consumer()
+        expected = consumer.consume_by_solver(Solver(self.solutions[::2]))
+        consumer.clean()
+
+        consumer = self.create_consumer()
+        consumer.stages[1] = FailingStage(1)
+        consumer.stages[1].set_parameter(consumer.parameter)
+
+        self.assertAlmostEqual(complex(expected), complex(consumer.consume_by_solver(Solver(self.solutions))))
+        self.assertEqual(2, len(consumer.processed_solutions))
+        self.assertEqual(2, len(consumer.stage_results))
+
+    def test_fused_evaluation_is_called_once_for_all_solutions(self):
+        calls = []
+
+        def function(*arguments):
+            calls.append(arguments)
+            return stage_values(*arguments)
+
+        consumer = self.create_consumer()
+        consumer.set_fused_evaluation(SharedEvaluation(function))
+        consumer.consume_by_solver(Solver(self.solutions))
+
+        self.assertEqual(1, len(calls))
+        self.assertEqual(len(self.solutions), len(consumer.processed_solutions))
+
+    def test_failed_fused_evaluation_skips_only_failing_solutions(self):
+        consumer = self.create_consumer()
+        consumer.stages[1] = FailingStage(1)
+        consumer.stages[1].set_parameter(consumer.parameter)
+        consumer.set_fused_evaluation(SharedEvaluation(failing_values))
+
+        consumer.consume_by_solver(Solver(self.solutions))
+
+        self.assertEqual(2, len(consumer.processed_solutions))
+        self.assertEqual(2, len(consumer.stage_results))
+
+    def test_non_finite_fused_values_skip_only_failing_solutions(self):
+        consumer = self.create_consumer()
+        consumer.stages[1] = FailingStage(1)
+        consumer.stages[1].set_parameter(consumer.parameter)
+        consumer.set_fused_evaluation(SharedEvaluation(overflowing_values))
+
+        consumer.consume_by_solver(Solver(self.solutions))
+
+        self.assertEqual(2, len(consumer.processed_solutions))
+        for results in consumer.stage_results:
+            self.assertTrue(numpy.all(numpy.isfinite(results)))
+
+    def test_fused_evaluation_takes_cached_results(self):
+        calls = []
+
+        def function(*arguments):
+            calls.append(len(arguments[0]))
+            return stage_values(*arguments)
+
+        consumer = self.create_consumer()
+        for stage in consumer.stages:
+            stage.result_cache = ResultCache()
+        consumer.set_fused_evaluation(SharedEvaluation(function))
+        consumer.consume_by_solver(Solver(self.solutions[:2]))
+        expected = consumer.stage_results
+        consumer.processed_solutions, consumer.stage_results = [], []
+        consumer.consume_by_solver(Solver(self.solutions))
+
+        self.assertEqual([2, 1], calls)
+        self.assertEqual(expected, consumer.stage_results[:2])
+        self.assertEqual(3, len(consumer.processed_solutions))
+
+    def test_specialized_stages_are_not_fused(self):
+        calls = []
+
+        def function(*arguments):
+            calls.append(arguments)
+            return stage_values(*arguments)
+
+        consumer = self.create_consumer()
+        consumer.stages[0].specialized_stage = stage_values
+        consumer.set_fused_evaluation(SharedEvaluation(function))
+        consumer.consume_by_solver(Solver(self.solutions))
+
+        self.assertEqual([], calls)
+        self.assertEqual(len(self.solutions), len(consumer.processed_solutions))
+
+    def test_record_has_roots_and_stage_results(self):
+        for fused in (False, True):
+            consumer = self.create_consumer()
+            if fused:
+                consumer.set_fused_evaluation(SharedEvaluation(stage_values))
+            record = consumer.create_record(consumer.consume_by_solver(Solver(self.solutions)))
+
+            self.assertEqual([list(solution.get_solution()) for solution in self.solutions], record['roots'])
+            for results, solution in zip(record['stages'], self.solutions):
+                for result, expected in zip(results, stage_values(*solution.get_solution(), 1.)):
+                    self.assertAlmostEqual(complex(expected), complex(result))
+
+            consumer.clean()
+            self.assertEqual(([], []), (consumer.solutions, consumer.stage_results))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+import numpy
+
+from scr.solution.TwoValueSolution import TwoValueSolution
+from scr.solver.continuation import predict_seeds, path_position, count_lost_branches
+
+
+class ContinuationTest(unittest.TestCase):
+    def test_roots_are_extrapolated_along_path(self):
+        previous_roots = numpy.array([[0., 0.], [10., 10.]])
+        roots = numpy.array([[11., 10.5], [1., 0.5]])
+
+        seeds = predict_seeds(roots, path_position((1.,)), path_position((1.5,)), previous_roots, path_position((0.,)))
+
+        numpy.testing.assert_allclose([[11.5, 10.75], [1.5, 0.75]], seeds)
+
+    def test_roots_are_seeds_without_history(self):
+        roots = numpy.array([[1., 2.]])
+
+        numpy.testing.assert_allclose(roots, predict_seeds(roots, path_position((1.,)), path_position((2.,))))
+
+    def test_backward_step_is_extrapolated_backward(self):
+        previous_roots = numpy.array([[0., 0.]])
+        roots = numpy.array([[1., 1.]])
+
+        seeds = predict_seeds(roots, path_position((1., 5.)), path_position((0., 5.)), previous_roots,
+                              path_position((0., 5.)))
+
+        numpy.testing.assert_allclose([[0., 0.]], seeds)
+
+    def test_branch_replaced_by_new_root_is_lost(self):
+        TwoValueSolution.set_equal_round(1e-6)
+        seeds = numpy.array([[0., 0.], [5., 5.]])
+
+        continued = [TwoValueSolution(0.1, 0.1), TwoValueSolution(5.1, 4.9)]
+        replaced = [TwoValueSolution(0.1, 0.1), TwoValueSolution(-7., 3.)]
+        merged = [TwoValueSolution(0.1, 0.1)]
+
+        self.assertEqual(0, count_lost_branches(seeds, continued, 0.5))
+        self.assertEqual(1, count_lost_branches(seeds, replaced, 0.5))
+        self.assertEqual(1, count_lost_branches(seeds, merged, 10.))
+
+
+if __name__ == '__main__':
+    unittest.main()
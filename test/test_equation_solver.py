@@ -0,0 +1,80 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from sympy import exp
+
+from scr.calculation_equipment.newton import TOLERANCE
+from scr.main import shared, CACHE_DIRECTORY, FORMULAS_DIRECTORY, LOG_FILE
+from scr.parameter.IonizationParameter import IonizationParameter
+from scr.solution.TwoValueSolution import TwoValueSolution
+from scr.solver.EquationSolver import EquationSolver, PRECISION
+
+
+def short_generator(t, parameter):
+    return exp(-t ** 2)
+
+
+def create_parameter() -> IonizationParameter:
+    parameter = IonizationParameter()
+    parameter.T_d = 1
+    parameter.F = 1
+    parameter.omega_1 = 1
+    parameter.omega_2 = 2
+    parameter.etta_1 = -1
+    parameter.etta_2 = 1
+    parameter.N_1 = 1
+    parameter.N_2 = 2
+    parameter.f_0 = 2
+    parameter.I_p = 1
+    parameter.p = 1
+    parameter.p_theta = 1.5
+    return parameter
+
+
+class EquationSolverTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_directory, self.formulas_directory = shared[CACHE_DIRECTORY], shared[FORMULAS_DIRECTORY]
+        shared[CACHE_DIRECTORY] = shared[FORMULAS_DIRECTORY] = Path(self.directory.name)
+        shared[LOG_FILE] = Path(self.directory.name).joinpath('solver')
+
+        self.solver = EquationSolver(short_generator, 2, -5, 5, 8)
+        self.solver.set_precision(0.01)
+        self.solver.set_parameter(create_parameter())
+
+    def tearDown(self) -> None:
+        shared[CACHE_DIRECTORY], shared[FORMULAS_DIRECTORY] = self.cache_directory, self.formulas_directory
+        self.directory.cleanup()
+
+    def assertRoots(self, solutions):
+        for solution in solutions:
+            x, y = solution.get_solution()
+            residual = max(abs(self.solver.parametrized_first_equation(x, y)),
+                           abs(self.solver.parametrized_second_equation(x, y)))
+            self.assertLessEqual(residual, TOLERANCE)
+
+    def test_returned_solutions_are_roots(self):
+        solutions = self.solver.solve()
+
+        self.assertRoots(solutions)
+
+    def test_batched_solutions_are_roots(self):
+        self.solver.set_batched(True)
+        solutions = self.solver.solve()
+
+        self.assertRoots(solutions)
+
+    def test_default_precision_is_set(self):
+        equal_round = TwoValueSolution.get_equal_round()
+        TwoValueSolution.set_equal_round(None)
+        try:
+            EquationSolver(short_generator, 2, -5, 5, 2)
+
+            self.assertEqual(PRECISION, TwoValueSolution.get_equal_round())
+        finally:
+            TwoValueSolution.set_equal_round(equal_round)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+import importlib
+import sys
+import time
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sympy import Symbol, exp
+
+from scr.calculation_equipment.FormulaCache import FormulaCache, calculate_key
+from scr.calculation_equipment.generatoers import fading_generator
+from scr.main import CACHE_DIRECTORY, FORMULAS, shared
+from scr.solver.AbstractSolver import AbstractSolver
+
+
+def other_generator(t, parameter):
+    return exp(-t ** 2)
+
+
+def derive_slowly(directory: str) -> str:
+    # Every derivation is counted in a file, so the test sees how many processes derived the expression
+    def derive():
+        with Path(directory).joinpath('derivations').open('a') as file:
+            file.write('derived\n')
+        time.sleep(0.5)
+        return exp(-Symbol('x') ** 2)
+
+    return str(FormulaCache(fading_generator, AbstractSolver, Path(directory)).derive_expression('test', derive))
+
+
+class Builder:
+    @staticmethod
+    def compute_test(t):
+        return exp(-t ** 2)
+
+
+class OtherMembersBuilder(Builder):
+    def solve(self):
+        return None
+
+
+class OtherBuilder:
+    @staticmethod
+    def compute_test(t):
+        return exp(-t)
+
+
+class DependentCache(FormulaCache):
+    EXPRESSION_MODULES = FormulaCache.EXPRESSION_MODULES + ('dependency',)
+
+
+class FormulaCacheTest(unittest.TestCase):
+    x = Symbol('x')
+
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.cache = FormulaCache(fading_generator, AbstractSolver, Path(self.directory.name))
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_stored_expression_is_restored(self):
+        expression = exp(-self.x ** 2)
+        self.cache.store_expression('test', expression)
+
+        self.assertEqual(expression, self.cache.restore_expression('test'))
+
+    def test_missing_expression_is_none(self):
+        self.assertIsNone(self.cache.restore_expression('test'))
+
+    def test_changed_generator_does_not_reuse_entries(self):
+        self.cache.store_expression('test', exp(-self.x ** 2))
+        other_cache = FormulaCache(other_generator, AbstractSolver, Path(self.directory.name))
+
+        self.assertIsNone(other_cache.restore_expression('test'))
+
+    def test_key_depends_only_on_compute_functions_of_owner(self):
+        key = FormulaCache(fading_generator, Builder).expression_key
+
+        self.assertEqual(key, FormulaCache(fading_generator, OtherMembersBuilder).expression_key)
+        self.assertNotEqual(key, FormulaCache(fading_generator, OtherBuilder).expression_key)
+
+    def test_directory_defaults_to_shared_one(self):
+        directory = shared[CACHE_DIRECTORY]
+        shared[CACHE_DIRECTORY] = Path(self.directory.name)
+        try:
+            self.assertEqual(Path(self.directory.name), FormulaCache(fading_generator, AbstractSolver).directory)
+        finally:
+            shared[CACHE_DIRECTORY] = directory
+
+    def test_compiled_source_is_reused(self):
+        function = self.cache.compile('test', self.x ** 2, (self.x,))
+        source = self.cache.restore_source('test')
+
+        self.assertIsNotNone(source)
+        self.assertEqual(4., function(2.))
+        self.assertEqual(4., self.cache.compile('test', None, (self.x,))(2.))
+
+    def test_damaged_expression_is_none(self):
+        self.cache.store_expression('test', exp(-self.x ** 2))
+        path = self.cache.expression_path('test')
+        path.write_bytes(path.read_bytes()[:-1])
+
+        self.assertIsNone(self.cache.restore_expression('test'))
+
+    def test_expression_is_derived_once(self):
+        derivations = []
+
+        def derive():
+            derivations.append(1)
+            return exp(-self.x ** 2)
+
+        first = self.cache.derive_expression('test', derive, Path(self.directory.name).joinpath('test'))
+        second = self.cache.derive_expression('test', derive)
+
+        self.assertEqual(first, second)
+        self.assertEqual(1, len(derivations))
+        self.assertTrue(Path(self.directory.name).joinpath('test').exists())
+
+    def test_concurrent_processes_derive_once(self):
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(derive_slowly, [self.directory.name] * 2))
+
+        self.assertEqual([str(exp(-self.x ** 2))] * 2, results)
+        self.assertEqual(1, len(Path(self.directory.name).joinpath('derivations').read_text().splitlines()))
+
+    def test_only_default_generator_is_exported_to_shipped_formulas(self):
+        other_cache = FormulaCache(other_generator, AbstractSolver, Path(self.directory.name))
+
+        self.assertEqual(FORMULAS.joinpath('test'), self.cache.export_path('test', FORMULAS))
+        self.assertIsNone(other_cache.export_path('test', FORMULAS))
+        self.assertEqual(Path(self.directory.name).joinpath('test'),
+                         other_cache.export_path('test', Path(self.directory.name)))
+
+    def test_key_depends_on_source_of_dependencies(self):
+        module = Path(self.directory.name).joinpath('dependency.py')
+        module.write_text('def erf_term(n):\n    return n\n')
+        sys.path.insert(0, self.directory.name)
+        try:
+            importlib.import_module('dependency')
+            key = DependentCache(fading_generator, Builder).expression_key
+            module.write_text('def erf_term(n):\n    return n + 1\n')
+
+            self.assertNotEqual(key, DependentCache(fading_generator, Builder).expression_key)
+        finally:
+            sys.path.remove(self.directory.name)
+            sys.modules.pop('dependency', None)
+
+    def test_stale_entries_are_removed(self):
+        other_cache = FormulaCache(other_generator, AbstractSolver, Path(self.directory.name))
+        self.cache.store_expression('test', exp(-self.x ** 2))
+        other_cache.store_expression('test', exp(-self.x))
+        other_cache.store_source('test', 'source')
+
+        removed = FormulaCache.remove_stale([self.cache])
+
+        self.assertEqual(sorted([other_cache.expression_path('test'), other_cache.source_path('test')]), removed)
+        self.assertIsNotNone(self.cache.restore_expression('test'))
+        self.assertFalse(other_cache.expression_path('test').exists())
+
+    def test_key_depends_on_every_part(self):
+        self.assertNotEqual(calculate_key('a', 'bc'), calculate_key('ab', 'c'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from sympy import Symbol, exp, N
+
+from scr.calculation_equipment.Formulas import Formulas
+from scr.calculation_equipment.generatoers import fading_generator
+from scr.main import shared, LOG_FILE
+from scr.parameter.IonizationSymbols import IonizationSymbols
+
+
+def other_generator(t, parameter):
+    return exp(-t ** 2)
+
+
+class FormulasTest(unittest.TestCase):
+    x = Symbol('x')
+    y = Symbol('y')
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.directory = tempfile.TemporaryDirectory()
+        shared[LOG_FILE] = Path(cls.directory.name).joinpath('formulas')
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.directory.cleanup()
+
+    def test_instance_is_shared_per_generator_and_form(self):
+        formulas = Formulas.instance(fading_generator)
+
+        self.assertIs(formulas, Formulas.instance(fading_generator))
+        self.assertIsNot(formulas, Formulas.instance(fading_generator, closed_form=False))
+        self.assertIsNot(formulas, Formulas.instance(other_generator))
+        self.assertIs(other_generator, Formulas.instance(other_generator).generator)
+
+    def test_closed_form_integral_of_square_of_A_matches_numeric_one(self):
+        values = {IonizationSymbols.T_d: 1, IonizationSymbols.F: 1, IonizationSymbols.omega_1: 1,
+                  IonizationSymbols.omega_2: 2, IonizationSymbols.etta_1: -1, IonizationSymbols.N_1: 1,
+                  IonizationSymbols.N_2: 2, self.x: 1.3, self.y: 0.4}
+
+        closed_form = Formulas.instance(fading_generator).A_square_integral(self.x, self.y)
+        numeric = Formulas.instance(fading_generator, closed_form=False).A_square_integral(self.x, self.y)
+
+        self.assertAlmostEqual(complex(N(numeric.xreplace(values))), complex(N(closed_form.xreplace(values))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+import unittest
+
+from sympy import Symbol, Integral, exp, cos, sin, log, pi, N
+
+from scr.calculation_equipment.gaussian import integrate_gaussian
+
+
+class GaussianTest(unittest.TestCase):
+    t = Symbol('t')
+    x = Symbol('x')
+    y = Symbol('y')
+
+    def assert_integrated(self, expression, begin, end):
+        closed_form = integrate_gaussian(expression, self.t, self.x, self.y)
+
+        self.assertFalse(closed_form.has(Integral))
+        self.assertAlmostEqual(complex(N(Integral(expression, (self.t, begin, end)))),
+                               complex(N(closed_form.subs({self.x: begin, self.y: end}))))
+
+    def test_polynomial_times_gaussian_is_integrated(self):
+        self.assert_integrated((1 + self.t + 3 * self.t ** 2) * exp(-2 * self.t ** 2 + self.t), -1.5, 2)
+
+    def test_trigonometric_factors_are_integrated(self):
+        pulse = exp(-log(2) * (self.t - 1) ** 2 / pi ** 2)
+
+        self.assert_integrated((self.t * pulse * cos(2 * self.t) - pulse * sin(self.t)) ** 2 + 0.5, -3, 4)
+
+    def test_other_terms_are_integrated_separately(self):
+        self.assert_integrated(exp(-self.t ** 2) + self.t ** 3 + 1 / (1 + self.t ** 2), -1, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+
+import numpy
+
+from scr.solver.grids import cartesian, iterate_grid, logarithmic_axis, UNIFORM, SOBOL, HALTON, COMPLEX
+from scr.util import fill
+
+
+class GridsTest(unittest.TestCase):
+    def test_uniform_grid_is_read_by_chunks(self):
+        axis = numpy.linspace(-10, 10, 5)
+        expected = fill(fill(fill(numpy.array([]), axis), axis), axis)
+
+        chunks = list(iterate_grid(UNIFORM, 3, -10, 10, 5, chunk_size=7))
+
+        self.assertEqual(7, len(chunks[0]))
+        numpy.testing.assert_allclose(expected, numpy.concatenate(chunks))
+        numpy.testing.assert_allclose(expected, cartesian([axis] * 3))
+
+    def test_low_discrepancy_grids_cover_borders(self):
+        for kind, count in ((SOBOL, 32), (HALTON, 25)):
+            seeds = numpy.concatenate(list(iterate_grid(kind, 2, -10, 10, 5, chunk_size=8)))
+
+            self.assertEqual((count, 2), seeds.shape)
+            self.assertTrue(numpy.all((seeds >= -10) & (seeds <= 10)))
+
+    def test_logarithmic_axis_is_dense_near_zero(self):
+        axis = logarithmic_axis(-100, 100, 9)
+
+        self.assertAlmostEqual(-100, axis[0])
+        self.assertAlmostEqual(0, axis[4])
+        self.assertLess(axis[5] - axis[4], axis[8] - axis[7])
+
+    def test_complex_grid_has_imaginary_parts(self):
+        seeds = numpy.concatenate(list(iterate_grid(COMPLEX, 2, -1, 1, 2, imaginary_left=0, imaginary_right=2,
+                                                    imaginary_frequency=3)))
+
+        self.assertEqual((36, 2), seeds.shape)
+        self.assertEqual({0., 1., 2.}, set(numpy.imag(seeds).ravel()))
+
+    def test_unknown_kind_is_rejected(self):
+        with self.assertRaises(ValueError):
+            iterate_grid('unknown', 2, -1, 1, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import csv
+import json
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from scr import instrumentation
+from scr.instrumentation import measure, add, sweep_point, merge_point, create_report, write_report, reset, \
+    set_enabled, JSON, CSV, TOTAL
+
+
+class InstrumentationTest(unittest.TestCase):
+    def setUp(self) -> None:
+        reset()
+
+    def tearDown(self) -> None:
+        set_enabled(True)
+        reset()
+
+    def test_blocks_are_counted_and_timed(self):
+        for _ in range(3):
+            with measure('block'):
+                pass
+        add('seeds', 16)
+
+        report = create_report()
+
+        self.assertEqual(3, report[TOTAL]['block']['count'])
+        self.assertGreaterEqual(report[TOTAL]['block']['seconds'], 0.)
+        self.assertEqual(16, report[TOTAL]['seeds']['count'])
+
+    def test_sweep_points_are_kept_apart(self):
+        add('formulas')
+        for x_point in (2., 1.):
+            with sweep_point(x_point):
+                add('seeds', 4)
+        merge_point(3., {'seeds': [5, 0.]})
+
+        report = create_report()
+
+        self.assertEqual(13, report[TOTAL]['seeds']['count'])
+        self.assertEqual([1., 2., 3.], [point['x'] for point in report['points']])
+        self.assertEqual({'seeds': {'count': 5, 'seconds': 0.}}, report['points'][2]['measurements'])
+        self.assertNotIn('formulas', report['points'][0]['measurements'])
+
+    def test_disabled_instrumentation_measures_nothing(self):
+        set_enabled(False)
+        with measure('block'):
+            add('seeds')
+
+        self.assertEqual({}, instrumentation.records['total'])
+
+    def test_report_is_written_in_both_formats(self):
+        with sweep_point(1.):
+            add('seeds', 4)
+
+        with TemporaryDirectory() as directory:
+            report = json.loads(write_report(Path(directory).joinpath('report.json'), JSON).read_text())
+            with write_report(Path(directory).joinpath('report.csv'), CSV).open() as file:
+                rows = list(csv.reader(file))
+
+        self.assertEqual(create_report(), report)
+        self.assertEqual([['point', 'measurement', 'count', 'seconds'], [TOTAL, 'seeds', '4', '0.0'],
+                          ['1.0', 'seeds', '4', '0.0']], rows)
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            write_report(Path('report'), 'xml')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import logging
+import multiprocessing
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from scr.logs import get_logger, stop_logging, set_log_level, get_worker_initializer, PACKAGE
+from scr.main import shared, LOG_FILE, LOG_LEVEL
+
+
+def log_in_worker(message: str) -> None:
+    get_logger('scr.test_logs').info(message)
+
+
+def log_from_worker(message: str) -> int:
+    # The worker doesn't know the log file, so its record reaches it only through the parent
+    shared[LOG_FILE] = None
+    get_logger('scr.test_logs').info(message)
+    get_logger('scr.test_logs').debug('hidden')
+    return len(logging.getLogger(PACKAGE).handlers)
+
+
+class LogsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.path = Path(self.directory.name).joinpath('log')
+        self.shared = dict(shared)
+        shared[LOG_FILE] = self.path
+
+    def tearDown(self) -> None:
+        stop_logging()
+        shared.update(self.shared)
+        logging.getLogger(PACKAGE).setLevel(shared[LOG_LEVEL])
+        self.directory.cleanup()
+
+    def read_lines(self):
+        stop_logging()
+        return self.path.read_text().splitlines()
+
+    def test_record_is_written_once_by_many_loggers(self):
+        for _ in range(3):
+            logger = get_logger('scr.test_logs')
+        logger.info('message')
+
+        lines = self.read_lines()
+        self.assertEqual(1, len(lines))
+        self.assertTrue(lines[0].endswith('scr.test_logs - INFO - message'))
+
+    def test_disabled_level_is_not_written(self):
+        set_log_level(logging.INFO)
+        logger = get_logger('scr.test_logs')
+        logger.debug('hidden')
+        logger.info('shown')
+
+        self.assertFalse(logger.isEnabledFor(logging.DEBUG))
+        self.assertEqual(['shown'], [line.rsplit(' - ', 1)[-1] for line in self.read_lines()])
+
+    def test_changed_log_file_is_used(self):
+        get_logger('scr.test_logs').info('first')
+        other = Path(self.directory.name).joinpath('other')
+        shared[LOG_FILE] = other
+        get_logger('scr.test_logs').info('second')
+        stop_logging()
+
+        self.assertEqual(1, len(self.path.read_text().splitlines()))
+        self.assertEqual(1, len(other.read_text().splitlines()))
+
+    def test_forked_worker_records_are_written(self):
+        get_logger('scr.test_logs').info('parent')
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('fork')) as executor:
+            executor.submit(log_in_worker, 'worker').result()
+
+        self.assertCountEqual(['parent', 'worker'], [line.rsplit(' - ', 1)[-1] for line in self.read_lines()])
+
+    def test_worker_records_are_written_by_parent(self):
+        set_log_level(logging.INFO)
+        get_logger('scr.test_logs').info('parent')
+        for method in ('fork', 'spawn'):
+            context = multiprocessing.get_context(method)
+            initializer, initargs = get_worker_initializer(context=context)
+            with ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=initializer,
+                                     initargs=initargs) as executor:
+                self.assertEqual(1, executor.submit(log_from_worker, method).result())
+
+        self.assertEqual(['parent', 'fork', 'spawn'], [line.rsplit(' - ', 1)[-1] for line in self.read_lines()])
+
+
+if __name__ == '__main__':
+    unittest.main()
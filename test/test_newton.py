@@ -0,0 +1,57 @@
+import unittest
+
+import numpy
+from numpy import linspace, meshgrid
+
+from scr.calculation_equipment.compilation import integrate_numerically
+from scr.calculation_equipment.newton import solve_batch
+
+
+def problem(x, y):
+    return x ** 2 - 1, (y - 1) ** 2 - 1
+
+
+class NewtonTest(unittest.TestCase):
+    def test_all_roots_are_found_from_grid(self):
+        """
+        Solve the system
+        | x ^ 2 - 1 = 0;
+        | (y - 1) ^ 2 - 1 = 0.
+
+        The roots are (1, 0), (-1, 0), (1, 2), (-1, 2)
+        """
+        grid = linspace(-10, 10, 10)
+        x_seeds, y_seeds = meshgrid(grid, grid)
+
+        x, y, converged, iterations = solve_batch(problem, x_seeds.ravel(), y_seeds.ravel())
+
+        roots = {(round(first, 6), round(second, 6)) for first, second in zip(x[converged], y[converged])}
+        self.assertEqual({(1., 0.), (-1., 0.), (1., 2.), (-1., 2.)}, roots)
+        self.assertTrue(converged.all())
+        self.assertTrue((iterations > 0).all())
+
+    def test_singular_seeds_are_reported_as_not_converged(self):
+        x, y, converged, _ = solve_batch(problem, numpy.array([0., 3.]), numpy.array([1., 3.]))
+
+        self.assertEqual([False, True], converged.tolist())
+
+    def test_seeds_close_to_converged_ones_are_stopped(self):
+        grid = linspace(-10, 10, 10)
+        x_seeds, y_seeds = meshgrid(grid, grid)
+
+        _, _, _, iterations = solve_batch(problem, x_seeds.ravel(), y_seeds.ravel())
+        x, y, converged, pruned_iterations = solve_batch(problem, x_seeds.ravel(), y_seeds.ravel(), radius=0.1)
+
+        roots = {(round(first, 6), round(second, 6)) for first, second in zip(x[converged], y[converged])}
+        self.assertEqual({(1., 0.), (-1., 0.), (1., 2.), (-1., 2.)}, roots)
+        self.assertTrue(converged.all())
+        self.assertLessEqual(pruned_iterations.sum(), iterations.sum())
+
+    def test_integral_is_calculated_for_batch_of_limits(self):
+        result = integrate_numerically(lambda t: numpy.cos(t), numpy.zeros(3), numpy.array([1., 2., 3.]))
+
+        numpy.testing.assert_allclose(numpy.sin([1., 2., 3.]), result)
+
+
+if __name__ == '__main__':
+    unittest.main()
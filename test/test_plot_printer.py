@@ -1,4 +1,7 @@
+import json
 from math import sin
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest import TestCase
 
 from mpmath import linspace
@@ -11,7 +14,27 @@ class Test(TestCase):
         x_points = linspace(0, 10, 200)
         f = sin
 
-        plot_printer = PlotPrinter('TEST_PLOT', x_points, f)
-        plot_printer.set_x_label('test_x_label')
-        plot_printer.set_y_label('test_y_label')
-        plot_printer.print()
+        with TemporaryDirectory() as directory:
+            plot_printer = PlotPrinter('TEST_PLOT', x_points, f)
+            plot_printer.set_x_label('test_x_label')
+            plot_printer.set_y_label('test_y_label')
+            plot_printer.set_results_path(Path(directory).joinpath('TEST_PLOT-results.jsonl'))
+            plot_printer.set_report_path(Path(directory).joinpath('TEST_PLOT-report.json'))
+            plot_printer.print()
+
+            self.assertTrue(Path(directory).joinpath('TEST_PLOT-results.jsonl').exists())
+            self.assertTrue(Path(directory).joinpath('TEST_PLOT-report.json').exists())
+
+    def test_report_is_of_last_sweep_only(self):
+        x_points = linspace(0, 10, 5)
+
+        for _ in range(2):
+            with TemporaryDirectory() as directory:
+                plot_printer = PlotPrinter('TEST_PLOT', x_points, sin)
+                plot_printer.set_results_path(Path(directory).joinpath('TEST_PLOT-results.jsonl'))
+                plot_printer.set_report_path(Path(directory).joinpath('TEST_PLOT-report.json'))
+                plot_printer.print()
+
+                report = json.loads(Path(directory).joinpath('TEST_PLOT-report.json').read_text())
+
+        self.assertEqual(len(x_points), len(report['points']))
@@ -0,0 +1,100 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import numpy
+
+from scr.calculation_equipment.compilation import PARAMETER_SYMBOLS
+from scr.parameter.IonizationParameter import IonizationParameter
+from scr.solution.TwoValueSolution import TwoValueSolution
+from scr.stage.ResultCache import ResultCache
+
+
+def create_parameter() -> IonizationParameter:
+    parameter = IonizationParameter()
+    for number, symbol in enumerate(PARAMETER_SYMBOLS):
+        setattr(parameter, symbol.name, float(number + 1))
+    return parameter
+
+
+class ResultCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.parameter = create_parameter()
+
+    def test_close_solutions_share_result(self):
+        cache = ResultCache(quantum=1e-6)
+        cache.store(TwoValueSolution(1.3, 0.4 + 1j), self.parameter, 2 + 1j)
+
+        self.assertEqual(2 + 1j, cache.get(TwoValueSolution(1.3 + 1e-8, 0.4 + 1j), self.parameter))
+        self.assertIsNone(cache.get(TwoValueSolution(1.3 + 1e-5, 0.4 + 1j), self.parameter))
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_changed_parameter_misses(self):
+        cache = ResultCache()
+        cache.store(TwoValueSolution(1.3, 0.4), self.parameter, 2.)
+        self.parameter.T_d = 5.
+
+        self.assertIsNone(cache.get(TwoValueSolution(1.3, 0.4), self.parameter))
+
+    def test_least_recently_used_result_is_evicted(self):
+        cache = ResultCache(size=2)
+        for number in range(3):
+            cache.store(TwoValueSolution(float(number), 0.), self.parameter, float(number))
+            cache.get(TwoValueSolution(0., 0.), self.parameter)
+
+        self.assertEqual(0., cache.get(TwoValueSolution(0., 0.), self.parameter))
+        self.assertIsNone(cache.get(TwoValueSolution(1., 0.), self.parameter))
+        self.assertEqual(2., cache.get(TwoValueSolution(2., 0.), self.parameter))
+
+    def test_stored_results_are_read_back(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory).joinpath('stage.results')
+            ResultCache(path=path).store(TwoValueSolution(1.3, 0.4), self.parameter, numpy.complex128(2 + 1j))
+            with path.open('a') as file:
+                file.write('(1, 2')
+
+            cache = ResultCache(path=path)
+
+            self.assertEqual(2 + 1j, cache.get(TwoValueSolution(1.3, 0.4), self.parameter))
+            self.assertEqual(1, cache.hits)
+
+    def test_result_stored_after_torn_line_is_read_back(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory).joinpath('stage.results')
+            ResultCache(path=path).store(TwoValueSolution(1.3, 0.4), self.parameter, 2.)
+            path.write_text(path.read_text()[:-5])
+
+            ResultCache(path=path).store(TwoValueSolution(0.7, 0.4), self.parameter, 3.)
+            cache = ResultCache(path=path)
+
+            self.assertEqual(3., cache.get(TwoValueSolution(0.7, 0.4), self.parameter))
+            self.assertIsNone(cache.get(TwoValueSolution(1.3, 0.4), self.parameter))
+
+    def test_only_last_results_of_file_are_kept(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory).joinpath('stage.results')
+            stored = ResultCache(path=path)
+            for number in range(3):
+                stored.store(TwoValueSolution(float(number), 0.), self.parameter, float(number))
+
+            cache = ResultCache(size=2, path=path)
+
+            self.assertEqual(2, len(cache.results))
+            self.assertIsNone(cache.get(TwoValueSolution(0., 0.), self.parameter))
+            self.assertEqual(2., cache.get(TwoValueSolution(2., 0.), self.parameter))
+
+    def test_file_is_compacted_to_kept_results(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory).joinpath('stage.results')
+            cache = ResultCache(size=2, path=path)
+            for number in range(5):
+                cache.store(TwoValueSolution(float(number), 0.), self.parameter, float(number))
+
+            self.assertEqual(2, len(path.read_text().splitlines()))
+            read = ResultCache(size=2, path=path)
+            self.assertEqual(4., read.get(TwoValueSolution(4., 0.), self.parameter))
+            self.assertEqual(3., read.get(TwoValueSolution(3., 0.), self.parameter))
+
+
+if __name__ == '__main__':
+    unittest.main()
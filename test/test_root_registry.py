@@ -0,0 +1,43 @@
+import unittest
+
+from scr.solution.RootRegistry import RootRegistry
+from scr.solution.TwoValueSolution import TwoValueSolution
+
+
+class RootRegistryTest(unittest.TestCase):
+    def setUp(self):
+        TwoValueSolution.set_equal_round(0.01)
+        self.registry = RootRegistry(TwoValueSolution.get_equal_round())
+
+    def test_close_solutions_are_registered_once(self):
+        self.assertTrue(self.registry.add(TwoValueSolution(1., 2.)))
+        self.assertFalse(self.registry.add(TwoValueSolution(1.01, 2.01)))
+        self.assertTrue(self.registry.add(TwoValueSolution(3., 2.)))
+
+        self.assertEqual(2, len(self.registry))
+        self.assertEqual(2, self.registry.get_hits(TwoValueSolution(1., 2.)))
+        self.assertEqual(3, self.registry.get_total_hits())
+
+    def test_solutions_in_neighbouring_buckets_are_equal(self):
+        self.registry.add(TwoValueSolution(0.099, -0.001))
+
+        self.assertIn(TwoValueSolution(0.101, 0.001), self.registry)
+        self.assertNotIn(TwoValueSolution(0.3, 0.), self.registry)
+
+    def test_basin_is_mapped_by_trajectory(self):
+        registry = RootRegistry(TwoValueSolution.get_equal_round(), 0.5)
+        solution = TwoValueSolution(1., 2.)
+        registry.add(solution)
+        registry.map_basin(solution, [(3., 3.), (1.5, 2.5)])
+
+        self.assertEqual(0, registry.find_basin(3.2, 2.9))
+        self.assertEqual(-1, registry.find_basin(-1., 0.))
+        self.assertEqual(-1, self.registry.find_basin(3., 3.))
+
+    def test_equal_round_is_required(self):
+        with self.assertRaises(ValueError):
+            RootRegistry(None)
+
+
+if __name__ == '__main__':
+    unittest.main()
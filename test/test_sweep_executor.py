@@ -0,0 +1,95 @@
+import os
+from math import sin
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from scr import instrumentation
+from scr.instrumentation import add, reset
+from scr.plot_printers.SweepExecutor import SweepExecutor
+from scr.plot_printers.SweepResults import SweepResults
+
+
+def counted_sin(x: float) -> float:
+    add('calls')
+    return sin(x)
+
+
+def described_sin(x: float) -> dict:
+    return {'y': sin(x), 'roots': [[x, -x]]}
+
+
+def failing_sin(x: float) -> float:
+    if x == 0.5:
+        raise ValueError(f"Failed at {x}")
+    return sin(x)
+
+
+def sin_with_worker(x: float) -> dict:
+    return {'y': sin(x), 'worker': os.getpid()}
+
+
+class Test(TestCase):
+    x_points = [0.1 * number for number in range(20)]
+
+    def test_serial_sweep_keeps_order(self):
+        executor = SweepExecutor(sin, 1)
+
+        self.assertEqual([sin(x) for x in self.x_points], executor.map(self.x_points))
+
+    def test_parallel_sweep_keeps_order(self):
+        executor = SweepExecutor(sin, 3)
+
+        self.assertEqual([sin(x) for x in self.x_points], executor.map(self.x_points))
+
+    def test_parallel_sweep_reports_every_point(self):
+        reset()
+        SweepExecutor(counted_sin, 3).map(self.x_points)
+
+        self.assertEqual(self.x_points, sorted(point['x'] for point in instrumentation.records['points']))
+        self.assertEqual(len(self.x_points), instrumentation.records['total']['calls'][0])
+        reset()
+
+    def test_stored_points_are_not_calculated_again(self):
+        calculated = []
+
+        def calculator(x: float) -> float:
+            calculated.append(x)
+            return sin(x)
+
+        with TemporaryDirectory() as directory:
+            path = Path(directory).joinpath('results.jsonl')
+            SweepExecutor(calculator, 1, results=SweepResults(path)).map(self.x_points[:5])
+            y_points = SweepExecutor(calculator, 1, results=SweepResults(path)).map(self.x_points)
+
+        self.assertEqual([sin(x) for x in self.x_points], y_points)
+        self.assertEqual(self.x_points, calculated)
+
+    def test_parallel_sweep_stores_records(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory).joinpath('results.jsonl')
+            y_points = SweepExecutor(described_sin, 3, results=SweepResults(path)).map(self.x_points)
+            records = SweepResults(path).get_records()
+
+        self.assertEqual([sin(x) for x in self.x_points], y_points)
+        self.assertEqual([[[x, -x]] for x in self.x_points], [record['roots'] for record in records])
+
+    def test_points_finished_besides_a_failed_one_are_stored(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory).joinpath('results.jsonl')
+            with self.assertRaises(ValueError):
+                SweepExecutor(failing_sin, 3, results=SweepResults(path)).map(self.x_points)
+            stored = sorted(SweepResults(path).records)
+
+        self.assertEqual([x for x in self.x_points if x != 0.5], stored)
+
+    def test_contiguous_sweep_gives_every_worker_one_block(self):
+        records = SweepExecutor(sin_with_worker, 3, contiguous=True).map_records(self.x_points)
+        workers = [record['worker'] for record in records]
+
+        self.assertLessEqual(len([number for number in range(1, len(workers))
+                                  if workers[number] != workers[number - 1]]), 2)
+
+    def test_no_workers_is_rejected(self):
+        with self.assertRaises(ValueError):
+            SweepExecutor(sin, 0)
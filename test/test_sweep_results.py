@@ -0,0 +1,66 @@
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from mpmath import mpc, mpf
+
+from scr.plot_printers.SweepResults import SweepResults, STALE
+
+
+class SweepResultsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.path = Path(self.directory.name).joinpath('sweep', 'results.jsonl')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_records_are_read_back(self):
+        record = {'x': mpf(0.5), 'y': mpc(1, -2), 'roots': [[1 + 1j, 2.]], 'stages': [[0.25, 3j]]}
+        SweepResults(self.path).append(record)
+
+        stored = SweepResults(self.path).get(0.5)
+
+        self.assertEqual({'x': 0.5, 'y': 1 - 2j, 'roots': [[1 + 1j, 2.]], 'stages': [[0.25, 3j]]}, stored)
+        self.assertIsInstance(stored['y'], complex)
+
+    def test_records_are_sorted_by_x(self):
+        results = SweepResults(self.path)
+        for x_point in (2., 0., 1.):
+            results.append({'x': x_point, 'y': x_point ** 2})
+
+        self.assertEqual([0., 1., 4.], [record['y'] for record in SweepResults(self.path).get_records()])
+
+    def test_torn_line_is_skipped(self):
+        SweepResults(self.path).append({'x': 1., 'y': 1.})
+        with self.path.open('a') as file:
+            file.write('{"x": 2.0, "y"')
+
+        results = SweepResults(self.path)
+        results.append({'x': 3., 'y': 9.})
+
+        self.assertEqual([1., 3.], sorted(SweepResults(self.path).records))
+        self.assertFalse(results.contains(2.))
+
+    def test_points_of_the_same_fingerprint_are_reused(self):
+        SweepResults(self.path, {'parameter': [1., 2j]}).append({'x': 1., 'y': 1.})
+
+        self.assertTrue(SweepResults(self.path, {'parameter': (1., 2j)}).contains(1.))
+
+    def test_points_of_another_fingerprint_are_moved_aside(self):
+        SweepResults(self.path, {'parameter': [1.]}).append({'x': 1., 'y': 1.})
+
+        results = SweepResults(self.path, {'parameter': [2.]})
+        results.append({'x': 2., 'y': 4.})
+
+        self.assertEqual([2.], sorted(SweepResults(self.path, {'parameter': [2.]}).records))
+        self.assertTrue(SweepResults(self.path.with_name(self.path.name + STALE)).contains(1.))
+
+    def test_points_without_fingerprint_are_not_reused_with_one(self):
+        SweepResults(self.path).append({'x': 1., 'y': 1.})
+
+        self.assertFalse(SweepResults(self.path, {'parameter': [1.]}).contains(1.))
+
+
+if __name__ == '__main__':
+    unittest.main()
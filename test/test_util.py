@@ -1,7 +1,15 @@
+import os
+import stat
 import unittest
 from unittest import TestCase
 from numpy.ma import array
-from scr.util import fill, sum_as_vectors, multiply, square, increase
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from sympy import Symbol, exp
+
+from scr.util import fill, sum_as_vectors, multiply, square, increase, store_function, restore_function, \
+    add_checksum, strip_checksum, write_atomically, BINARY
 
 
 class Test(TestCase):
@@ -50,6 +58,51 @@ class Test(TestCase):
 
         self.assertEqual(actual, expected)
 
+    def test_checksum_detects_changes(self):
+        data = add_checksum(b'x**2 + 1')
+
+        self.assertEqual(b'x**2 + 1', strip_checksum(data))
+        self.assertIsNone(strip_checksum(data.replace(b'x**2', b'x**3')))
+        self.assertIsNone(strip_checksum(b'x**2 + 1'))
+
+    def test_stored_function_is_restored(self):
+        x = Symbol('x')
+        with TemporaryDirectory() as directory:
+            path = Path(directory).joinpath('function')
+            store_function(path, exp(-x ** 2))
+
+            self.assertEqual(exp(-x ** 2), restore_function(path))
+
+            path.write_bytes(path.read_bytes()[:-1])
+            with self.assertRaises(ValueError):
+                restore_function(path)
+
+    def test_binary_function_is_restored(self):
+        x = Symbol('x')
+        with TemporaryDirectory() as directory:
+            path = Path(directory).joinpath('function')
+            store_function(path, exp(-x ** 2) * x, BINARY)
+
+            self.assertEqual(exp(-x ** 2) * x, restore_function(path, BINARY))
+
+    def test_written_file_keeps_mode_of_replaced_one(self):
+        with TemporaryDirectory() as directory:
+            path = Path(directory).joinpath('function')
+            umask = os.umask(0o022)
+            try:
+                write_atomically(path, b'x')
+            finally:
+                os.umask(umask)
+            self.assertEqual(0o644, stat.S_IMODE(path.stat().st_mode))
+
+            path.chmod(0o640)
+            write_atomically(path, b'y')
+            self.assertEqual(0o640, stat.S_IMODE(path.stat().st_mode))
+
+    def test_unknown_format_is_rejected(self):
+        with self.assertRaises(ValueError):
+            store_function(Path('function'), Symbol('x'), 'unknown')
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from sympy import exp
+
+from scr.calculation_equipment.FormulaCache import FormulaCache
+from scr.calculation_equipment.warming import warm_formulas, remove_stale_entries
+from scr.main import shared, LOG_FILE
+from scr.stage.IonStage import IonStage
+
+
+def short_generator(t, parameter):
+    return exp(-t ** 2)
+
+
+def other_generator(t, parameter):
+    return exp(-t ** 4)
+
+
+class WarmingTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = Path(self.directory.name)
+        shared[LOG_FILE] = self.path.joinpath('warming')
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_formula_is_derived_once(self):
+        derived = warm_formulas(short_generator, names=('ion_stage',), directory=self.path,
+                                formulas_directory=self.path)
+
+        self.assertEqual(['ion_stage', 'ion_stage source'], derived)
+        self.assertTrue(self.path.joinpath('ion_stage').exists())
+        self.assertIsNotNone(FormulaCache(short_generator, IonStage, self.path).restore_expression('ion_stage'))
+        self.assertEqual([], warm_formulas(short_generator, names=('ion_stage',), directory=self.path,
+                                           formulas_directory=self.path))
+
+    def test_forms_of_propel_stage_are_exported_apart(self):
+        for closed_form in (True, False):
+            warm_formulas(short_generator, names=('propel_stage',), closed_form=closed_form, directory=self.path,
+                          formulas_directory=self.path)
+
+        self.assertNotIn('Integral', self.path.joinpath('propel_stage').read_text())
+        self.assertIn('Integral', self.path.joinpath('propel_stage_numeric').read_text())
+
+    def test_jacobian_is_exported_next_to_equation(self):
+        warm_formulas(short_generator, names=('equation_1',), directory=self.path, formulas_directory=self.path)
+
+        for name in ('equation_1', 'equation_1_dx', 'equation_1_dy'):
+            self.assertTrue(self.path.joinpath(name).exists())
+
+    def test_entries_of_kept_generators_are_not_stale(self):
+        for generator in (short_generator, other_generator):
+            warm_formulas(generator, names=('ion_stage',), directory=self.path, formulas_directory=self.path)
+
+        self.assertEqual([], remove_stale_entries((short_generator, other_generator), self.path))
+        self.assertEqual(2, len(remove_stale_entries((short_generator,), self.path)))
+        self.assertIsNotNone(FormulaCache(short_generator, IonStage, self.path).restore_expression('ion_stage'))
+        self.assertIsNone(FormulaCache(other_generator, IonStage, self.path).restore_expression('ion_stage'))
+
+    def test_unknown_formula_is_rejected(self):
+        with self.assertRaises(ValueError):
+            warm_formulas(short_generator, names=('unknown',), directory=self.path, formulas_directory=self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()